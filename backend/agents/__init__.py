@@ -6,6 +6,7 @@ __all__ = [
     "language_router",
     "rag_agent",
     "tone_adapter",
+    "smalltalk_agent",
     "conversation_agent",
     "music_agent",
 ]
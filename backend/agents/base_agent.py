@@ -1,6 +1,9 @@
 """abstract base agent class and helpers."""
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 from abc import ABC, abstractmethod
+import functools
+
+from utils.metrics import track_agent
 
 
 class BaseAgent(ABC):
@@ -8,8 +11,39 @@ class BaseAgent(ABC):
 
     implementers must provide an async `run` method that accepts a state dict
     and returns an updated state or result.
+
+    agents declare the state keys they consume (`reads`) and produce
+    (`writes`) so workflows can derive dependencies and run independent
+    agents concurrently.
+
+    every subclass `run` is wrapped automatically with timing
+    instrumentation (see utils.metrics.track_agent).
     """
 
+    reads: Tuple[str, ...] = ()
+    writes: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        run = cls.__dict__.get("run")
+        if run is None or getattr(run, "__isabstractmethod__", False):
+            return
+        if getattr(run, "_instrumented", False):
+            return
+
+        @functools.wraps(run)
+        async def _instrumented_run(self: "BaseAgent", state: Dict[str, Any]) -> Dict[str, Any]:
+            with track_agent(self.name):
+                return await run(self, state)
+
+        _instrumented_run._instrumented = True  # type: ignore[attr-defined]
+        cls.run = _instrumented_run  # type: ignore[method-assign]
+
+    @property
+    def name(self) -> str:
+        """stable node name used for graph wiring and timing."""
+        return type(self).__name__
+
     @abstractmethod
     async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """run the agent logic and return updated state."""
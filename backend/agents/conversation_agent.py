@@ -1,27 +1,53 @@
 """conversation agent that orchestrates agents to produce final response."""
-from typing import Dict, Any, Optional, List
+from typing import Awaitable, Callable, Dict, Any, Optional, List
 from agents.emotion_agent import EmotionAgent
 from agents.language_router import LanguageRouterAgent
 from agents.rag_agent import RAGAgent
+from agents.smalltalk_agent import SmallTalkAgent
 from agents.tone_adapter import ToneAdapterAgent
+from workflows.agent_graph import AgentGraph
 from workflows.music_workflow import music_workflow
 from config.prompts import PROMPTS, PromptType
 from utils.model_loader import ModelLoader
+from utils.metrics import track_call
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 import logging
 
 logger = logging.getLogger(__name__)
 
+# receives each new piece of the reply as it is generated, with the turn state
+DeltaFn = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
 
 class ConversationAgent:
     """high-level orchestrator that runs sub-agents to build a response."""
 
     def __init__(self) -> None:
+        self.smalltalk_agent = SmallTalkAgent()
         self.emotion_agent = EmotionAgent()
         self.lang_router = LanguageRouterAgent()
         self.rag_agent = RAGAgent()
         self.tone_adapter = ToneAdapterAgent()
+        # emotion, language and retrieval are independent; tone waits on emotion
+        self.graph = AgentGraph(
+            [self.emotion_agent, self.lang_router, self.rag_agent, self.tone_adapter]
+        )
+
+    def _get_llm(self) -> Any:
+        """load the chat model once; shared by every turn."""
+        if not hasattr(self, "_llm"):
+            self._llm = ModelLoader().load_llm()
+        return self._llm
+
+    def warmup(self) -> bool:
+        """construct the LLM client ahead of the first turn; False when offline."""
+        import os
+
+        if os.getenv("LLM_OFFLINE") == "1":
+            return False
+        self._get_llm()
+        return True
 
     def _format_docs(self, docs: Any) -> str:
         """format retrieved docs into a compact context string."""
@@ -42,25 +68,40 @@ class ConversationAgent:
         history: Optional[List[str]] = None,
         channel: str = "text",
         language: Optional[str] = None,
+        summary: str = "",
+        on_delta: Optional[DeltaFn] = None,
     ) -> Dict[str, Any]:
         """process text input and return final response state.
 
-        this method runs the sub-agents in sequence. In production this should be
-        implemented as a LangGraph workflow with branching and memory.
+        sub-agents run through an AgentGraph: independent agents execute
+        concurrently and per-agent timings (ms) are returned under `timings`.
+        `summary` is the rolling summary of turns older than `history`.
+        with `on_delta`, the LLM reply is streamed and every token is passed
+        on as it arrives (template and offline replies arrive in one piece);
+        the returned state is the same either way.
         """
         state: Dict[str, Any] = {"session_id": session_id, "user_input": text}
         if language:
             state["language"] = language
-        state = await self.emotion_agent.run(state)
-        state = await self.lang_router.run(state)
-        state = await self.rag_agent.run(state)
-        state = await self.tone_adapter.run(state)
+
+        # greetings and chit-chat are answered from templates without the pipeline
+        state = await self.smalltalk_agent.run(state)
+        if state.get("fast_path"):
+            logger.debug("conversation_agent: fast path reply for intent=%s", state.get("intent"))
+            if on_delta is not None:
+                await on_delta(state.get("final_response", ""), state)
+            return state
+
+        state, timings = await self.graph.run(state)
+        state["timings"] = timings
 
         # prepare prompt
         context_docs = state.get("retrieved_context") or []
         context = self._format_docs(context_docs)
         if history:
             context = ("Previous conversation:\n- " + "\n- ".join(history) + "\n\n" + context).strip()
+        if summary:
+            context = ("Summary of earlier conversation:\n" + summary + "\n\n" + context).strip()
 
         tmpl = PROMPTS[PromptType.CONVERSATION_TTS if channel == "voice" else PromptType.CONVERSATION].template
 
@@ -68,12 +109,11 @@ class ConversationAgent:
         import os
         if os.getenv("LLM_OFFLINE") == "1":
             final_response = f"[{state.get('tone','friend')}] {text}"
+            if on_delta is not None:
+                await on_delta(final_response, state)
         else:
-            # lazily load llm
-            if not hasattr(self, "_llm"):
-                self._llm = ModelLoader().load_llm()
             prompt = ChatPromptTemplate.from_template(tmpl)
-            chain = prompt | self._llm | StrOutputParser()
+            chain = prompt | self._get_llm() | StrOutputParser()
             # prefer explicit language provided; else detected language from state
             lang_var = language or state.get("language") or ""
             logger.info(f"conversation_agent: prompting with target language='{lang_var}'")
@@ -83,7 +123,17 @@ class ConversationAgent:
                 user_msg = (
                     f"(IMPORTANT: Respond strictly in '{lang_var}'. Do not switch languages or translate.)\n" + text
                 )
-            final_response = chain.invoke({"context": context, "message": user_msg, "language": lang_var})
+            inputs = {"context": context, "message": user_msg, "language": lang_var}
+            # async call so a client disconnect can cancel the in-flight request
+            with track_call("llm", "conversation"):
+                if on_delta is None:
+                    final_response = await chain.ainvoke(inputs)
+                else:
+                    parts = []
+                    async for delta in chain.astream(inputs):
+                        parts.append(delta)
+                        await on_delta(delta, state)
+                    final_response = "".join(parts)
 
         # optional music intent bridge
         try:
@@ -115,6 +165,8 @@ class ConversationAgent:
                         lines.append(f"{i}. {tr.get('title','')} - {artists}")
                     rec_block = "\n\nMusic suggestions:\n" + "\n".join(lines)
                     final_response = (final_response or "").rstrip() + rec_block
+                    if on_delta is not None:
+                        await on_delta(rec_block, state)
         except Exception as e:  # pragma: no cover - best effort bridge
             logger.debug("music bridge failed: %s", e)
 
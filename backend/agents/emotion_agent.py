@@ -5,6 +5,7 @@ lowercase: returns emotion label and confidence for the provided text.
 from typing import Dict, Any
 from agents.base_agent import BaseAgent
 from services.emotion_service import classify_emotion
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,9 +14,14 @@ logger = logging.getLogger(__name__)
 class EmotionAgent(BaseAgent):
     """agent that classifies emotion from text input."""
 
+    reads = ("user_input", "text")
+    writes = ("emotion",)
+
     async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
         text = state.get("user_input") or state.get("text") or ""
-        label, score = classify_emotion(text)
+        # classifier is blocking (transformers); keep the event loop free so
+        # sibling agents can run concurrently
+        label, score = await asyncio.to_thread(classify_emotion, text)
         logger.debug("emotion_agent: detected %s (%.2f)", label, score)
         state["emotion"] = {"label": label, "confidence": score}
         return state
@@ -10,6 +10,9 @@ logger = logging.getLogger(__name__)
 class LanguageRouterAgent(BaseAgent):
     """determine language and annotate state accordingly."""
 
+    reads = ("user_input", "text", "language")
+    writes = ("language",)
+
     async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
         # if language is already provided (e.g., user selection), preserve it
         if not state.get("language"):
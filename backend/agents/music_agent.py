@@ -20,6 +20,9 @@ logger = logging.getLogger(__name__)
 class MusicAgent(BaseAgent):
     """generate a playlist and cultural explanations from a story."""
 
+    reads = ("text", "story")
+    writes = ("playlist",)
+
     async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
         text = state.get("text") or state.get("story") or ""
         logger.debug("music_agent: generating queries and searching Saavn")
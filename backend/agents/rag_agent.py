@@ -16,6 +16,9 @@ logger = logging.getLogger(__name__)
 class RAGAgent(BaseAgent):
     """retrieve context for user queries from the cultural vector store."""
 
+    reads = ("user_input", "text")
+    writes = ("retrieved_context",)
+
     def __init__(self) -> None:
         try:
             self.config = load_config()
@@ -53,7 +56,8 @@ class RAGAgent(BaseAgent):
                 "available" if self.vectorstore else "unavailable",
             )
             return state
-        docs = self.vectorstore.search(query, top_k=5)
+        # embedding + index work runs in the vectorstore's executor; results are cached
+        docs = await self.vectorstore.asearch(query, top_k=5)
         state["retrieved_context"] = docs
         logger.debug("rag_agent: retrieved %d docs", len(docs))
         return state
@@ -0,0 +1,158 @@
+"""fast-path agent that answers greetings and chit-chat from canned templates.
+
+lowercase: a keyword classifier runs ahead of the conversation pipeline; when
+the whole message is a greeting, thanks or goodbye the reply is served from
+precomputed templates per language and tone, skipping emotion, retrieval and
+the LLM.
+
+toggles:
+- config: config.yaml -> fast_path.enabled: false
+- env: FAST_PATH_DISABLED=1
+"""
+from typing import Any, Dict, Optional, Tuple
+import logging
+import os
+import re
+
+from agents.base_agent import BaseAgent
+from config.prompts import SMALLTALK_RESPONSES
+from models.enums import Language, Tone
+from utils.config_loader import load_config
+from utils.language_utils import detect_language
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+FAST_PATH_HITS = REGISTRY.counter(
+    "supermuseum_fast_path_hits_total",
+    "Messages answered by the small-talk fast path.",
+    ["intent", "language"],
+)
+
+# whole-message phrases per intent (normalized: lowercase, no punctuation)
+INTENT_PHRASES: Dict[str, Tuple[str, ...]] = {
+    "greeting": (
+        "hi", "hii", "hello", "hey", "hola", "yo", "namaste", "namaskar", "namaskaram",
+        "vanakkam", "sat sri akal", "good morning", "good afternoon", "good evening",
+        "नमस्ते", "नमस्कार", "प्रणाम", "வணக்கம்",
+    ),
+    "thanks": (
+        "thanks", "thank you", "thankyou", "thx", "ty", "dhanyavaad", "dhanyavad",
+        "dhanyawad", "shukriya", "nandri", "धन्यवाद", "शुक्रिया", "நன்றி",
+    ),
+    "goodbye": (
+        "bye", "goodbye", "good bye", "bye bye", "see you", "see you later", "alvida",
+        "phir milenge", "tata", "अलविदा", "फिर मिलेंगे",
+    ),
+}
+
+# polite filler that may surround a phrase without changing the intent
+FILLER_WORDS = frozenset(
+    {"ji", "there", "guide", "friend", "so", "much", "very", "a", "lot", "again", "all",
+     "everyone", "sir", "madam", "bhai", "dost", "जी", "बहुत", "आपका"}
+)
+
+_PUNCT_RE = re.compile(r"[^\w\s]+", re.UNICODE)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_PUNCT_RE.sub(" ", (text or "").lower()).split())
+
+
+class SmallTalkAgent(BaseAgent):
+    """classify small talk and answer it without the full pipeline."""
+
+    reads = ("user_input", "text", "language")
+    writes = ("intent", "final_response", "fast_path", "language", "tone")
+
+    def __init__(self) -> None:
+        try:
+            cfg = load_config().get("fast_path", {}) or {}
+        except Exception:
+            cfg = {}
+        self.enabled: bool = bool(cfg.get("enabled", True))
+        self.max_words: int = int(cfg.get("max_words", 6))
+        self.tone: str = str(cfg.get("tone", Tone.FRIEND.value))
+        # longest phrases first so "bye bye" wins over "bye"
+        self._phrases = sorted(
+            (
+                (tuple(_normalize(p).split()), intent)
+                for intent, ps in INTENT_PHRASES.items()
+                for p in ps
+            ),
+            key=lambda item: -len(item[0]),
+        )
+        self._templates = self._precompute_templates()
+
+    def _precompute_templates(self) -> Dict[Tuple[str, str, str], str]:
+        """flatten templates for every (intent, language, tone) with fallbacks."""
+        flat: Dict[Tuple[str, str, str], str] = {}
+        for intent, by_lang in SMALLTALK_RESPONSES.items():
+            english = by_lang.get(Language.EN.value, {})
+            for lang in Language:
+                lang_block = by_lang.get(lang.value, {})
+                for tone in Tone:
+                    text = (
+                        lang_block.get(tone.value)
+                        or lang_block.get(Tone.FRIEND.value)
+                        or english.get(tone.value)
+                        or english.get(Tone.FRIEND.value)
+                    )
+                    if text:
+                        flat[(intent, lang.value, tone.value)] = text
+        return flat
+
+    def classify(self, text: str) -> Optional[str]:
+        """return the small-talk intent if the whole message is chit-chat."""
+        words = _normalize(text).split()
+        if not words or len(words) > self.max_words:
+            return None
+        intent: Optional[str] = None
+        i = 0
+        while i < len(words):
+            if words[i] in FILLER_WORDS:
+                i += 1
+                continue
+            for phrase, phrase_intent in self._phrases:
+                if tuple(words[i : i + len(phrase)]) == phrase:
+                    # "hi, thanks" is still small talk; keep the first intent
+                    intent = intent or phrase_intent
+                    i += len(phrase)
+                    break
+            else:
+                return None
+        return intent
+
+    def _is_enabled(self) -> bool:
+        return self.enabled and os.getenv("FAST_PATH_DISABLED") != "1"
+
+    def respond(self, intent: str, language: str, tone: Optional[str] = None) -> Optional[str]:
+        tone = tone or self.tone
+        return self._templates.get((intent, language, tone)) or self._templates.get(
+            (intent, Language.EN.value, tone)
+        )
+
+    async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        state["fast_path"] = False
+        if not self._is_enabled():
+            return state
+        text = state.get("user_input") or state.get("text") or ""
+        intent = self.classify(text)
+        if not intent:
+            return state
+        language = state.get("language") or detect_language(text)
+        reply = self.respond(intent, language)
+        if not reply:
+            return state
+        FAST_PATH_HITS.inc(intent=intent, language=language)
+        logger.debug("smalltalk_agent: fast path intent=%s language=%s", intent, language)
+        state.update(
+            {
+                "intent": intent,
+                "final_response": reply,
+                "fast_path": True,
+                "language": language,
+                "tone": self.tone,
+            }
+        )
+        return state
@@ -0,0 +1,58 @@
+"""summary agent that folds older conversation turns into a running summary."""
+from typing import Any, Callable, Dict, List, Optional
+from agents.base_agent import BaseAgent
+from config.prompts import PROMPTS, PromptType
+from utils.metrics import track_call
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryAgent(BaseAgent):
+    """merge `summary` and `turns` (history lines) into an updated `summary`.
+
+    uses the chat LLM; when offline (LLM_OFFLINE=1) or the call fails it
+    falls back to an extractive summary of the visitor's own lines, so the
+    history is still compacted and prompt size stays bounded.
+    """
+
+    reads = ("summary", "turns")
+    writes = ("summary",)
+
+    def __init__(
+        self, llm_factory: Optional[Callable[[], Any]] = None, max_words: int = 120
+    ) -> None:
+        self._llm_factory = llm_factory
+        self.max_words = max_words
+
+    def _fallback(self, summary: str, turns: List[str]) -> str:
+        asked = [t.split(":", 1)[1].strip() for t in turns if t.startswith("user:")]
+        words = " ".join(
+            filter(None, [summary, "Visitor asked: " + "; ".join(asked) if asked else ""])
+        ).split()
+        # keep the most recent words: newer questions matter more
+        return " ".join(words[-self.max_words :])
+
+    async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        summary = state.get("summary") or ""
+        turns = state.get("turns") or []
+        if os.getenv("LLM_OFFLINE") == "1" or self._llm_factory is None:
+            state["summary"] = self._fallback(summary, turns)
+            return state
+        from langchain_core.output_parsers import StrOutputParser
+        from langchain_core.prompts import ChatPromptTemplate
+
+        prompt = ChatPromptTemplate.from_template(PROMPTS[PromptType.CONVERSATION_SUMMARY].template)
+        chain = prompt | self._llm_factory() | StrOutputParser()
+        try:
+            with track_call("llm", "summary"):
+                out = await chain.ainvoke(
+                    {"summary": summary, "turns": "\n".join(turns), "max_words": self.max_words}
+                )
+            # the model may overshoot the word limit; hard-cap at twice that
+            state["summary"] = " ".join(out.split()[: self.max_words * 2])
+        except Exception as exc:
+            logger.warning("summary_agent: llm summary failed, using extractive fallback: %s", exc)
+            state["summary"] = self._fallback(summary, turns)
+        return state
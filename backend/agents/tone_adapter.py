@@ -10,6 +10,9 @@ logger = logging.getLogger(__name__)
 class ToneAdapterAgent(BaseAgent):
     """choose a tone based on emotion or user preference."""
 
+    reads = ("emotion",)
+    writes = ("tone",)
+
     async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
         emotion = state.get("emotion", {}).get("label", "curious")
         # simple mapping for now
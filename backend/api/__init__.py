@@ -1,3 +1,3 @@
-"""api package exposing routers for chat, music and health endpoints."""
+"""api package exposing routers for chat, music, health and metrics endpoints."""
 
-__all__ = ["chat", "music", "health"]
+__all__ = ["chat", "music", "health", "tts", "metrics"]
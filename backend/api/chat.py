@@ -1,79 +1,382 @@
 """chat API endpoints for text and voice interactions."""
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from typing import Optional
+from fastapi import (
+    APIRouter,
+    UploadFile,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
 from models.schemas import TextChatRequest, VoiceChatResponse
 from workflows.chat_workflow import chat_workflow
-from services.whisper_service import transcribe_audio
+from services.whisper_service import transcribe_audio, transcribe_partial
 from services.sarvam_service import synthesize_text
 import base64
 import uuid
-import shutil
-from pathlib import Path
 from config.settings import settings
+from utils.audio_processor import (
+    AudioDecodeError,
+    UploadTooLarge,
+    decode_to_pcm,
+    read_upload,
+    split_wav,
+    wav_header,
+)
+from utils.audio_response import (
+    FORMAT_EXTENSIONS,
+    FORMAT_MEDIA_TYPES,
+    JSON,
+    MPEG,
+    MULTIPART,
+    OGG,
+    WAV,
+    audio_response,
+    metadata_headers,
+    multipart_part,
+    multipart_response,
+    negotiate,
+    output_format,
+    streaming_multipart_response,
+)
+from utils.config_loader import load_config
+from utils.disconnect import cancel_on_disconnect
+from utils.vad import EnergyVAD
+from workflows.voice_pipeline import PipelinedVoiceTurn, SpokenSentence
+from workflows.voice_stream import SAMPLE_RATE, VoiceStreamSession
+import json
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+try:
+    _config = load_config()
+except Exception:
+    _config = {}
+_upload_cfg = _config.get("voice_upload", {}) or {}
+_stream_cfg = _config.get("voice_stream", {}) or {}
+_tts_stream_cfg = (_config.get("tts", {}) or {}).get("stream", {}) or {}
+MAX_UPLOAD_BYTES = int(float(_upload_cfg.get("max_mb", 10)) * 2**20)
+SPOOL_BYTES = int(float(_upload_cfg.get("spool_mb", 2)) * 2**20)
+
 
 @router.post("/text")
-async def chat_text(req: TextChatRequest):
-    """accept text input and return conversational response."""
+async def chat_text(req: TextChatRequest, request: Request):
+    """accept text input and return conversational response.
+
+    the turn is cancelled (and history left untouched) if the client disconnects.
+    """
     session_id = req.session_id or str(uuid.uuid4())
     # pass through desired language if provided
     lang = getattr(req.language, "value", None) if req.language else None
-    state = await chat_workflow.run(session_id, req.message, is_voice=False, language=lang)
+    state = await cancel_on_disconnect(
+        request,
+        chat_workflow.run(session_id, req.message, is_voice=False, language=lang),
+        route="chat_text",
+    )
     return {"session_id": session_id, "response": state.get("final_response")}
 
 
-@router.post("/voice")
-async def chat_voice(file: UploadFile = File(...)) -> VoiceChatResponse:
-    """accept audio file, transcribe, detect emotion and return synthesized audio."""
-    # save to temp
-    temp_dir = Path(settings.audio_temp_dir)
-    temp_dir.mkdir(parents=True, exist_ok=True)
-    file_path = temp_dir / f"{uuid.uuid4()}_{file.filename}"
-    with open(file_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+@router.post(
+    "/voice",
+    response_model=VoiceChatResponse,
+    responses={
+        200: {"content": {WAV: {}, OGG: {}, MPEG: {}, MULTIPART: {}}},
+        204: {"description": "raw audio requested, none could be synthesized"},
+    },
+)
+async def chat_voice(
+    request: Request,
+    file: UploadFile = File(...),
+    audio_format: Optional[str] = Form(None, alias="format"),
+    stream: bool = Form(False),
+):
+    """accept audio file, transcribe, detect emotion and return synthesized audio.
+
+    transcription, generation and synthesis are cancelled if the client disconnects.
+    the upload is decoded in memory (or via ffmpeg pipes) to 16 kHz PCM; only
+    uploads larger than the spool threshold touch disk, in an anonymous temp
+    file that is removed when the request ends, whatever the outcome.
+
+    the response is negotiated from Accept: JSON with base64 audio (default),
+    `multipart/mixed` (a JSON metadata part, then the wav part), or
+    `audio/wav` (the clip as the body, metadata in X- headers; 204 with the
+    headers when no audio could be synthesized). audio/ogg or audio/mpeg, or
+    a `format` form field (wav, opus, mp3), select a compressed reply.
 
+    with `stream=true` the reply is pipelined: LLM tokens are cut into
+    sentences as they arrive and each sentence is synthesized and sent at
+    once, as multipart/mixed or (for an audio Accept) one chunked audio body
+    in the negotiated format (see `_pipelined_reply`).
+    """
+    if audio_format is not None and audio_format not in FORMAT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"unsupported audio format: {audio_format}")
+    wants = negotiate(request.headers.get("accept"), [JSON, MULTIPART, WAV, OGG, MPEG])
+    fmt = output_format(wants, audio_format)
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_UPLOAD_BYTES + 64 * 1024:
+        raise HTTPException(
+            status_code=413, detail=f"audio upload exceeds {MAX_UPLOAD_BYTES} bytes"
+        )
     try:
-        transcribed = await transcribe_audio(str(file_path))
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=str(exc))
+        audio = await read_upload(file, MAX_UPLOAD_BYTES, SPOOL_BYTES, settings.audio_temp_dir)
+    except UploadTooLarge as exc:
+        raise HTTPException(status_code=413, detail=f"audio upload exceeds {exc.limit} bytes")
 
-    text = transcribed.get("text", "")
-    session_id = str(uuid.uuid4())
-    state = await chat_workflow.run(session_id, text, is_voice=True)
+    async def _transcribe():
+        try:
+            pcm = await decode_to_pcm(audio)
+        except AudioDecodeError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        finally:
+            audio.close()
+        try:
+            return await transcribe_audio(pcm)
+        except Exception as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    if stream:
+        try:
+            transcribed = await cancel_on_disconnect(request, _transcribe(), route="chat_voice")
+        finally:
+            audio.close()
+        return await _pipelined_reply(
+            request, transcribed, raw_audio=wants not in (JSON, MULTIPART), fmt=fmt
+        )
+
+    async def _voice_turn():
+        transcribed = await _transcribe()
+        text = transcribed.get("text", "")
+        session_id = str(uuid.uuid4())
+        state = await chat_workflow.run(session_id, text, is_voice=True)
+
+        # synthesize response using Sarvam (if configured)
+        audio_bytes = None
+        try:
+            audio_bytes = await synthesize_text(
+                state.get("final_response", ""),
+                language=state.get("language", "english"),
+                audio_format=fmt,
+            )
+        except Exception as e:
+            logger.debug(f"sarvam synthesis failed or not configured: {e}")
+        return transcribed, text, state, audio_bytes
 
-    # synthesize response using Sarvam (if configured)
-    audio_b64 = None
     try:
-        audio_bytes = await synthesize_text(
-            state.get("final_response", ""),
-            language=state.get("language", "english"),
+        transcribed, text, state, audio_bytes = await cancel_on_disconnect(
+            request, _voice_turn(), route="chat_voice"
         )
-        audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
-    except Exception as e:
-        logger.debug(f"sarvam synthesis failed or not configured: {e}")
+    finally:
+        # also covers a disconnect before decoding started
+        audio.close()
 
+    metadata = {
+        "transcript": text,
+        "language": transcribed.get("language", "english"),
+        "emotion": state.get("emotion", {}).get("label", "curious"),
+        "confidence": transcribed.get("confidence", 0.0),
+    }
+    if wants == MULTIPART:
+        return multipart_response(
+            {**metadata, "response": state.get("final_response", ""), "format": fmt},
+            audio_bytes,
+            audio_type=FORMAT_MEDIA_TYPES[fmt],
+            filename=f"reply.{FORMAT_EXTENSIONS[fmt]}",
+        )
+    if wants != JSON:
+        if audio_bytes is None:
+            return Response(status_code=204, headers=metadata_headers(metadata))
+        return audio_response(audio_bytes, metadata, media_type=FORMAT_MEDIA_TYPES[fmt])
     return VoiceChatResponse(
-        transcript=text,
-        language=transcribed.get("language", "english"),
-        emotion=state.get("emotion", {}).get("label", "curious"),
+        **metadata,
         tts_url=None,
-        audio_base64=audio_b64,
-        confidence=transcribed.get("confidence", 0.0),
+        audio_base64=(
+            base64.b64encode(audio_bytes).decode("utf-8") if audio_bytes is not None else None
+        ),
+        format=fmt,
     )
 
 
+async def _pipelined_reply(request: Request, transcribed: dict, raw_audio: bool, fmt: str):
+    """stream a voice reply sentence by sentence while the LLM is still generating.
+
+    raw_audio (Accept audio/wav, audio/ogg or audio/mpeg): one chunked body in
+    `fmt` with the transcript in X- headers. wav is one header followed by every
+    sentence's frames; opus is a chained Ogg stream and mp3 back-to-back frames,
+    one clip per sentence. headers wait for the first sentence, so a reply with
+    no audio at all is a 204 like the non-streamed route. otherwise
+    multipart/mixed: a JSON part with the transcript, one audio part per
+    sentence (X-Sequence, X-Text headers) in `fmt`, then a JSON part with the
+    full reply text. the turn is cancelled if the client disconnects mid-stream.
+    """
+    text = transcribed.get("text", "")
+    metadata = {
+        "session_id": str(uuid.uuid4()),
+        "transcript": text,
+        "language": transcribed.get("language", "english"),
+        "confidence": transcribed.get("confidence", 0.0),
+    }
+
+    async def _speak(sentence: str, language: str) -> bytes:
+        return await synthesize_text(sentence, language=language, audio_format=fmt)
+
+    turn = PipelinedVoiceTurn(
+        chat_workflow,
+        _speak,
+        metadata["session_id"],
+        text,
+        max_parallel=int(_tts_stream_cfg.get("max_parallel", 3)),
+        max_chars=int(_tts_stream_cfg.get("max_chars", 400)),
+    )
+
+    if raw_audio:
+        run = turn.run()
+
+        async def _next_clip():
+            async for item in run:
+                if isinstance(item, SpokenSentence):
+                    return item
+            return None
+
+        try:
+            first = await cancel_on_disconnect(request, _next_clip(), route="chat_voice")
+        except BaseException:
+            await run.aclose()
+            raise
+        if first is None:
+            return Response(status_code=204, headers=metadata_headers(metadata))
+
+        async def _audio():
+            try:
+                clip = first
+                stream_fmt = None
+                while clip is not None:
+                    if fmt != "wav":
+                        yield clip.audio
+                    else:
+                        clip_fmt, pcm = split_wav(clip.audio)
+                        if stream_fmt is None:
+                            stream_fmt = clip_fmt
+                            yield wav_header(stream_fmt)
+                        if clip_fmt == stream_fmt:
+                            yield pcm
+                    clip = await _next_clip()
+            finally:
+                await run.aclose()
+
+        return StreamingResponse(
+            _audio(), media_type=FORMAT_MEDIA_TYPES[fmt], headers=metadata_headers(metadata)
+        )
+
+    def _json(payload: dict):
+        return multipart_part(
+            f"{JSON}; charset=utf-8", json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        )
+
+    async def _parts():
+        yield _json(metadata)
+        try:
+            async for item in turn.run():
+                if isinstance(item, SpokenSentence):
+                    yield multipart_part(
+                        FORMAT_MEDIA_TYPES[fmt],
+                        item.audio,
+                        metadata_headers({"sequence": item.seq, "text": item.text}),
+                    )
+                else:
+                    yield _json(
+                        {
+                            "response": item.get("final_response", ""),
+                            "language": item.get("language"),
+                            "emotion": (item.get("emotion") or {}).get("label"),
+                            "format": fmt,
+                        }
+                    )
+        except Exception as exc:
+            logger.exception("pipelined voice reply failed: %s", exc)
+            yield _json({"error": str(exc)})
+
+    return streaming_multipart_response(_parts())
+
+
+@router.websocket("/voice/ws")
+async def chat_voice_ws(
+    websocket: WebSocket,
+    session_id: Optional[str] = None,
+    language: Optional[str] = None,
+    tts: bool = True,
+):
+    """stream microphone audio and get partial transcripts and replies back.
+
+    client -> server: binary frames of 16 kHz mono s16le PCM; text frames
+    {"type": "end"} (force end-of-speech) or {"type": "stop"} (close).
+    server -> client JSON: ready, partial, final, response, audio, error.
+    """
+    await websocket.accept()
+    session = VoiceStreamSession(
+        send=websocket.send_json,
+        workflow=chat_workflow,
+        transcribe=transcribe_audio,
+        transcribe_partial=transcribe_partial,
+        synthesize=synthesize_text if tts else None,
+        session_id=session_id or str(uuid.uuid4()),
+        language=language,
+        partial_interval_s=float(_stream_cfg.get("partial_interval_s", 0.8)),
+        partial_window_s=float(_stream_cfg.get("partial_window_s", 6)),
+        max_utterance_s=float(_stream_cfg.get("max_utterance_s", 30)),
+        vad=EnergyVAD(
+            sample_rate=SAMPLE_RATE,
+            min_rms=float(_stream_cfg.get("min_rms", 300)),
+            min_speech_ms=int(_stream_cfg.get("min_speech_ms", 150)),
+            end_silence_ms=int(_stream_cfg.get("end_silence_ms", 700)),
+        ),
+    )
+    await session.send(
+        {"type": "ready", "session_id": session.session_id, "sample_rate": SAMPLE_RATE}
+    )
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                await session.feed(message["bytes"])
+            elif message.get("text"):
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    control = None
+                if not isinstance(control, dict):
+                    await session.send({"type": "error", "detail": "expected JSON control message"})
+                    continue
+                if control.get("type") == "end":
+                    await session.end_of_speech()
+                elif control.get("type") == "stop":
+                    await session.end_of_speech()
+                    await session.wait_idle()
+                    await websocket.close()
+                    break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # a vanished client cancels its in-flight turn, like the HTTP routes
+        await session.close()
+
+
 @router.get("/history/{session_id}")
 async def get_history(session_id: str):
-    """retrieve conversation history for a session (in-memory MVP)."""
-    # TODO: implement conversation memory storage (redis)
-    return {"session_id": session_id, "messages": []}
+    """retrieve conversation history for a session: rolling summary + recent lines."""
+    history = await chat_workflow.store.load(session_id)
+    return {"session_id": session_id, "summary": history.summary, "messages": history.lines}
 
 
 @router.delete("/history/{session_id}")
 async def delete_history(session_id: str):
     """clear conversation history for a session."""
-    # TODO: implement persistent store deletion
-    return {"session_id": session_id, "deleted": True}
+    deleted = await chat_workflow.clear_history(session_id)
+    return {"session_id": session_id, "deleted": deleted}
@@ -1,10 +1,26 @@
-"""health check endpoints for the service."""
-from fastapi import APIRouter
+"""health check endpoints for the service.
+
+lowercase: `/health` is liveness (the process is up and serving) and
+`/ready` is readiness (startup warm-up finished and no required component
+failed), with per-component state and duration.
+"""
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 
 router = APIRouter()
 
 
 @router.get("/health")
 async def health_check():
-    """simple health check returning service status."""
+    """liveness: the event loop is serving requests."""
     return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness_check(request: Request):
+    """readiness: 200 once warm-up is done, 503 while warming or after a required failure."""
+    warmup = getattr(request.app.state, "warmup", None)
+    if warmup is None:
+        return JSONResponse({"ready": False, "done": False, "components": {}}, status_code=503)
+    body = warmup.status()
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
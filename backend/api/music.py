@@ -1,8 +1,10 @@
 """music API endpoints for analysis and generation."""
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from models.schemas import MusicAnalyzeRequest, PlaylistResponse, TrackMetadata
 from workflows.music_workflow import music_workflow
 from services.saavn_service import saavn_client
+from utils.metrics import track_call
+from utils.disconnect import cancel_on_disconnect, ClientDisconnected
 import logging
 
 router = APIRouter()
@@ -10,7 +12,9 @@ logger = logging.getLogger(__name__)
 
 
 @router.post("/generate")
-async def generate_playlist(req: MusicAnalyzeRequest, include_stream: bool = Query(False)) -> PlaylistResponse:
+async def generate_playlist(
+    req: MusicAnalyzeRequest, request: Request, include_stream: bool = Query(False)
+) -> PlaylistResponse:
     """generate a playlist for a story text.
     
     args:
@@ -18,7 +22,11 @@ async def generate_playlist(req: MusicAnalyzeRequest, include_stream: bool = Que
         include_stream: if True, includes playable stream URLs (default: False for security)
     """
     try:
-        state = await music_workflow.run(req.text)
+        state = await cancel_on_disconnect(
+            request, music_workflow.run(req.text), route="music_generate"
+        )
+    except ClientDisconnected:
+        raise
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
     items = state.get("playlist", [])
@@ -43,14 +51,14 @@ async def generate_playlist(req: MusicAnalyzeRequest, include_stream: bool = Que
 
 
 @router.post("/analyze")
-async def analyze_story(req: MusicAnalyzeRequest):
+async def analyze_story(req: MusicAnalyzeRequest, request: Request):
     """analyze story and return extracted musical features."""
-    state = await music_workflow.run(req.text)
+    state = await cancel_on_disconnect(request, music_workflow.run(req.text), route="music_analyze")
     return {"features": state.get("music_features")}
 
 
 @router.get("/track/{track_id}")
-async def get_track(track_id: str, include_stream: bool = Query(False)):
+async def get_track(track_id: str, request: Request, include_stream: bool = Query(False)):
     """fetch track details from Saavn.
 
     args:
@@ -59,7 +67,11 @@ async def get_track(track_id: str, include_stream: bool = Query(False)):
     """
     try:
         logger.info(f"Fetching track details for ID: {track_id}, include_stream: {include_stream}")
-        item = await saavn_client.get_song_details(track_id)
+        item = await cancel_on_disconnect(
+            request, saavn_client.get_song_details(track_id), route="music_track"
+        )
+    except ClientDisconnected:
+        raise
     except Exception as exc:
         logger.error(f"Error fetching track {track_id}: {exc}")
         raise HTTPException(status_code=500, detail=str(exc))
@@ -80,7 +92,12 @@ async def get_track(track_id: str, include_stream: bool = Query(False)):
 
 
 @router.get("/search")
-async def search_tracks(q: str = Query(..., description="search query"), limit: int = 10, include_stream: bool = Query(False)):
+async def search_tracks(
+    request: Request,
+    q: str = Query(..., description="search query"),
+    limit: int = 10,
+    include_stream: bool = Query(False),
+):
     """search tracks on Saavn and return normalized results.
     
     Uses LLM to intelligently expand cultural music queries into better Saavn search terms.
@@ -91,26 +108,11 @@ async def search_tracks(q: str = Query(..., description="search query"), limit:
         include_stream: if True, includes playable stream URLs (default: False for security)
     """
     try:
-        # Use LLM to enhance the query for Indian cultural music
-        enhanced_query = await _enhance_music_query(q)
-        logger.info(f"Original query: '{q}' -> Enhanced: '{enhanced_query}'")
-        
-        items = await saavn_client.search_songs(enhanced_query, limit=limit)
-        
-        # If no results, try with original query as fallback
-        if not items:
-            logger.info(f"No results with enhanced query, trying original: '{q}'")
-            items = await saavn_client.search_songs(q, limit=limit)
-        
-        # If still no results, try generic Indian folk/classical terms
-        if not items:
-            fallback_terms = _get_fallback_terms(q)
-            logger.info(f"Trying fallback terms: {fallback_terms}")
-            for term in fallback_terms:
-                items = await saavn_client.search_songs(term, limit=limit)
-                if items:
-                    break
-                    
+        items = await cancel_on_disconnect(
+            request, _search_with_fallbacks(q, limit), route="music_search"
+        )
+    except ClientDisconnected:
+        raise
     except Exception as exc:
         logger.error(f"Search failed: {exc}")
         raise HTTPException(status_code=500, detail=str(exc))
@@ -129,6 +131,30 @@ async def search_tracks(q: str = Query(..., description="search query"), limit:
     return {"results": tracks}
 
 
+async def _search_with_fallbacks(q: str, limit: int) -> list:
+    """search Saavn with an LLM-enhanced query, then the raw query, then fallbacks."""
+    # Use LLM to enhance the query for Indian cultural music
+    enhanced_query = await _enhance_music_query(q)
+    logger.info(f"Original query: '{q}' -> Enhanced: '{enhanced_query}'")
+    
+    items = await saavn_client.search_songs(enhanced_query, limit=limit)
+    
+    # If no results, try with original query as fallback
+    if not items:
+        logger.info(f"No results with enhanced query, trying original: '{q}'")
+        items = await saavn_client.search_songs(q, limit=limit)
+    
+    # If still no results, try generic Indian folk/classical terms
+    if not items:
+        fallback_terms = _get_fallback_terms(q)
+        logger.info(f"Trying fallback terms: {fallback_terms}")
+        for term in fallback_terms:
+            items = await saavn_client.search_songs(term, limit=limit)
+            if items:
+                break
+    return items
+
+
 def _get_fallback_terms(query: str) -> list[str]:
     """Generate fallback search terms based on query keywords."""
     query_lower = query.lower()
@@ -176,7 +202,8 @@ Return ONLY the enhanced search query, nothing else. No explanations.
 
 Enhanced Query:"""
 
-    response = await llm.ainvoke(prompt)
+    with track_call("llm", "music_query"):
+        response = await llm.ainvoke(prompt)
     enhanced = response.content.strip().strip('"').strip("'")
     
     # Fallback to original if LLM returns empty or too long
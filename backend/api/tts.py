@@ -1,24 +1,69 @@
 """direct text-to-speech API endpoint using Sarvam AI."""
-from fastapi import APIRouter, HTTPException
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse
 from models.schemas import TTSRequest, TTSResponse
-from services.sarvam_service import get_sarvam_service
+from services.sarvam_service import SPEAKER_ALIASES, get_sarvam_service
+from services.tts_clips import ClipLibrary
+from utils.config_loader import load_config
+from utils.audio_response import (
+    FORMAT_MEDIA_TYPES,
+    JSON,
+    MPEG,
+    OGG,
+    WAV,
+    audio_response,
+    negotiate,
+    output_format,
+)
 import base64
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+_clip_library: Optional[ClipLibrary] = None
 
-@router.post("/convert", response_model=TTSResponse)
-async def tts_convert(req: TTSRequest) -> TTSResponse:
+
+def get_clip_library() -> ClipLibrary:
+    """the precomputed clip store, built from config on first use."""
+    global _clip_library
+    if _clip_library is None:
+        try:
+            config = load_config()
+        except Exception:
+            config = {}
+        _clip_library = ClipLibrary.from_config(config)
+    return _clip_library
+
+
+@router.post(
+    "/convert",
+    response_model=TTSResponse,
+    responses={
+        200: {
+            "content": {WAV: {}, OGG: {}, MPEG: {}},
+            "description": "JSON, or the raw clip with `Accept: audio/*`",
+        }
+    },
+)
+async def tts_convert(req: TTSRequest, request: Request):
     """convert input text to speech and return base64-encoded audio.
 
-    uses Sarvam AI under the hood.
+    uses Sarvam AI under the hood via the async client, so the event loop
+    keeps serving other requests while the remote call is in flight. with
+    `Accept: audio/wav` the clip is returned as the body instead, with the
+    language and speaker in X-Language / X-Speaker headers. audio/ogg (Opus)
+    and audio/mpeg (MP3), or `format` in the body, select a compressed clip.
     """
+    wants = negotiate(request.headers.get("accept"), [JSON, WAV, OGG, MPEG])
+    fmt = output_format(wants, req.format)
     try:
         service = get_sarvam_service()
-        audio_bytes = service.synthesize_text(
+        audio_bytes = await service.asynthesize_encoded(
             text=req.text,
+            audio_format=fmt,
+            bitrate=req.bitrate,
             language=req.language or "english",
             speaker=req.speaker or "anushka",
             pitch=req.pitch or 0.0,
@@ -27,8 +72,102 @@ async def tts_convert(req: TTSRequest) -> TTSResponse:
             enable_preprocessing=req.enable_preprocessing if req.enable_preprocessing is not None else True,
             model=req.model or "bulbul:v2",
         )
+        if wants != JSON:
+            return audio_response(
+                audio_bytes,
+                {"language": req.language or "english", "speaker": req.speaker or "anushka"},
+                media_type=FORMAT_MEDIA_TYPES[fmt],
+            )
         audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
-        return TTSResponse(audio_base64=audio_b64, language=req.language or "english", speaker=req.speaker or "anushka")
+        return TTSResponse(
+            audio_base64=audio_b64,
+            language=req.language or "english",
+            speaker=req.speaker or "anushka",
+            format=fmt,
+        )
     except Exception as exc:
         logger.exception("tts conversion failed")
         raise HTTPException(status_code=500, detail=str(exc))
+
+
+@router.post("/stream")
+async def tts_stream(req: TTSRequest) -> StreamingResponse:
+    """stream speech as chunked audio/wav, one sentence at a time.
+
+    sentences are synthesized concurrently (capped per reply) and written in
+    order, so the first audio arrives after one sentence's synthesis rather
+    than the whole answer's. errors before the first sentence return 500;
+    a later failure ends the stream early.
+    """
+    service = get_sarvam_service()
+    stream = service.astream_speech(
+        text=req.text,
+        language=req.language or "english",
+        speaker=req.speaker or "anushka",
+        pitch=req.pitch or 0.0,
+        pace=req.pace or 1.0,
+        loudness=req.loudness or 1.0,
+        enable_preprocessing=(
+            req.enable_preprocessing if req.enable_preprocessing is not None else True
+        ),
+        model=req.model or "bulbul:v2",
+    )
+    try:
+        header = await stream.__anext__()
+    except Exception as exc:
+        await stream.aclose()
+        logger.exception("tts stream failed before the first chunk")
+        raise HTTPException(status_code=500, detail=str(exc))
+
+    async def _body():
+        yield header
+        try:
+            async for chunk in stream:
+                yield chunk
+        except Exception:
+            logger.exception("tts stream ended early")
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(_body(), media_type="audio/wav")
+
+
+@router.get("/clips")
+async def tts_clips() -> dict:
+    """pre-voiced clip ids and their language/speaker slots."""
+    library = get_clip_library()
+    library.refresh()
+    return {clip_id: sorted(slots) for clip_id, slots in sorted(library.clips.items())}
+
+
+@router.get("/clips/{clip_id}", responses={200: {"content": {WAV: {}, OGG: {}, MPEG: {}}}})
+async def tts_clip(
+    clip_id: str,
+    request: Request,
+    language: str = "english",
+    speaker: Optional[str] = None,
+    format: Optional[Literal["wav", "opus", "mp3"]] = None,
+) -> FileResponse:
+    """serve a clip made by scripts/precompute_tts.py; no synthesis happens here.
+
+    the format comes from `format` or the Accept header (wav by default);
+    without a speaker the first one voiced in that language is used.
+    """
+    library = get_clip_library()
+    library.refresh()
+    fmt = format or output_format(negotiate(request.headers.get("accept"), [WAV, OGG, MPEG]))
+    path = library.locate(clip_id, language.lower(), SPEAKER_ALIASES.get(speaker, speaker), fmt)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"no {fmt} clip '{clip_id}' for {language}")
+    return FileResponse(
+        path, media_type=FORMAT_MEDIA_TYPES[fmt], headers={"Cache-Control": "public, max-age=3600"}
+    )
+
+
+@router.get("/cache")
+async def tts_cache_stats() -> dict:
+    """hit rate and bytes saved by the TTS audio cache."""
+    cache = get_sarvam_service().cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
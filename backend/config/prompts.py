@@ -12,6 +12,7 @@ class PromptType(str, Enum):
     CONVERSATION = "conversation"
     CONVERSATION_TTS = "conversation_tts"
     MUSIC_ANALYSIS = "music_analysis"
+    CONVERSATION_SUMMARY = "conversation_summary"
 
 
 class PromptTemplate:
@@ -90,4 +91,90 @@ PROMPTS: Dict[PromptType, PromptTemplate] = {
         ),
         description="Music analysis with strict JSON contract and culturally-aware extraction",
     ),
+
+    # Rolling summary of older turns so long sessions keep a constant prompt size
+    PromptType.CONVERSATION_SUMMARY: PromptTemplate(
+        template=(
+            "You maintain the running memory of a museum guide's conversation with a visitor.\n"
+            "Merge the EARLIER SUMMARY and the NEW TURNS into one updated summary.\n"
+            "Rules:\n"
+            "- At most {max_words} words, plain prose, no lists or headings.\n"
+            "- Keep the visitor's name, language preference, interests and questions still open.\n"
+            "- Keep exhibits, places, people and festivals already discussed, "
+            "with key facts given.\n"
+            "- Drop greetings, filler and anything repeated.\n"
+            "- Write in English even if the conversation was in another language.\n\n"
+            "EARLIER SUMMARY (may be empty):\n{summary}\n\n"
+            "NEW TURNS:\n{turns}\n\n"
+            "UPDATED SUMMARY:"
+        ),
+        description="Compress older conversation turns into a bounded running summary",
+    ),
+}
+
+
+# canned replies for greetings and chit-chat served by the fast path (no LLM).
+# keyed by intent -> language -> tone; missing combinations fall back to the
+# "friend" tone and then to english (see agents/smalltalk_agent.py).
+SMALLTALK_RESPONSES: Dict[str, Dict[str, Dict[str, str]]] = {
+    "greeting": {
+        "english": {
+            "friend": "Hi there! Welcome to the museum. What would you like to explore today?",
+            "teacher": (
+                "Hello and welcome. Which exhibit or tradition would you like to learn about?"
+            ),
+            "mythic_narrator": (
+                "Welcome, traveller, to halls where old stories still breathe. "
+                "Which tale calls to you?"
+            ),
+            "folk_storyteller": (
+                "Namaste and welcome! Sit a while. "
+                "Shall I tell you about a festival, a song or a temple?"
+            ),
+        },
+        "hindi": {
+            "friend": "नमस्ते! संग्रहालय में आपका स्वागत है। आज आप क्या देखना चाहेंगे?",
+            "mythic_narrator": "नमस्ते, यात्री! यहाँ पुरानी कथाएँ आज भी जीवित हैं। कौन-सी कथा सुनना चाहेंगे?",
+        },
+        "hinglish": {
+            "friend": "Namaste! Museum mein aapka swagat hai. Aaj kya explore karna chahenge?",
+        },
+        "tamil": {
+            "friend": "வணக்கம்! அருங்காட்சியகத்திற்கு வரவேற்கிறோம். இன்று எதைப் பார்க்க விரும்புகிறீர்கள்?",
+        },
+    },
+    "thanks": {
+        "english": {
+            "friend": "You're welcome! Is there anything else you'd like to know?",
+            "teacher": "You're most welcome. Would you like to explore another topic?",
+            "mythic_narrator": "It is my joy to share these tales. Shall we wander to another?",
+            "folk_storyteller": "Happy to share! There are many more stories here. Want another?",
+        },
+        "hindi": {
+            "friend": "आपका स्वागत है! क्या आप कुछ और जानना चाहेंगे?",
+        },
+        "hinglish": {
+            "friend": "Koi baat nahi! Aur kuch jaanna chahenge?",
+        },
+        "tamil": {
+            "friend": "மகிழ்ச்சி! வேறு ஏதாவது தெரிந்துகொள்ள விரும்புகிறீர்களா?",
+        },
+    },
+    "goodbye": {
+        "english": {
+            "friend": "Goodbye! Thanks for visiting. Come back soon!",
+            "teacher": "Goodbye, and thank you for learning with us today.",
+            "mythic_narrator": "Farewell, traveller. May the old stories walk with you.",
+            "folk_storyteller": "Goodbye! Carry a story home and share it with someone.",
+        },
+        "hindi": {
+            "friend": "अलविदा! आने के लिए धन्यवाद। फिर मिलेंगे!",
+        },
+        "hinglish": {
+            "friend": "Bye! Aane ke liye shukriya. Phir milenge!",
+        },
+        "tamil": {
+            "friend": "போய் வாருங்கள்! வருகைக்கு நன்றி.",
+        },
+    },
 }
@@ -20,7 +20,7 @@ class Settings(BaseSettings):
     sarvam_api_key: Optional[str] = Field(default=None, env="SARVAM_API_KEY")
     saavn_api_key: Optional[str] = Field(default=None, env="SAAVN_API_KEY")
     saavn_api_base: Optional[str] = Field(default="https://saavn.sumit.co/api", env="SAAVN_API_BASE")
-    vectorstore: str = Field(default="chroma")  # chroma | qdrant
+    vectorstore: str = Field(default="chroma", env="VECTORSTORE")  # chroma | numpy
     redis_url: Optional[str] = Field(default=None, env="REDIS_URL")
     audio_temp_dir: str = Field(default=str(Path.cwd() / "tmp"))
 
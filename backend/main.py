@@ -2,9 +2,14 @@
 
 lowercase: this module wires API routers and starts the ASGI app.
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from api import chat, music, health, tts
+from fastapi.responses import Response
+from api import chat, music, health, tts, metrics
+from utils.config_loader import load_config
+from utils.disconnect import ClientDisconnected, CLIENT_CLOSED_REQUEST
+from utils.warmup import build_default_warmup, warmup_enabled
+import asyncio
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -20,19 +25,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(ClientDisconnected)
+async def client_disconnected_handler(request: Request, exc: ClientDisconnected) -> Response:
+    """nobody is listening; reply with an empty 499 so logs show the abandon."""
+    return Response(status_code=CLIENT_CLOSED_REQUEST)
+
+
 app.include_router(chat.router, prefix="/api/chat")
 app.include_router(music.router, prefix="/api/music")
 app.include_router(health.router, prefix="/api")
 app.include_router(tts.router, prefix="/api/tts")
+app.include_router(metrics.router, prefix="/api")
 
 
 @app.on_event("startup")
 async def startup_event() -> None:
-    """perform startup initialization."""
+    """perform startup initialization.
+
+    warm-up runs in the background so liveness answers immediately;
+    `/api/ready` turns 200 once the components are initialized.
+    """
     logger.info("starting SuperMuseum backend")
+    config = load_config()
+    from workflows.chat_workflow import chat_workflow
+
+    chat_workflow.store.start()
+    app.state.warmup = build_default_warmup(config)
+    if warmup_enabled(config):
+        app.state.warmup_task = asyncio.create_task(app.state.warmup.run())
+    else:
+        app.state.warmup.skip_all()
 
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
     """perform shutdown cleanup."""
     logger.info("shutting down SuperMuseum backend")
+    task = getattr(app.state, "warmup_task", None)
+    if task is not None and not task.done():
+        task.cancel()
+    from services.saavn_service import saavn_client
+    from workflows.chat_workflow import chat_workflow
+
+    await chat_workflow.close()
+    await saavn_client.aclose()
+    from services.sarvam_service import _sarvam_service
+
+    if _sarvam_service is not None:
+        await _sarvam_service.aclose()
@@ -1,6 +1,6 @@
 """pydantic request/response schemas for chat and music APIs."""
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Literal
 from models.enums import Language, Emotion, Tone
 
 
@@ -21,6 +21,7 @@ class VoiceChatResponse(BaseModel):
     tts_url: Optional[str] = None
     audio_base64: Optional[str] = None
     confidence: Optional[float] = None
+    format: str = "wav"
 
 
 class TTSRequest(BaseModel):
@@ -34,6 +35,10 @@ class TTSRequest(BaseModel):
     loudness: Optional[float] = Field(default=1.0)
     enable_preprocessing: Optional[bool] = Field(default=True)
     model: Optional[str] = Field(default="bulbul:v2")
+    # compressed output; overrides the format picked from the Accept header
+    format: Optional[Literal["wav", "opus", "mp3"]] = Field(default=None)
+    # "32k", "32000" or "32"; clamped to the range the format supports
+    bitrate: Optional[str] = Field(default=None, pattern=r"^[1-9]\d{0,5}k?$")
 
 
 class TTSResponse(BaseModel):
@@ -42,6 +47,7 @@ class TTSResponse(BaseModel):
     audio_base64: str
     language: str
     speaker: Optional[str] = None
+    format: str = "wav"
 
 
 class MusicAnalyzeRequest(BaseModel):
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""compare vector-only, BM25-only and hybrid (RRF) retrieval on a synthetic corpus.
+
+lowercase: builds a NumPy vector index (fake hashing embedder) and a BM25
+index over the same chunks, then runs labeled proper-noun queries ("what is
+Bihu 42 from Hampi?") and reports recall@k plus p50/p99 latency per mode.
+
+usage:
+    python scripts/bench_hybrid.py --docs 5000 --queries 300 --k 5
+"""
+from pathlib import Path
+import argparse
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_utils import FakeEmbeddings, percentile, synthetic_document  # noqa: E402
+from services.bm25_index import BM25Index, reciprocal_rank_fusion  # noqa: E402
+from services.ingestion_service import chunk_text, content_hash  # noqa: E402
+from services.numpy_index import NumpyVectorIndex  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="hybrid retrieval benchmark")
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--dim", type=int, default=128)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(7)
+    ids, texts, relevant_by_doc, labels_by_doc = [], [], {}, {}
+    seen = set()
+    for i in range(args.docs):
+        text, labels = synthetic_document(i, rng, sentences=8)
+        labels_by_doc[i] = labels
+        relevant_by_doc[i] = set()
+        for piece in chunk_text(text, max_chars=300):
+            cid = content_hash(piece)
+            if f" {i}" in piece or f"Exhibit {i}:" in piece:
+                relevant_by_doc[i].add(cid)
+            if cid not in seen:
+                seen.add(cid)
+                ids.append(cid)
+                texts.append(piece)
+
+    embedder = FakeEmbeddings(dim=args.dim)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        vindex = NumpyVectorIndex(tmp, "bench")
+        vindex.upsert(ids, texts, [{}] * len(ids), embedder.embed_documents(texts))
+        vector_build = time.perf_counter() - start
+        start = time.perf_counter()
+        bm25 = BM25Index.build(ids, texts)
+        bm25.save(str(Path(tmp) / "bench.bm25.json.gz"))
+        bm25_build = time.perf_counter() - start
+        bm25_size = (Path(tmp) / "bench.bm25.json.gz").stat().st_size
+
+        def vector(q):
+            return [
+                vindex.ids[r] for r, _ in vindex.top_k(embedder.embed_query(q), args.candidates)
+            ]
+
+        def lexical(q):
+            return [cid for cid, _ in bm25.search(q, args.candidates)]
+
+        def hybrid(q):
+            return [cid for cid, _ in reciprocal_rank_fusion([vector(q), lexical(q)])]
+
+        sample = rng.sample(range(args.docs), min(args.queries, args.docs))
+        print(
+            f"{len(ids)} chunks from {args.docs} docs; build vector={vector_build:.2f}s "
+            f"bm25={bm25_build:.2f}s ({bm25_size / 1024:.0f} KiB on disk)"
+        )
+        print(f"{'mode':<8} {'recall@' + str(args.k):>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, fn in (("vector", vector), ("bm25", lexical), ("hybrid", hybrid)):
+            hits, latencies = 0, []
+            for doc in sample:
+                lab = labels_by_doc[doc]
+                query = f"What is {lab['name']} {doc} from {lab['place']}?"
+                t0 = time.perf_counter()
+                ranked = fn(query)[: args.k]
+                latencies.append((time.perf_counter() - t0) * 1000.0)
+                hits += bool(relevant_by_doc[doc].intersection(ranked))
+            print(
+                f"{name:<8} {hits / len(sample):>10.3f} "
+                f"{percentile(latencies, 50):>8.2f} {percentile(latencies, 99):>8.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
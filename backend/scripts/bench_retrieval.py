@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""retrieval benchmark: recall@k, latency, memory and build time per backend.
+
+lowercase: generates deterministic synthetic exhibit corpora (1k, 10k and 100k
+chunks by default), embeds them with the hashing FakeEmbeddings (no model, no
+network) and drives the real VectorStore search path for every backend:
+numpy, chroma (skipped if chromadb is missing) and each of them with hybrid
+BM25 fusion. labeled queries have exactly one relevant chunk.
+
+usage:
+    python scripts/bench_retrieval.py
+    python scripts/bench_retrieval.py --sizes 1000 10000 --backends numpy --json out.json
+"""
+from pathlib import Path
+from typing import Any, Dict, List
+import argparse
+import copy
+import gc
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_utils import FakeEmbeddings, labeled_chunks, labeled_queries, percentile  # noqa: E402
+from services.bm25_index import BM25Index  # noqa: E402
+from services.ingestion_service import content_hash  # noqa: E402
+from services.vectorstore_service import VectorStore  # noqa: E402
+
+
+class BenchVectorStore(VectorStore):
+    """VectorStore pointed at a scratch directory with an injected embedder."""
+
+    def __init__(self, backend: str, directory: str, embeddings: Any, hybrid: bool) -> None:
+        super().__init__(backend=backend)
+        self._directory = directory
+        self.embeddings = embeddings
+        self.config = copy.deepcopy(self.config)
+        retriever = self.config.setdefault("retriever", {})
+        retriever["hybrid"] = dict(retriever.get("hybrid") or {}, enabled=hybrid)
+        # measure raw search latency, not the results cache
+        retriever["results_cache_size"] = 0
+
+    def _get_persist_directory(self) -> str:
+        return self._directory
+
+    def _get_collection_name(self) -> str:
+        return "bench"
+
+    def _ensure_vstore(self) -> None:
+        if self._vstore is not None:
+            return
+        if self.backend == "numpy":
+            from services.numpy_index import NumpyVectorIndex
+
+            self._vstore = NumpyVectorIndex(self._directory, "bench")
+            return
+        from langchain_community.vectorstores import Chroma
+
+        self._vstore = Chroma(
+            collection_name="bench",
+            embedding_function=self.embeddings,
+            persist_directory=self._directory,
+        )
+
+
+def _chroma_available() -> bool:
+    try:
+        import chromadb  # noqa: F401
+        from langchain_community.vectorstores import Chroma  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def _dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def bench_one(
+    backend: str, hybrid: bool, texts: List[str], queries, k: int, dim: int
+) -> Dict[str, Any]:
+    tmp = tempfile.mkdtemp(prefix=f"bench_{backend}_")
+    try:
+        embedder = FakeEmbeddings(dim=dim)
+        ids = [content_hash(t) for t in texts]
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        vectors = embedder.embed_documents(texts)
+        embed_s = time.perf_counter() - start
+        vs = BenchVectorStore(backend, tmp, embedder, hybrid)
+        start = time.perf_counter()
+        for i in range(0, len(ids), 5000):
+            vs.upsert_embeddings(
+                ids[i : i + 5000],
+                texts[i : i + 5000],
+                [{"i": n} for n in range(i, min(i + 5000, len(ids)))],
+                vectors[i : i + 5000],
+            )
+        if hybrid:
+            BM25Index.build(ids, texts).save(vs.bm25_path())
+        build_s = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del vectors
+
+        hits, latencies = 0, []
+        for query, relevant in queries:
+            t0 = time.perf_counter()
+            docs = vs.search(query, top_k=k)
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+            hits += any(content_hash(d.page_content) == ids[relevant] for d in docs)
+        return {
+            "backend": backend + ("+bm25" if hybrid else ""),
+            "chunks": len(texts),
+            "embed_s": round(embed_s, 3),
+            "build_s": round(build_s, 3),
+            "peak_mem_mb": round(peak / 2**20, 1),
+            "disk_mb": round(_dir_size(Path(tmp)) / 2**20, 1),
+            f"recall@{k}": round(hits / len(queries), 3),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+        }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="retrieval benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--backends", nargs="+", default=["numpy", "chroma"])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    backends = list(args.backends)
+    if "chroma" in backends and not _chroma_available():
+        print("chromadb / langchain-community not installed: skipping chroma")
+        backends.remove("chroma")
+
+    results = []
+    header = (
+        f"{'backend':<14} {'chunks':>7} {'build s':>8} {'mem MB':>7} {'disk MB':>8} "
+        f"{'recall@' + str(args.k):>9} {'p50 ms':>7} {'p99 ms':>7}"
+    )
+    print(header)
+    for size in args.sizes:
+        texts, labels = labeled_chunks(size)
+        queries = labeled_queries(labels, args.queries)
+        for backend in backends:
+            for hybrid in (False, True):
+                row = bench_one(backend, hybrid, texts, queries, args.k, args.dim)
+                results.append(row)
+                print(
+                    f"{row['backend']:<14} {row['chunks']:>7} {row['build_s']:>8.2f} "
+                    f"{row['peak_mem_mb']:>7.1f} {row['disk_mb']:>8.1f} "
+                    f"{row[f'recall@{args.k}']:>9.3f} {row['p50_ms']:>7.2f} {row['p99_ms']:>7.2f}"
+                )
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
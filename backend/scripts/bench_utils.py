@@ -0,0 +1,136 @@
+"""shared helpers for the offline benchmark scripts.
+
+lowercase: deterministic synthetic exhibit corpora, a hash-based fake
+embedder (no model, no network) and an in-memory chunk store, so benchmarks
+measure our own code paths and are reproducible run to run.
+"""
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import math
+import random
+import time
+
+TOPICS = [
+    "temple", "raga", "festival", "dance", "textile", "manuscript", "sculpture", "fresco",
+    "stepwell", "fort", "puppetry", "pottery", "bronze", "mural", "folk song", "harvest",
+]
+PLACES = [
+    "Konark", "Hampi", "Madurai", "Thanjavur", "Khajuraho", "Ajanta", "Ellora", "Puri",
+    "Varanasi", "Jaipur", "Mysuru", "Kutch", "Shillong", "Kochi", "Ujjain", "Gwalior",
+]
+NAMES = [
+    "Yaman", "Bhairavi", "Pongal", "Onam", "Bihu", "Kathakali", "Bharatanatyam", "Chhau",
+    "Pattachitra", "Madhubani", "Warli", "Kalamkari", "Bandhani", "Ikat", "Dhokra", "Bidri",
+]
+FILLER = (
+    "Visitors often pause here to look closely. The craft passed from teacher to student "
+    "over many generations. Local communities still celebrate it every year. Scholars "
+    "continue to debate its precise origins."
+).split(". ")
+
+
+def synthetic_document(
+    i: int, rng: random.Random, sentences: int = 6
+) -> Tuple[str, Dict[str, str]]:
+    """one exhibit blurb plus the labels (topic, place, name) it is about."""
+    labels = {
+        "topic": TOPICS[i % len(TOPICS)],
+        "place": PLACES[(i // len(TOPICS)) % len(PLACES)],
+        "name": NAMES[(i * 7) % len(NAMES)],
+    }
+    lines = [
+        f"Exhibit {i}: the {labels['topic']} of {labels['place']} is linked to {labels['name']}.",
+        f"This {labels['topic']} tradition from {labels['place']} "
+        f"is known as {labels['name']} {i}.",
+    ]
+    lines += [rng.choice(FILLER).strip().rstrip(".") + "." for _ in range(max(0, sentences - 2))]
+    return " ".join(lines), labels
+
+
+def synthetic_corpus(n: int, seed: int = 13, sentences: int = 6) -> Dict[str, str]:
+    """return n documents as name -> text, deterministic for a given seed."""
+    rng = random.Random(seed)
+    return {f"exhibit_{i:06d}.txt": synthetic_document(i, rng, sentences)[0] for i in range(n)}
+
+
+def labeled_chunks(n: int, seed: int = 13) -> Tuple[List[str], List[Dict[str, str]]]:
+    """n single-chunk exhibit texts plus their labels (one relevant chunk per label)."""
+    rng = random.Random(seed)
+    texts, labels = [], []
+    for i in range(n):
+        text, lab = synthetic_document(i, rng, sentences=3)
+        texts.append(text)
+        labels.append(lab)
+    return texts, labels
+
+
+def labeled_queries(
+    labels: List[Dict[str, str]], count: int, seed: int = 99
+) -> List[Tuple[str, int]]:
+    """(query, index of the relevant chunk) pairs; queries paraphrase the label."""
+    rng = random.Random(seed)
+    picks = rng.sample(range(len(labels)), min(count, len(labels)))
+    templates = [
+        "What is {name} {i} from {place}?",
+        "Tell me about the {topic} {name} {i}",
+        "{place} {topic} known as {name} {i}",
+    ]
+    return [
+        (rng.choice(templates).format(i=i, **labels[i]), i)
+        for i in picks
+    ]
+
+
+class FakeEmbeddings:
+    """deterministic bag-of-words hashing embedder with optional fake latency.
+
+    similar texts share tokens and therefore land near each other, which is
+    enough to make recall measurements meaningful without a real model.
+    """
+
+    def __init__(self, dim: int = 256, latency_ms: float = 0.0, seed: int = 0) -> None:
+        self.dim = dim
+        self.latency_ms = latency_ms
+        self.seed = seed
+        self.calls = 0
+
+    def _vector(self, text: str) -> List[float]:
+        vec = [0.0] * self.dim
+        for token in text.lower().replace(".", " ").replace(":", " ").split():
+            h = hashlib.blake2b(f"{self.seed}:{token}".encode("utf-8"), digest_size=8).digest()
+            idx = int.from_bytes(h[:4], "little") % self.dim
+            vec[idx] += 1.0 if h[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class MemoryChunkStore:
+    """dict-backed store implementing the ingestion ChunkStore protocol."""
+
+    def __init__(self) -> None:
+        self.rows: Dict[str, Tuple[str, Dict, List[float]]] = {}
+
+    def upsert_embeddings(self, ids, texts, metadatas, embeddings) -> None:
+        for cid, text, meta, vec in zip(ids, texts, metadatas, embeddings):
+            self.rows[cid] = (text, meta, vec)
+
+    def delete(self, ids) -> None:
+        for cid in ids:
+            self.rows.pop(cid, None)
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(math.ceil(pct / 100.0 * len(ordered))) - 1))
+    return ordered[k]
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""pre-voice exhibit blurbs in every language with Sarvam TTS.
+
+lowercase: reads a manifest of texts x languages x speakers (see
+services/tts_clips.py for the format), synthesizes everything not already in
+the clip store with bounded concurrency and retries, and rewrites the clip
+index that GET /api/tts/clips/{id} serves from. re-runs only synthesize new or
+changed texts; audio for replaced texts is deleted by the first run after
+tts.precomputed.delete_grace_s, and --prune also drops clips that are no
+longer in the manifest.
+
+usage:
+    python scripts/precompute_tts.py data/exhibit_clips.yaml --formats wav opus --concurrency 4
+    python scripts/precompute_tts.py data/exhibit_clips.yaml --languages hindi tamil --dry-run
+    python scripts/precompute_tts.py data/exhibit_clips.yaml --prune
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("manifest", help="YAML or JSON manifest of exhibit texts")
+    parser.add_argument(
+        "--languages", nargs="+", help="only these languages (default: as in the manifest)"
+    )
+    parser.add_argument(
+        "--speakers", nargs="+", help="only these speakers (default: as in the manifest)"
+    )
+    parser.add_argument("--formats", nargs="+", default=["wav"], choices=["wav", "opus", "mp3"])
+    parser.add_argument("--concurrency", type=int, default=4, help="clips synthesized at once")
+    parser.add_argument(
+        "--retries", type=int, default=3, help="retries per clip after the first attempt"
+    )
+    parser.add_argument(
+        "--out-dir", help="clip store directory (default: tts.precomputed.directory)"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="re-synthesize clips already in the store"
+    )
+    parser.add_argument(
+        "--prune", action="store_true", help="drop stored clips that are not in the manifest"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="list what would be synthesized and exit"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    project_root = Path(__file__).resolve().parents[1]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    from services.sarvam_service import TTS_LANGUAGES, get_sarvam_service
+    from services.tts_clips import ClipLibrary, load_manifest, precompute
+    from utils.config_loader import load_config
+
+    try:
+        jobs = load_manifest(args.manifest, TTS_LANGUAGES)
+    except (OSError, ValueError, KeyError) as exc:
+        logger.error("could not read manifest %s: %s", args.manifest, exc)
+        return 2
+    if args.languages:
+        languages = {language.lower() for language in args.languages}
+        jobs = [job for job in jobs if job.language in languages]
+    if args.speakers:
+        speakers = {speaker.lower() for speaker in args.speakers}
+        jobs = [job for job in jobs if job.speaker in speakers]
+    unknown = sorted({job.language for job in jobs} - set(TTS_LANGUAGES))
+    if unknown:
+        logger.error(
+            "unsupported languages in manifest: %s (expected %s)",
+            ", ".join(unknown),
+            ", ".join(TTS_LANGUAGES),
+        )
+        return 2
+
+    if args.prune and (args.languages or args.speakers):
+        logger.error("--prune needs the whole manifest; drop --languages/--speakers")
+        return 2
+
+    library = ClipLibrary(args.out_dir) if args.out_dir else ClipLibrary.from_config(load_config())
+    logger.info("%d clips from %s -> %s", len(jobs), args.manifest, library.directory)
+    if args.dry_run:
+        for job in jobs:
+            print(f"{job.clip_id}\t{job.slot}\t{job.text[:60]}")
+        return 0
+
+    service = get_sarvam_service()
+    if service._async_client is None:
+        logger.error("SARVAM_API_KEY is not set")
+        return 3
+    # clips go to the permanent store; keep them out of the request-path LRU
+    service.cache = None
+
+    async def _run():
+        try:
+            return await precompute(
+                service,
+                library,
+                jobs,
+                formats=args.formats,
+                concurrency=args.concurrency,
+                retries=args.retries,
+                force=args.force,
+                prune=args.prune,
+            )
+        finally:
+            await service.aclose()
+
+    report = asyncio.run(_run())
+    logger.info(
+        "%d clips: %d synthesized, %d already stored, %d failed; %.1f MB written in %.1fs",
+        report.jobs,
+        report.synthesized,
+        report.skipped,
+        report.failed,
+        report.bytes_written / 2**20,
+        report.elapsed_s,
+    )
+    if report.pruned or report.files_removed:
+        logger.info(
+            "pruned %d index slots; removed %d files (%.1f MB)",
+            report.pruned,
+            report.files_removed,
+            report.bytes_freed / 2**20,
+        )
+    for error in report.errors:
+        logger.error("  %s", error)
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,32 @@
 """seed chroma vectorstore with documents from backend/data/cultural_knowledge.
 
-lowercase: this script reads text files from data/cultural_knowledge and
-adds them to the Chroma collection using the project's VectorStore wrapper.
+lowercase: this script reads text files from data/cultural_knowledge, splits
+them into overlapping chunks and embeds only chunks that are new since the
+last run (tracked in a manifest next to the Chroma files). use --full to
+re-embed everything.
 """
 from pathlib import Path
+import argparse
 import logging
 import sys
 
 logger = logging.getLogger(__name__)
 
 
-def main() -> int:
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=800, help="max characters per chunk")
+    parser.add_argument("--overlap", type=int, default=1, help="sentences repeated between chunks")
+    parser.add_argument("--batch-size", type=int, default=64, help="texts per embedding call")
+    parser.add_argument("--workers", type=int, default=4, help="parallel embedding batches")
+    parser.add_argument(
+        "--full", action="store_true", help="ignore the manifest and re-embed all chunks"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
     project_root = Path(__file__).resolve().parents[1]
     # ensure backend root is on sys.path so 'services' is importable when running as a script
     if str(project_root) not in sys.path:
@@ -22,24 +38,14 @@ def main() -> int:
 
     try:
         from services.vectorstore_service import vectorstore
+        from services.ingestion_service import IngestionPipeline, read_text_sources
     except Exception as exc:
         logger.exception("failed to import vectorstore: %s", exc)
         logger.error("hint: install deps (langchain, chromadb, langchain-google-genai, langchain-groq) and set API keys")
         return 3
 
-    texts = []
-    metadatas = []
-    ids = []
-
-    for p in sorted(data_dir.glob("*.txt")):
-        text = p.read_text(encoding="utf-8").strip()
-        if not text:
-            continue
-        texts.append(text)
-        metadatas.append({"source": str(p.name)})
-        ids.append(str(p.stem))
-
-    if not texts:
+    sources = read_text_sources(data_dir)
+    if not sources:
         logger.warning("no documents found to seed in %s", data_dir)
         return 0
 
@@ -50,21 +56,35 @@ def main() -> int:
         logger.exception("failed to initialize vectorstore: %s", exc)
         return 4
 
-    if getattr(vectorstore, "_vstore", None) is None:
+    if getattr(vectorstore, "_vstore", None) is None or vectorstore.embeddings is None:
         logger.error("vectorstore not available; ensure langchain/chroma and embeddings are installed/configured")
         return 5
 
-    # add texts into chroma using the underlying _vstore interface
+    pipeline = IngestionPipeline(
+        manifest_path=vectorstore.manifest_path(),
+        chunk_size=args.chunk_size,
+        overlap=args.overlap,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        embedding_id=vectorstore.model_loader.embedding_identity(),
+        bm25_path=vectorstore.bm25_path(),
+    )
     try:
-        # Chroma (langchain) supports add_texts(texts, metadatas=..., ids=...)
-        vectorstore._vstore.add_texts(texts, metadatas=metadatas, ids=ids)
-        # persist if available
-        try:
-            vectorstore._vstore.persist()
-        except Exception:
-            # persist is optional depending on Chroma wrapper
-            pass
-        logger.info("seeded %d documents into chroma", len(texts))
+        report = pipeline.run(
+            sources,
+            embed_fn=vectorstore.embeddings.embed_documents,
+            store=vectorstore,
+            full=args.full,
+        )
+        logger.info(
+            "seeded %d sources: %d chunks, %d embedded, %d deleted, %d unchanged (generation %d)",
+            report.sources,
+            report.chunks,
+            report.added,
+            report.deleted,
+            report.unchanged,
+            report.generation,
+        )
         return 0
     except Exception as exc:
         logger.exception("failed to add texts to chroma: %s", exc)
@@ -0,0 +1,155 @@
+"""compressed output formats for synthesized speech.
+
+lowercase: Sarvam returns 22050 Hz PCM wav, which is heavy on museum Wi-Fi.
+this stage transcodes a wav clip to Opus (in Ogg) or MP3 at a configured
+bitrate. encoding runs through ffmpeg pipes when the binary is installed and
+in-process with PyAV otherwise; either way at most `workers` clips are
+encoded at once, PyAV in its own thread pool so the event loop stays free.
+"""
+from typing import Any, Dict, NamedTuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import io
+import logging
+import shutil
+import time
+
+from utils.audio_processor import AudioDecodeError, ffmpeg_pipe, split_wav
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+TTS_ENCODE_SECONDS = REGISTRY.histogram(
+    "supermuseum_tts_encode_seconds",
+    "Time to transcode a synthesized clip, by output format.",
+    ["format"],
+)
+
+
+class Encoding(NamedTuple):
+    """an output format: response media type, container and codec."""
+
+    name: str
+    media_type: str
+    container: str
+    codec: str
+    sample_rate: Optional[int]  # None keeps the source rate
+    min_kbps: int
+    max_kbps: int
+
+
+ENCODINGS: Dict[str, Encoding] = {
+    # opus only runs at 8/12/16/24/48 kHz; 24 kHz covers the 22050 Hz source
+    "opus": Encoding("opus", "audio/ogg", "ogg", "libopus", 24000, 6, 256),
+    "mp3": Encoding("mp3", "audio/mpeg", "mp3", "libmp3lame", None, 8, 320),
+}
+
+
+def _bits(bitrate: str) -> int:
+    value = str(bitrate).strip().lower()
+    if value.endswith("k"):
+        return int(float(value[:-1]) * 1000)
+    return int(value)
+
+
+def normalize_bitrate(fmt: str, bitrate: str) -> str:
+    """normalize a bitrate to "<kbps>k", clamped to what `fmt` supports.
+
+    no codec runs below 1 kbit/s, so bare numbers under 1000 are read as
+    kbit/s; "32", "32000" and "32k" then share one cache variant.
+    """
+    enc = ENCODINGS[fmt]
+    bits = _bits(bitrate)
+    kbps = bits if bits < 1000 else round(bits / 1000)
+    return f"{min(max(kbps, enc.min_kbps), enc.max_kbps)}k"
+
+
+class AudioEncoder:
+    """wav -> opus / mp3 with a bounded number of concurrent encodes.
+
+    usage:
+        encoder = AudioEncoder(workers=2, bitrates={"opus": "32k", "mp3": "64k"})
+        ogg = await encoder.encode(wav_bytes, "opus")
+    """
+
+    def __init__(self, workers: int = 2, bitrates: Optional[Dict[str, str]] = None) -> None:
+        self.workers = max(1, int(workers))
+        self.bitrates = {"opus": "32k", "mp3": "64k", **(bitrates or {})}
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="tts-encode"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "AudioEncoder":
+        return cls(
+            workers=cfg.get("workers", 2),
+            bitrates={
+                name: str(cfg[f"{name}_bitrate"])
+                for name in ENCODINGS
+                if cfg.get(f"{name}_bitrate")
+            },
+        )
+
+    def bitrate(self, fmt: str, bitrate: Optional[str] = None) -> str:
+        """the normalized bitrate `fmt` is encoded at; also names the cache variant."""
+        return normalize_bitrate(fmt, bitrate or self.bitrates[fmt])
+
+    def encode_sync(self, wav: bytes, fmt: str, bitrate: Optional[str] = None) -> bytes:
+        """blocking PyAV encode; call through `encode` from async code."""
+        import av
+        import numpy as np
+
+        enc = ENCODINGS[fmt]
+        wav_fmt, pcm = split_wav(wav)
+        if wav_fmt.sample_width != 2:
+            raise AudioDecodeError(f"expected 16-bit wav, got {8 * wav_fmt.sample_width}-bit")
+        layout = "mono" if wav_fmt.channels == 1 else "stereo"
+        rate = enc.sample_rate or wav_fmt.sample_rate
+        frame = av.AudioFrame.from_ndarray(
+            np.frombuffer(pcm, dtype="<i2").reshape(1, -1), format="s16", layout=layout
+        )
+        frame.sample_rate = wav_fmt.sample_rate
+        out = io.BytesIO()
+        with av.open(out, "w", format=enc.container) as container:
+            stream = container.add_stream(enc.codec, rate=rate)
+            stream.bit_rate = _bits(self.bitrate(fmt, bitrate))
+            stream.layout = layout
+            resampler = av.AudioResampler(
+                format=stream.codec_context.format.name, layout=layout, rate=rate
+            )
+            for resampled in resampler.resample(frame) + resampler.resample(None):
+                for packet in stream.encode(resampled):
+                    container.mux(packet)
+            for packet in stream.encode(None):
+                container.mux(packet)
+        return out.getvalue()
+
+    async def _encode_ffmpeg(self, wav: bytes, fmt: str, bitrate: Optional[str]) -> bytes:
+        enc = ENCODINGS[fmt]
+        args = ["-vn", "-c:a", enc.codec, "-b:a", self.bitrate(fmt, bitrate)]
+        if enc.sample_rate:
+            args += ["-ar", str(enc.sample_rate)]
+        return await ffmpeg_pipe(io.BytesIO(wav), [*args, "-f", enc.container])
+
+    async def encode(self, wav: bytes, fmt: str, bitrate: Optional[str] = None) -> bytes:
+        """transcode a wav clip to `fmt` ("opus" or "mp3")."""
+        if fmt not in ENCODINGS:
+            raise ValueError(f"unsupported audio format: {fmt}")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+        async with self._semaphore:
+            start = time.perf_counter()
+            if shutil.which("ffmpeg"):
+                encoded = await self._encode_ffmpeg(wav, fmt, bitrate)
+            else:
+                loop = asyncio.get_running_loop()
+                encoded = await loop.run_in_executor(
+                    self._executor, self.encode_sync, wav, fmt, bitrate
+                )
+            TTS_ENCODE_SECONDS.observe(time.perf_counter() - start, format=fmt)
+        logger.debug("encoded %d bytes of wav to %d bytes of %s", len(wav), len(encoded), fmt)
+        return encoded
+
+
+__all__ = ["AudioEncoder", "Encoding", "ENCODINGS", "normalize_bitrate"]
@@ -0,0 +1,158 @@
+"""BM25 inverted index and reciprocal rank fusion for hybrid retrieval.
+
+lowercase: proper nouns (temple, raga and festival names) embed poorly, so
+the vector search is paired with a lexical BM25 ranking over the same chunks.
+the index is built at ingestion time and persisted as gzip-compressed JSON
+with delta-encoded postings. rankings are merged with reciprocal rank fusion
+(RRF), which needs no score calibration between the two retrievers.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from collections import Counter
+from pathlib import Path
+import gzip
+import heapq
+import json
+import logging
+import math
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# latin word characters plus the Indic blocks (devanagari .. sinhala) so vowel
+# signs don't split words
+_TOKEN_RE = re.compile(r"[\w\u0900-\u0DFF]+", re.UNICODE)
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were "
+    "what when where which who why with about tell me you your i my".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """lowercase word tokens without english stopwords."""
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over chunk ids.
+
+    usage:
+        index = BM25Index.build(ids, texts)
+        index.save("data/chroma/cultural_knowledge.bm25.json.gz")
+        hits = index.search("pongal festival thanjavur", k=10)  # [(id, score), ...]
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.ids: List[str] = []
+        self.doc_len: List[int] = []
+        self.avgdl: float = 0.0
+        # term -> (doc indices ascending, term frequencies)
+        self.postings: Dict[str, Tuple[List[int], List[int]]] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(
+        cls, ids: Sequence[str], texts: Sequence[str], k1: float = 1.5, b: float = 0.75
+    ) -> "BM25Index":
+        index = cls(k1=k1, b=b)
+        index.ids = list(ids)
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        for doc, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            index.doc_len.append(sum(counts.values()))
+            for term, tf in counts.items():
+                docs, tfs = postings.setdefault(term, ([], []))
+                docs.append(doc)
+                tfs.append(tf)
+        index.postings = postings
+        index.avgdl = (sum(index.doc_len) / len(index.doc_len)) if index.doc_len else 0.0
+        return index
+
+    def _idf(self, df: int) -> float:
+        return math.log(1.0 + (self.size - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """return up to k (id, score) pairs, best first."""
+        if not self.size:
+            return []
+        scores: Dict[int, float] = {}
+        k1, b, avgdl = self.k1, self.b, self.avgdl or 1.0
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            docs, tfs = posting
+            idf = self._idf(len(docs))
+            for doc, tf in zip(docs, tfs):
+                norm = k1 * (1.0 - b + b * self.doc_len[doc] / avgdl)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self.ids[doc], score) for doc, score in best]
+
+    def save(self, path: str) -> None:
+        """persist as gzip JSON; posting doc ids are delta-encoded."""
+        encoded = {}
+        for term, (docs, tfs) in self.postings.items():
+            deltas = [docs[0]] + [docs[i] - docs[i - 1] for i in range(1, len(docs))]
+            encoded[term] = [deltas, tfs]
+        payload = {
+            "version": INDEX_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "ids": self.ids,
+            "doc_len": self.doc_len,
+            "postings": encoded,
+        }
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, target)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["BM25Index"]:
+        """load a saved index, or None if the file is missing or unreadable."""
+        if not Path(path).exists():
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as exc:
+            logger.warning("failed to load bm25 index %s: %s", path, exc)
+            return None
+        index = cls(k1=payload.get("k1", 1.5), b=payload.get("b", 0.75))
+        index.ids = payload["ids"]
+        index.doc_len = payload["doc_len"]
+        index.avgdl = (sum(index.doc_len) / len(index.doc_len)) if index.doc_len else 0.0
+        for term, (deltas, tfs) in payload["postings"].items():
+            docs, running = [], 0
+            for d in deltas:
+                running += d
+                docs.append(running)
+            index.postings[term] = (docs, tfs)
+        return index
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[str]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Tuple[str, float]]:
+    """fuse ranked id lists: score(id) = sum_i w_i / (k + rank_i(id))."""
+    fused: Dict[str, float] = {}
+    for i, ranking in enumerate(rankings):
+        w = weights[i] if weights else 1.0
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + w / (k + rank)
+    return sorted(fused.items(), key=lambda item: (-item[1], item[0]))
+
+
+__all__ = ["BM25Index", "reciprocal_rank_fusion", "tokenize"]
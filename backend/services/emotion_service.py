@@ -2,12 +2,42 @@
 
 lowercase: uses HuggingFace transformers pipeline if available, else simple heuristic.
 """
-from typing import Tuple
+from typing import Any, Optional, Tuple
 import os
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+EMOTION_MODEL = "j-hartmann/emotion-english-distilroberta-base"
+
+_pipeline: Optional[Any] = None
+_pipeline_lock = threading.Lock()
+
+
+def _offline() -> bool:
+    return os.getenv("EMOTION_OFFLINE") == "1" or os.getenv("VERCEL") == "1"
+
+
+def _get_pipeline() -> Any:
+    """build the transformers pipeline once per process."""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                from transformers import pipeline
+
+                _pipeline = pipeline("text-classification", model=EMOTION_MODEL)
+    return _pipeline
+
+
+def warmup() -> bool:
+    """load the classifier and run one inference; False when offline (nothing to load)."""
+    if _offline():
+        return False
+    _get_pipeline()("warmup", top_k=1)
+    return True
+
 
 def classify_emotion(text: str) -> Tuple[str, float]:
     """classify the primary emotion from text.
@@ -15,7 +45,7 @@ def classify_emotion(text: str) -> Tuple[str, float]:
     returns: (label, confidence)
     """
     # allow tests/CI/serverless to force offline heuristic to avoid model downloads
-    if os.getenv("EMOTION_OFFLINE") == "1" or os.getenv("VERCEL") == "1":
+    if _offline():
         low = text.lower()
         if any(w in low for w in ["happy", "joy", "delight"]):
             return "happy", 0.8
@@ -29,10 +59,7 @@ def classify_emotion(text: str) -> Tuple[str, float]:
 
     # try to use transformers pipeline if installed
     try:
-        from transformers import pipeline
-
-        emo_pipe = pipeline("text-classification", model="j-hartmann/emotion-english-distilroberta-base")
-        result = emo_pipe(text, top_k=1)[0]
+        result = _get_pipeline()(text, top_k=1)[0]
         label = result.get("label", "neutral").lower()
         score = float(result.get("score", 0.0))
         return label, score
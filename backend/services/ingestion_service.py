@@ -0,0 +1,298 @@
+"""incremental, chunked ingestion of cultural knowledge into the vector store.
+
+lowercase: splits documents into overlapping sentence/paragraph chunks, names
+each chunk by a hash of its content (so duplicates collapse), and compares the
+result with a JSON manifest from the previous run. only new chunks are
+embedded (in parallel batches) and chunks that disappeared are deleted. when
+a bm25 path is given, the lexical index over the same chunks is rebuilt too.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+import hashlib
+import json
+import logging
+import re
+import time
+
+from services.bm25_index import BM25Index
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# sentence ends: latin punctuation plus the devanagari danda / double danda
+_SENTENCE_RE = re.compile(r"(?<=[.!?।॥])\s+")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+EmbedFn = Callable[[List[str]], List[List[float]]]
+
+
+class ChunkStore(Protocol):
+    """what the pipeline needs from a vector store.
+
+    a store may also offer a `bulk()` context manager; the pipeline then makes
+    all of a run's writes inside it so they can be persisted once.
+    """
+
+    def upsert_embeddings(
+        self,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict],
+        embeddings: List[List[float]],
+    ) -> None: ...
+
+    def delete(self, ids: List[str]) -> None: ...
+
+
+@dataclass
+class Chunk:
+    """a piece of a source document addressed by its content hash."""
+
+    id: str
+    text: str
+    source: str
+    position: int
+
+
+@dataclass
+class IngestionReport:
+    """counts and timings from one ingestion run."""
+
+    sources: int = 0
+    chunks: int = 0
+    added: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    duplicates: int = 0
+    generation: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+def split_sentences(text: str) -> List[str]:
+    """split a paragraph into sentences on ., !, ?, । and ॥."""
+    return [s.strip() for s in _SENTENCE_RE.split(text) if s.strip()]
+
+
+def chunk_text(text: str, max_chars: int = 800, overlap: int = 1) -> List[str]:
+    """split text into chunks of whole sentences, at most ~max_chars each.
+
+    paragraphs are kept together where they fit: one that would straddle a
+    chunk boundary starts a new chunk instead. longer ones are packed
+    sentence by sentence. each new chunk repeats the last `overlap` sentences
+    of the previous one (when they fit next to what comes after) so facts
+    spanning a boundary stay retrievable. a single sentence longer than
+    max_chars becomes its own chunk.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+
+    def _flush(incoming: int) -> None:
+        nonlocal current, size
+        chunks.append(" ".join(current))
+        current = current[-overlap:] if overlap > 0 else []
+        size = sum(len(s) + 1 for s in current)
+        # a long overlap must not push the next chunk over the limit forever
+        while current and size + incoming > max_chars:
+            size -= len(current.pop(0)) + 1
+
+    for paragraph in _PARAGRAPH_RE.split(text or ""):
+        sentences = split_sentences(" ".join(paragraph.split()))
+        paragraph_size = sum(len(s) + 1 for s in sentences)
+        if current and size + paragraph_size > max_chars and paragraph_size <= max_chars:
+            _flush(paragraph_size)
+        for sentence in sentences:
+            if current and size + len(sentence) + 1 > max_chars:
+                _flush(len(sentence) + 1)
+            current.append(sentence)
+            size += len(sentence) + 1
+    if current:
+        tail = " ".join(current)
+        if not chunks or tail != chunks[-1]:
+            chunks.append(tail)
+    return chunks
+
+
+def content_hash(text: str) -> str:
+    """stable id for a chunk: sha256 of whitespace-normalized content."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()[:32]
+
+
+class IngestionPipeline:
+    """chunk, dedupe and incrementally embed documents.
+
+    usage:
+        pipeline = IngestionPipeline(manifest_path="data/chroma/ingest_manifest.json")
+        report = pipeline.run(sources, embed_fn=emb.embed_documents, store=vectorstore)
+    """
+
+    def __init__(
+        self,
+        manifest_path: str,
+        chunk_size: int = 800,
+        overlap: int = 1,
+        batch_size: int = 64,
+        workers: int = 4,
+        embedding_id: str = "",
+        bm25_path: Optional[str] = None,
+    ) -> None:
+        self.manifest_path = Path(manifest_path)
+        self.bm25_path = Path(bm25_path) if bm25_path else None
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.embedding_id = embedding_id
+
+    def _params(self) -> Dict[str, object]:
+        return {
+            "chunk_size": self.chunk_size,
+            "overlap": self.overlap,
+            "embedding": self.embedding_id,
+        }
+
+    def load_manifest(self) -> Dict:
+        if not self.manifest_path.exists():
+            return {"version": MANIFEST_VERSION, "generation": 0, "params": {}, "sources": {}}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+        tmp.replace(self.manifest_path)
+
+    def chunk_sources(
+        self, sources: Dict[str, str]
+    ) -> Tuple[Dict[str, List[str]], Dict[str, Chunk], int]:
+        """return (source -> chunk ids, unique chunks by id, duplicate count)."""
+        by_source: Dict[str, List[str]] = {}
+        unique: Dict[str, Chunk] = {}
+        duplicates = 0
+        for source in sorted(sources):
+            ids: List[str] = []
+            for pos, piece in enumerate(chunk_text(sources[source], self.chunk_size, self.overlap)):
+                cid = content_hash(piece)
+                if cid in unique:
+                    duplicates += 1
+                else:
+                    unique[cid] = Chunk(id=cid, text=piece, source=source, position=pos)
+                ids.append(cid)
+            by_source[source] = ids
+        return by_source, unique, duplicates
+
+    def _embed_batches(self, texts: List[str], embed_fn: EmbedFn) -> List[List[float]]:
+        batches = [texts[i : i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) <= 1 or self.workers == 1:
+            return [vec for batch in batches for vec in embed_fn(batch)]
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="embed") as pool:
+            results = list(pool.map(embed_fn, batches))
+        return [vec for batch in results for vec in batch]
+
+    def run(
+        self,
+        sources: Dict[str, str],
+        embed_fn: EmbedFn,
+        store: ChunkStore,
+        full: bool = False,
+    ) -> IngestionReport:
+        """ingest `sources` (name -> text), embedding only chunks not seen before.
+
+        full=True ignores the manifest and re-embeds everything. the manifest
+        generation is bumped whenever the stored chunk set changes.
+        """
+        report = IngestionReport(sources=len(sources))
+        manifest = self.load_manifest()
+        if manifest.get("params") != self._params():
+            if manifest.get("sources"):
+                logger.info("ingestion parameters changed; re-embedding all chunks")
+            full = True
+
+        start = time.perf_counter()
+        by_source, unique, report.duplicates = self.chunk_sources(sources)
+        report.timings["chunk_s"] = time.perf_counter() - start
+        report.chunks = len(unique)
+
+        previous = {cid for ids in manifest.get("sources", {}).values() for cid in ids}
+        to_add = list(unique) if full else [cid for cid in unique if cid not in previous]
+        to_delete = sorted(previous - set(unique))
+        report.unchanged = len(unique) - len(to_add)
+
+        start = time.perf_counter()
+        vectors: List[List[float]] = []
+        if to_add:
+            vectors = self._embed_batches([unique[cid].text for cid in to_add], embed_fn)
+            report.timings["embed_s"] = time.perf_counter() - start
+        start = time.perf_counter()
+        bulk = getattr(store, "bulk", None)
+        with bulk() if bulk is not None else nullcontext():
+            for i in range(0, len(to_add), self.batch_size):
+                batch = [unique[cid] for cid in to_add[i : i + self.batch_size]]
+                store.upsert_embeddings(
+                    [c.id for c in batch],
+                    [c.text for c in batch],
+                    [{"source": c.source, "position": c.position} for c in batch],
+                    vectors[i : i + self.batch_size],
+                )
+            if to_delete:
+                store.delete(to_delete)
+        if to_add or to_delete:
+            report.timings["write_s"] = time.perf_counter() - start
+        report.added, report.deleted = len(to_add), len(to_delete)
+
+        if self.bm25_path and (to_add or to_delete or full or not self.bm25_path.exists()):
+            start = time.perf_counter()
+            BM25Index.build(list(unique), [c.text for c in unique.values()]).save(
+                str(self.bm25_path)
+            )
+            report.timings["bm25_s"] = time.perf_counter() - start
+
+        generation = int(manifest.get("generation", 0))
+        if to_add or to_delete:
+            generation += 1
+        report.generation = generation
+        self._save_manifest(
+            {
+                "version": MANIFEST_VERSION,
+                "generation": generation,
+                "params": self._params(),
+                "sources": by_source,
+            }
+        )
+        logger.info(
+            "ingestion: %d chunks (%d added, %d deleted, %d unchanged, %d duplicates)",
+            report.chunks,
+            report.added,
+            report.deleted,
+            report.unchanged,
+            report.duplicates,
+        )
+        return report
+
+
+def read_text_sources(data_dir: Path, patterns: Iterable[str] = ("*.txt",)) -> Dict[str, str]:
+    """read every matching file under data_dir as name -> stripped text."""
+    sources: Dict[str, str] = {}
+    for pattern in patterns:
+        for path in sorted(data_dir.glob(pattern)):
+            text = path.read_text(encoding="utf-8").strip()
+            if text:
+                sources[path.name] = text
+    return sources
+
+
+__all__ = [
+    "Chunk",
+    "IngestionPipeline",
+    "IngestionReport",
+    "chunk_text",
+    "content_hash",
+    "read_text_sources",
+    "split_sentences",
+]
@@ -0,0 +1,422 @@
+"""in-process vector index backed by a memory-mapped NumPy matrix.
+
+lowercase: a lightweight alternative to Chroma for small corpora (a few
+thousand exhibit chunks). L2-normalized float32 embeddings live in
+`<name>.v<N>.npy` (opened with mmap so startup is instant and pages are shared
+between workers) and ids/texts/metadata live in a `<name>.v<N>.meta.json`
+sidecar. a `<name>.current` pointer names the live version and is switched
+with one rename, so another process never opens a matrix from one write and
+a sidecar from another; `refresh` picks up versions written elsewhere (e.g.
+by scripts/seed_chroma.py). top-k is a single matrix-vector product; MMR
+re-ranking is vectorized over the candidate set.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_rows(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (mat / norms).astype(np.float32, copy=False)
+
+
+class IndexSnapshot:
+    """one consistent view of the index: matrix rows line up with ids/texts/metadatas.
+
+    writers build a new snapshot and swap it in with a single assignment, so a
+    search that holds a snapshot never sees a matrix from one version and
+    sidecar lists from another.
+    """
+
+    __slots__ = ("matrix", "ids", "texts", "metadatas", "row_of")
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        self.matrix = matrix
+        self.ids = ids
+        self.texts = texts
+        self.metadatas = metadatas
+        self.row_of = {cid: i for i, cid in enumerate(ids)}
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dim(self) -> int:
+        return int(self.matrix.shape[1]) if self.matrix.ndim == 2 else 0
+
+    def top_k(self, query: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        """exact cosine top-k: one matrix-vector product plus argpartition."""
+        if not self.size:
+            return []
+        scores = self.matrix @ _query_vector(query)
+        k = min(k, self.size)
+        idx = np.argpartition(-scores, k - 1)[:k]
+        idx = idx[np.argsort(-scores[idx])]
+        return [(int(i), float(scores[i])) for i in idx]
+
+    def mmr(
+        self,
+        query: Sequence[float],
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.7,
+        score_threshold: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        """maximal marginal relevance over the fetch_k nearest rows.
+
+        candidate-candidate similarities are one (f x d) @ (d x f) product; each
+        of the k selection steps is a vectorized max/argmax over candidates.
+        """
+        candidates = self.top_k(query, max(k, fetch_k))
+        if score_threshold is not None:
+            candidates = [(i, s) for i, s in candidates if s >= score_threshold]
+        if not candidates:
+            return []
+        rows = np.fromiter((i for i, _ in candidates), dtype=np.int64)
+        relevance = np.fromiter((s for _, s in candidates), dtype=np.float32)
+        cand = np.asarray(self.matrix[rows])
+        pairwise = cand @ cand.T
+
+        k = min(k, len(rows))
+        selected: List[int] = []
+        redundancy = np.full(len(rows), -np.inf, dtype=np.float32)
+        available = np.ones(len(rows), dtype=bool)
+        for _ in range(k):
+            if selected:
+                np.maximum(redundancy, pairwise[:, selected[-1]], out=redundancy)
+                score = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+            else:
+                score = relevance.copy()
+            score[~available] = -np.inf
+            best = int(np.argmax(score))
+            selected.append(best)
+            available[best] = False
+        return [(int(rows[i]), float(relevance[i])) for i in selected]
+
+
+def _query_vector(query: Sequence[float]) -> np.ndarray:
+    q = np.asarray(query, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(q))
+    return q / norm if norm else q
+
+
+class NumpyVectorIndex:
+    """cosine-similarity index over a memory-mapped .npy matrix.
+
+    usage:
+        index = NumpyVectorIndex("data/chroma", "cultural_knowledge")
+        index.upsert(ids, texts, metadatas, embeddings)
+        snap = index.snapshot()
+        hits = snap.mmr(query_vec, k=5)  # [(row, score), ...] into snap.texts
+    """
+
+    def __init__(self, directory: str, name: str) -> None:
+        self.directory = Path(directory)
+        self.name = name
+        self.pointer_path = self.directory / f"{name}.current"
+        self._lock = threading.Lock()
+        self._snapshot = IndexSnapshot(np.zeros((0, 0), dtype=np.float32), [], [], [])
+        self._version = 0
+        self._stamp: Optional[int] = None
+        # pending operations while inside bulk(); None otherwise
+        self._staged: Optional[List[Tuple[str, tuple]]] = None
+        self.load()
+
+    def snapshot(self) -> IndexSnapshot:
+        """the current consistent view; resolve search rows against this same object."""
+        return self._snapshot
+
+    @property
+    def ids(self) -> List[str]:
+        return self._snapshot.ids
+
+    @property
+    def texts(self) -> List[str]:
+        return self._snapshot.texts
+
+    @property
+    def metadatas(self) -> List[Dict[str, Any]]:
+        return self._snapshot.metadatas
+
+    @property
+    def size(self) -> int:
+        return self._snapshot.size
+
+    @property
+    def dim(self) -> int:
+        return self._snapshot.dim
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _paths(self, version: int) -> Tuple[Path, Path]:
+        if version == 0:
+            # layout from before versioned files
+            return self.directory / f"{self.name}.npy", self.directory / f"{self.name}.meta.json"
+        stem = f"{self.name}.v{version}"
+        return self.directory / f"{stem}.npy", self.directory / f"{stem}.meta.json"
+
+    def _pointer(self) -> Tuple[Optional[int], int]:
+        """(pointer mtime_ns or None, live version; 0 = unversioned files)."""
+        try:
+            stamp = self.pointer_path.stat().st_mtime_ns
+            with open(self.pointer_path, "r", encoding="utf-8") as f:
+                return stamp, int(json.load(f)["version"])
+        except (OSError, ValueError, KeyError):
+            return None, 0
+
+    def load(self) -> None:
+        """(re)open the live version's matrix with mmap and read its sidecar."""
+        for _ in range(2):
+            stamp, version = self._pointer()
+            matrix_path, meta_path = self._paths(version)
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                matrix = np.load(matrix_path, mmap_mode="r")
+            except FileNotFoundError:
+                # a writer published a newer version and removed this one; re-read the pointer
+                continue
+            if matrix.shape[0] != len(meta["ids"]):
+                logger.error(
+                    "numpy index %s: matrix/sidecar row mismatch; ignoring files", self.name
+                )
+                return
+            snapshot = IndexSnapshot(
+                matrix, list(meta["ids"]), list(meta["texts"]), list(meta["metadatas"])
+            )
+            with self._lock:
+                self._snapshot, self._version, self._stamp = snapshot, version, stamp
+            logger.info(
+                "numpy index loaded: %s v%d (%d x %d)", self.name, version, self.size, self.dim
+            )
+            return
+
+    def refresh(self) -> bool:
+        """reload if another process published a new version; True if it did."""
+        try:
+            stamp: Optional[int] = self.pointer_path.stat().st_mtime_ns
+        except OSError:
+            stamp = None
+        if stamp == self._stamp:
+            return False
+        previous = self._version
+        self.load()
+        return self._version != previous
+
+    def _save(
+        self, matrix: np.ndarray, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]]
+    ) -> None:
+        """write a new version, then publish it; on failure the current snapshot stays."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        version = max(self._version, self._pointer()[1]) + 1
+        matrix_path, meta_path = self._paths(version)
+        # the versioned files are invisible until the pointer names them
+        np.save(matrix_path, matrix)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"ids": ids, "texts": texts, "metadatas": metadatas},
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        tmp_pointer = self.pointer_path.with_suffix(".tmp")
+        with open(tmp_pointer, "w", encoding="utf-8") as f:
+            json.dump({"version": version}, f)
+        os.replace(tmp_pointer, self.pointer_path)
+        self._snapshot = IndexSnapshot(np.load(matrix_path, mmap_mode="r"), ids, texts, metadatas)
+        self._version, self._stamp = version, self.pointer_path.stat().st_mtime_ns
+        self._remove_old_versions(keep=(version, version - 1))
+
+    def _remove_old_versions(self, keep: Tuple[int, ...]) -> None:
+        # the previous version stays for readers that read the pointer just before the switch;
+        # open mmaps of removed files stay valid until they are dropped
+        for path in self.directory.glob(f"{self.name}.*"):
+            suffix = path.name[len(self.name) + 1 :]
+            if suffix in ("npy", "meta.json"):
+                version = 0
+            elif suffix.startswith("v") and suffix.split(".", 1)[0][1:].isdigit():
+                version = int(suffix.split(".", 1)[0][1:])
+            else:
+                continue
+            if version not in keep:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    @contextmanager
+    def bulk(self) -> Iterator["NumpyVectorIndex"]:
+        """collect upserts/deletes and publish them as one version on exit.
+
+        usage:
+            with index.bulk():
+                for batch in batches:
+                    index.upsert(*batch)
+
+        searches keep seeing the previous version until the block ends; if it
+        raises, nothing is written.
+        """
+        with self._lock:
+            if self._staged is not None:
+                raise RuntimeError("numpy index bulk() is not re-entrant")
+            self._staged = []
+        try:
+            yield self
+        except BaseException:
+            with self._lock:
+                self._staged = None
+            raise
+        with self._lock:
+            staged, self._staged = self._staged, None
+            if staged:
+                self._commit(staged)
+
+    def _commit(self, staged: List[Tuple[str, tuple]]) -> None:
+        # merge runs of consecutive upserts so the matrix is copied once per run
+        merged: List[Tuple[str, tuple]] = []
+        run: List[tuple] = []
+        for op, args in staged + [("end", ())]:
+            if op == "upsert":
+                run.append(args)
+                continue
+            if run:
+                merged.append(
+                    (
+                        "upsert",
+                        (
+                            [cid for r in run for cid in r[0]],
+                            [text for r in run for text in r[1]],
+                            [meta for r in run for meta in r[2]],
+                            np.concatenate([r[3] for r in run]),
+                        ),
+                    )
+                )
+                run = []
+            if op == "delete":
+                merged.append((op, args))
+        state = self._snapshot
+        for op, args in merged:
+            if op == "upsert":
+                state = IndexSnapshot(*_apply_upsert(state, *args))
+            elif any(cid in state.row_of for cid in args[0]):
+                state = IndexSnapshot(*_apply_delete(state, args[0]))
+        if state is not self._snapshot:
+            self._save(
+                np.asarray(state.matrix, dtype=np.float32), state.ids, state.texts, state.metadatas
+            )
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        embeddings: Sequence[Sequence[float]],
+    ) -> None:
+        """insert or replace rows and persist the matrix and sidecar.
+
+        an id repeated within the batch is written once, with its last values.
+        inside bulk() the write is deferred to the end of the block.
+        """
+        if not ids:
+            return
+        vecs = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+        args = (list(ids), list(texts), list(metadatas), vecs)
+        with self._lock:
+            if self._staged is not None:
+                self._staged.append(("upsert", args))
+                return
+            self._save(*_apply_upsert(self._snapshot, *args))
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """drop rows by id and compact the matrix (deferred inside bulk())."""
+        with self._lock:
+            if self._staged is not None:
+                self._staged.append(("delete", (list(ids),)))
+                return
+            current = self._snapshot
+            if any(cid in current.row_of for cid in ids):
+                self._save(*_apply_delete(current, ids))
+
+    def top_k(self, query: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        """top-k on the current snapshot (see IndexSnapshot.top_k)."""
+        return self._snapshot.top_k(query, k)
+
+    def mmr(
+        self,
+        query: Sequence[float],
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.7,
+        score_threshold: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        """MMR on the current snapshot (see IndexSnapshot.mmr)."""
+        return self._snapshot.mmr(query, k, fetch_k, lambda_mult, score_threshold)
+
+
+def _apply_upsert(
+    current: IndexSnapshot,
+    ids: List[str],
+    texts: List[str],
+    metadatas: List[Dict[str, Any]],
+    vecs: np.ndarray,
+) -> Tuple[np.ndarray, List[str], List[str], List[Dict[str, Any]]]:
+    """new (matrix, ids, texts, metadatas) with the rows written; `current` is untouched."""
+    if current.size and vecs.shape[1] != current.dim:
+        raise ValueError(f"embedding dim {vecs.shape[1]} != index dim {current.dim}")
+    latest: Dict[str, int] = {}
+    for i, cid in enumerate(ids):
+        latest[cid] = i
+    matrix = np.array(current.matrix, dtype=np.float32) if current.size else vecs[:0]
+    new_ids, new_texts = list(current.ids), list(current.texts)
+    new_metadatas = list(current.metadatas)
+    added: List[int] = []
+    for cid, i in latest.items():
+        meta = dict(metadatas[i] or {})
+        row = current.row_of.get(cid)
+        if row is not None:
+            matrix[row] = vecs[i]
+            new_texts[row] = texts[i]
+            new_metadatas[row] = meta
+        else:
+            new_ids.append(cid)
+            new_texts.append(texts[i])
+            new_metadatas.append(meta)
+            added.append(i)
+    if added:
+        matrix = np.vstack([matrix, vecs[added]])
+    return matrix, new_ids, new_texts, new_metadatas
+
+
+def _apply_delete(
+    current: IndexSnapshot, ids: Sequence[str]
+) -> Tuple[np.ndarray, List[str], List[str], List[Dict[str, Any]]]:
+    """new (matrix, ids, texts, metadatas) without the given ids."""
+    drop = {current.row_of[cid] for cid in ids if cid in current.row_of}
+    keep = [i for i in range(current.size) if i not in drop]
+    return (
+        np.asarray(current.matrix)[keep],
+        [current.ids[i] for i in keep],
+        [current.texts[i] for i in keep],
+        [current.metadatas[i] for i in keep],
+    )
+
+
+__all__ = ["IndexSnapshot", "NumpyVectorIndex"]
@@ -10,6 +10,7 @@ from typing import List, Dict, Optional
 import httpx
 import os
 from config.settings import settings
+from utils.metrics import track_call
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,33 @@ class SaavnClient:
         self._cache_lock = asyncio.Lock()
         self._search_cache_max = 256
         self._details_cache_max = 512
+        # one pooled client for the process: keeps TLS connections warm
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=20.0,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._http
+
+    async def warmup(self) -> bool:
+        """open the connection pool; False when offline."""
+        if os.getenv("SAAVN_OFFLINE") == "1":
+            return False
+        client = self._client()
+        try:
+            # establish (and keep alive) the TLS connection to the api host
+            await client.head(self._base_url)
+        except httpx.HTTPError as exc:
+            logger.warning("saavn warmup request failed: %s", exc)
+        return True
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     async def _throttle(self) -> None:
         await asyncio.sleep(self._rate_limit)
@@ -58,57 +86,59 @@ class SaavnClient:
                 self._search_cache.move_to_end(cache_key)
                 return list(self._search_cache[cache_key])
         results: List[Dict] = []
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            # Variant A: sumit.co style
-            try:
-                url_a = f"{self._base_url}/search/songs"
-                params_a = {"query": query, "page": 1, "limit": limit}
-                logger.info("saavn search (A): %s", params_a)
+        client = self._client()
+        # Variant A: sumit.co style
+        try:
+            url_a = f"{self._base_url}/search/songs"
+            params_a = {"query": query, "page": 1, "limit": limit}
+            logger.info("saavn search (A): %s", params_a)
+            with track_call("saavn", "search"):
                 resp_a = await client.get(url_a, params=params_a)
-                if resp_a.status_code == 200:
-                    data_a = resp_a.json()
-                    logger.info(f"Variant A response keys: {list(data_a.keys())}")
-                    # Try different response structures
-                    items = []
-                    if "data" in data_a:
-                        if isinstance(data_a["data"], dict):
-                            items = data_a["data"].get("results", []) or data_a["data"].get("songs", [])
-                        elif isinstance(data_a["data"], list):
-                            items = data_a["data"]
-                    elif "results" in data_a:
-                        items = data_a["results"]
+            if resp_a.status_code == 200:
+                data_a = resp_a.json()
+                logger.info(f"Variant A response keys: {list(data_a.keys())}")
+                # Try different response structures
+                items = []
+                if "data" in data_a:
+                    if isinstance(data_a["data"], dict):
+                        items = data_a["data"].get("results", []) or data_a["data"].get("songs", [])
+                    elif isinstance(data_a["data"], list):
+                        items = data_a["data"]
+                elif "results" in data_a:
+                    items = data_a["results"]
                     
-                    logger.info(f"Variant A found {len(items)} items")
-                    for item in items:
-                        results.append(self._parse_song(item))
-            except Exception as e:
-                logger.error(f"variant A failed: {e}")
-
-            # If no results, try Variant B: local jiosaavn proxy style
-            if not results:
-                try:
-                    url_b = f"{self._base_url}/search"
-                    params_b = {"query": query}
-                    logger.info("saavn search (B): %s", params_b)
+                logger.info(f"Variant A found {len(items)} items")
+                for item in items:
+                    results.append(self._parse_song(item))
+        except Exception as e:
+            logger.error(f"variant A failed: {e}")
+
+        # If no results, try Variant B: local jiosaavn proxy style
+        if not results:
+            try:
+                url_b = f"{self._base_url}/search"
+                params_b = {"query": query}
+                logger.info("saavn search (B): %s", params_b)
+                with track_call("saavn", "search"):
                     resp_b = await client.get(url_b, params=params_b)
-                    if resp_b.status_code == 200:
-                        data_b = resp_b.json()
-                        logger.info(f"Variant B response keys: {list(data_b.keys())}")
-                        # songs under data.songs.results
-                        song_items = (data_b.get("data", {}).get("songs", {}).get("results", []) or [])
-                        logger.info(f"Variant B found {len(song_items)} items")
-                        for item in song_items[:limit]:
-                            # Normalize minimal fields available in search response
-                            norm = {
-                                "id": item.get("id"),
-                                "title": item.get("title"),
-                                "album": item.get("album"),
-                                "primaryArtists": item.get("primaryArtists"),
-                                # duration often not present in search; leave None
-                            }
-                            results.append(self._parse_song(norm))
-                except Exception as e:
-                    logger.error(f"variant B failed: {e}")
+                if resp_b.status_code == 200:
+                    data_b = resp_b.json()
+                    logger.info(f"Variant B response keys: {list(data_b.keys())}")
+                    # songs under data.songs.results
+                    song_items = (data_b.get("data", {}).get("songs", {}).get("results", []) or [])
+                    logger.info(f"Variant B found {len(song_items)} items")
+                    for item in song_items[:limit]:
+                        # Normalize minimal fields available in search response
+                        norm = {
+                            "id": item.get("id"),
+                            "title": item.get("title"),
+                            "album": item.get("album"),
+                            "primaryArtists": item.get("primaryArtists"),
+                            # duration often not present in search; leave None
+                        }
+                        results.append(self._parse_song(norm))
+            except Exception as e:
+                logger.error(f"variant B failed: {e}")
         
         logger.info(f"Total search results for '{query}': {len(results)}")
 
@@ -157,32 +187,33 @@ class SaavnClient:
         ]
         
         parsed = None
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            for url in urls_to_try:
-                try:
-                    logger.info(f"Trying saavn song details: {url}")
+        client = self._client()
+        for url in urls_to_try:
+            try:
+                logger.info(f"Trying saavn song details: {url}")
+                with track_call("saavn", "song_details"):
                     resp = await client.get(url)
-                    if resp.status_code == 404:
-                        logger.debug(f"404 at {url}, trying next endpoint")
-                        continue
-                    resp.raise_for_status()
-                    data = resp.json()
+                if resp.status_code == 404:
+                    logger.debug(f"404 at {url}, trying next endpoint")
+                    continue
+                resp.raise_for_status()
+                data = resp.json()
                     
-                    payload = data.get("data")
-                    if isinstance(payload, dict):
-                        item = payload
-                    elif isinstance(payload, list) and payload:
-                        item = payload[0]
-                    else:
-                        item = None
+                payload = data.get("data")
+                if isinstance(payload, dict):
+                    item = payload
+                elif isinstance(payload, list) and payload:
+                    item = payload[0]
+                else:
+                    item = None
                     
-                    if item:
-                        parsed = self._parse_song(item)
-                        logger.info(f"Successfully fetched track {track_id} from {url}")
-                        break
-                except Exception as e:
-                    logger.debug(f"Failed to fetch from {url}: {e}")
-                    continue
+                if item:
+                    parsed = self._parse_song(item)
+                    logger.info(f"Successfully fetched track {track_id} from {url}")
+                    break
+            except Exception as e:
+                logger.debug(f"Failed to fetch from {url}: {e}")
+                continue
         
         # NEW: Final fallback - check search cache again before giving up
         if not parsed:
@@ -1,17 +1,36 @@
 """integration with Sarvam AI for Indian-accent TTS.
 
-lowercase: wrapper that calls external Sarvam API and returns audio URLs.
+lowercase: wrapper that calls external Sarvam API and returns audio bytes.
+async callers use `asynthesize_text`, which goes through AsyncSarvamAI on one
+pooled httpx client (connection reuse, explicit timeouts) behind a semaphore
+that caps concurrent requests, so TTS never blocks the event loop. both paths
+check the content-addressed TTSCache (see services/tts_cache.py) first, so a
+repeated greeting is synthesized once. `astream_speech` splits long replies
+into sentences, synthesizes them concurrently and yields one wav stream in
+order, so playback starts after the first sentence. `asynthesize_encoded`
+adds an optional Opus / MP3 stage (services/audio_encoder.py) whose output is
+cached next to the wav.
 """
-from typing import Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
+import asyncio
 import logging
 import base64
 import tempfile
 from pathlib import Path
-from sarvamai import SarvamAI
+import httpx
+from sarvamai import AsyncSarvamAI, SarvamAI
 from config.settings import settings
+from utils.config_loader import load_config
+from utils.metrics import track_call
+from services.audio_encoder import ENCODINGS, AudioEncoder
+from services.tts_cache import TTSCache, tts_cache_key
+from utils.audio_processor import split_wav, wav_header
+from utils.language_utils import split_for_speech
 
 logger = logging.getLogger(__name__)
 
+SPEECH_SAMPLE_RATE = 22050
+
 # language code mapping for Sarvam API
 LANGUAGE_CODE_MAP = {
     "hindi": "hi-IN",
@@ -31,6 +50,11 @@ LANGUAGE_CODE_MAP = {
     "regional": "en-IN",
 }
 
+# the distinct languages Sarvam voices; the fallbacks above map onto these
+TTS_LANGUAGES = [
+    name for name in LANGUAGE_CODE_MAP if name not in ("hinglish", "tamil-english", "regional")
+]
+
 # available speakers (from current API validation error)
 AVAILABLE_SPEAKERS = [
     "anushka", "abhilash", "manisha", "vidya", "arya", "karun", "hitesh",
@@ -51,12 +75,256 @@ class SarvamTTSService:
     """service class for Sarvam AI text-to-speech operations."""
     
     def __init__(self):
-        """initialize Sarvam client with API key from settings."""
+        """initialize Sarvam clients with API key from settings."""
+        try:
+            cfg = load_config().get("tts", {}) or {}
+        except Exception:
+            cfg = {}
+        self.timeout_s = float(cfg.get("timeout_s", 30))
+        self.connect_timeout_s = float(cfg.get("connect_timeout_s", 5))
+        self.max_concurrency = max(1, int(cfg.get("max_concurrency", 8)))
+        self.encoder = AudioEncoder.from_config(cfg.get("encode", {}) or {})
+        stream_cfg = cfg.get("stream", {}) or {}
+        self.stream_parallel = max(1, int(stream_cfg.get("max_parallel", 3)))
+        self.stream_max_chars = int(stream_cfg.get("max_chars", 400))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._async_client: Optional[AsyncSarvamAI] = None
+        cache_cfg = cfg.get("cache", {}) or {}
+        self.cache: Optional[TTSCache] = None
+        if cache_cfg.get("enabled", True):
+            try:
+                self.cache = TTSCache.from_config(cache_cfg)
+            except Exception as exc:
+                logger.warning(f"tts cache unavailable: {exc}")
         if not settings.sarvam_api_key:
             logger.warning("sarvam_api_key not configured - TTS will fail")
             self._client = None
         else:
-            self._client = SarvamAI(api_subscription_key=settings.sarvam_api_key)
+            self._client = SarvamAI(
+                api_subscription_key=settings.sarvam_api_key, timeout=self.timeout_s
+            )
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout_s, connect=self.connect_timeout_s),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._async_client = AsyncSarvamAI(
+                api_subscription_key=settings.sarvam_api_key,
+                timeout=self.timeout_s,
+                httpx_client=self._http,
+            )
+
+    def _resolve(self, language: str, speaker: str) -> Tuple[str, str]:
+        """map a language name to a Sarvam code and validate the speaker."""
+        language_code = LANGUAGE_CODE_MAP.get(language.lower())
+        if not language_code:
+            logger.warning(f"unknown language '{language}', defaulting to hi-IN")
+            language_code = "hi-IN"
+        if speaker in SPEAKER_ALIASES:
+            logger.info(f"mapping speaker alias '{speaker}' -> '{SPEAKER_ALIASES[speaker]}'")
+            speaker = SPEAKER_ALIASES[speaker]
+        if speaker not in AVAILABLE_SPEAKERS:
+            logger.warning(f"unknown speaker '{speaker}', defaulting to anushka")
+            speaker = "anushka"
+        return language_code, speaker
+
+    def request_key(
+        self,
+        text: str,
+        language: str = "hindi",
+        speaker: str = "anushka",
+        pitch: float = 0.0,
+        pace: float = 1.0,
+        loudness: float = 1.0,
+        enable_preprocessing: bool = True,
+        model: str = "bulbul:v2"
+    ) -> str:
+        """the TTS cache key synthesize_text would use for these arguments."""
+        language_code, speaker = self._resolve(language, speaker)
+        return self._cache_key(
+            text, language_code, speaker, pitch, pace, loudness, model, enable_preprocessing
+        )
+
+    @staticmethod
+    def _cache_key(
+        text: str,
+        language_code: str,
+        speaker: str,
+        pitch: float,
+        pace: float,
+        loudness: float,
+        model: str,
+        enable_preprocessing: bool,
+    ) -> str:
+        return tts_cache_key(
+            text=text,
+            language_code=language_code,
+            speaker=speaker,
+            pitch=float(pitch),
+            pace=float(pace),
+            loudness=float(loudness),
+            model=model,
+            preprocessing=bool(enable_preprocessing),
+            sample_rate=SPEECH_SAMPLE_RATE,
+        )
+
+    @staticmethod
+    def _decode(response: Any) -> bytes:
+        # response contains base64-encoded audio in 'audios' field
+        if hasattr(response, 'audios') and response.audios:
+            audio_bytes = base64.b64decode(response.audios[0])
+            logger.info(f"synthesized {len(audio_bytes)} bytes of audio")
+            return audio_bytes
+        raise RuntimeError("no audio returned from Sarvam API")
+
+    async def asynthesize_text(
+        self,
+        text: str,
+        language: str = "hindi",
+        speaker: str = "anushka",
+        pitch: float = 0.0,
+        pace: float = 1.0,
+        loudness: float = 1.0,
+        enable_preprocessing: bool = True,
+        model: str = "bulbul:v2"
+    ) -> bytes:
+        """non-blocking synthesize_text: same arguments, same result.
+
+        at most `tts.max_concurrency` requests are in flight per process;
+        extra callers wait for a slot.
+        """
+        if not self._async_client:
+            raise RuntimeError("sarvam api key is not configured")
+        language_code, speaker = self._resolve(language, speaker)
+        key = self._cache_key(
+            text, language_code, speaker, pitch, pace, loudness, model, enable_preprocessing
+        )
+        if self.cache is not None:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                return cached
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            try:
+                logger.info(f"synthesizing text: language={language_code}, speaker={speaker}")
+                with track_call("sarvam", "tts"):
+                    response = await self._async_client.text_to_speech.convert(
+                        text=text,
+                        target_language_code=language_code,
+                        speaker=speaker,
+                        pitch=pitch,
+                        pace=pace,
+                        loudness=loudness,
+                        speech_sample_rate=SPEECH_SAMPLE_RATE,
+                        enable_preprocessing=enable_preprocessing,
+                        model=model
+                    )
+            except httpx.TimeoutException as e:
+                logger.error(f"sarvam TTS timed out after {self.timeout_s}s: {e}")
+                raise RuntimeError(f"text-to-speech synthesis timed out: {e}")
+            except Exception as e:
+                logger.error(f"sarvam TTS failed: {e}")
+                raise RuntimeError(f"text-to-speech synthesis failed: {e}")
+        audio_bytes = self._decode(response)
+        if self.cache is not None:
+            await self.cache.aput(key, audio_bytes)
+        return audio_bytes
+
+    async def asynthesize_encoded(
+        self,
+        text: str,
+        audio_format: str = "wav",
+        bitrate: Optional[str] = None,
+        language: str = "hindi",
+        speaker: str = "anushka",
+        pitch: float = 0.0,
+        pace: float = 1.0,
+        loudness: float = 1.0,
+        enable_preprocessing: bool = True,
+        model: str = "bulbul:v2"
+    ) -> bytes:
+        """asynthesize_text followed by an optional opus / mp3 encode.
+
+        encoded clips are cached under the same key as their wav, with the
+        bitrate and format as the variant, so a repeat skips both steps.
+        """
+        params = dict(
+            language=language,
+            speaker=speaker,
+            pitch=pitch,
+            pace=pace,
+            loudness=loudness,
+            enable_preprocessing=enable_preprocessing,
+            model=model,
+        )
+        if audio_format == "wav":
+            return await self.asynthesize_text(text, **params)
+        if audio_format not in ENCODINGS:
+            raise ValueError(f"unsupported audio format: {audio_format}")
+        bitrate = self.encoder.bitrate(audio_format, bitrate)
+        variant = f"{bitrate}.{audio_format}"
+        key = None
+        if self.cache is not None:
+            key = self.request_key(text, **params)
+            cached = await self.cache.aget(key, variant)
+            if cached is not None:
+                return cached
+        wav = await self.asynthesize_text(text, **params)
+        encoded = await self.encoder.encode(wav, audio_format, bitrate)
+        if key is not None:
+            await self.cache.aput(key, encoded, variant)
+        return encoded
+
+    async def astream_speech(
+        self,
+        text: str,
+        language: str = "hindi",
+        speaker: str = "anushka",
+        **kwargs: Any,
+    ) -> AsyncIterator[bytes]:
+        """synthesize `text` sentence by sentence and yield one wav stream.
+
+        the first item is a wav header (sized for a stream of unknown length),
+        then the PCM frames of each sentence in order. up to
+        `tts.stream.max_parallel` sentences of this reply are synthesized at
+        once; closing the generator cancels the rest.
+        """
+        chunks = split_for_speech(text, language, self.stream_max_chars)
+        if not chunks:
+            raise RuntimeError("nothing to synthesize")
+        limit = asyncio.Semaphore(self.stream_parallel)
+
+        async def _one(chunk: str) -> bytes:
+            async with limit:
+                return await self.asynthesize_text(
+                    chunk, language=language, speaker=speaker, **kwargs
+                )
+
+        # semaphore waiters are woken in order, so earlier sentences go first
+        tasks: List[asyncio.Task] = [asyncio.create_task(_one(chunk)) for chunk in chunks]
+        try:
+            fmt = None
+            for task in tasks:
+                clip_fmt, pcm = split_wav(await task)
+                if fmt is None:
+                    fmt = clip_fmt
+                    yield wav_header(fmt)
+                elif clip_fmt != fmt:
+                    logger.warning(f"skipping tts chunk with format {clip_fmt}, stream is {fmt}")
+                    continue
+                yield pcm
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
     
     def synthesize_text(
         self,
@@ -88,48 +356,37 @@ class SarvamTTSService:
         if not self._client:
             raise RuntimeError("sarvam api key is not configured")
         
-        # map language name to code
-        language_code = LANGUAGE_CODE_MAP.get(language.lower())
-        if not language_code:
-            logger.warning(f"unknown language '{language}', defaulting to hi-IN")
-            language_code = "hi-IN"
-        
-        # normalize/validate speaker
-        if speaker in SPEAKER_ALIASES:
-            logger.info(f"mapping speaker alias '{speaker}' -> '{SPEAKER_ALIASES[speaker]}'")
-            speaker = SPEAKER_ALIASES[speaker]
-        if speaker not in AVAILABLE_SPEAKERS:
-            logger.warning(f"unknown speaker '{speaker}', defaulting to anushka")
-            speaker = "anushka"
+        language_code, speaker = self._resolve(language, speaker)
+        key = self._cache_key(
+            text, language_code, speaker, pitch, pace, loudness, model, enable_preprocessing
+        )
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
         
         try:
             logger.info(f"synthesizing text: language={language_code}, speaker={speaker}")
             
-            response = self._client.text_to_speech.convert(
-                text=text,
-                target_language_code=language_code,
-                speaker=speaker,
-                pitch=pitch,
-                pace=pace,
-                loudness=loudness,
-                speech_sample_rate=22050,
-                enable_preprocessing=enable_preprocessing,
-                model=model
-            )
-            
-            # response contains base64-encoded audio in 'audios' field
-            if hasattr(response, 'audios') and response.audios:
-                # decode base64 audio
-                audio_base64 = response.audios[0]
-                audio_bytes = base64.b64decode(audio_base64)
-                logger.info(f"synthesized {len(audio_bytes)} bytes of audio")
-                return audio_bytes
-            else:
-                raise RuntimeError("no audio returned from Sarvam API")
-                
+            with track_call("sarvam", "tts"):
+                response = self._client.text_to_speech.convert(
+                    text=text,
+                    target_language_code=language_code,
+                    speaker=speaker,
+                    pitch=pitch,
+                    pace=pace,
+                    loudness=loudness,
+                    speech_sample_rate=SPEECH_SAMPLE_RATE,
+                    enable_preprocessing=enable_preprocessing,
+                    model=model
+                )
+            audio_bytes = self._decode(response)
         except Exception as e:
             logger.error(f"sarvam TTS failed: {e}")
             raise RuntimeError(f"text-to-speech synthesis failed: {e}")
+        if self.cache is not None:
+            self.cache.put(key, audio_bytes)
+        return audio_bytes
     
     def synthesize_to_file(
         self,
@@ -179,19 +436,26 @@ def get_sarvam_service() -> SarvamTTSService:
     return _sarvam_service
 
 
+def warmup() -> bool:
+    """create the Sarvam client; False when no API key is configured."""
+    return get_sarvam_service()._client is not None
+
+
 # convenience functions for backward compatibility
 async def synthesize_text(
     text: str,
     language: str = "hindi",
-    speaker: Optional[str] = None
+    speaker: Optional[str] = None,
+    audio_format: str = "wav",
 ) -> bytes:
     """async wrapper for text-to-speech synthesis.
     
-    returns: audio bytes (WAV format)
+    returns: audio bytes (WAV format unless audio_format is "opus" or "mp3")
     """
     service = get_sarvam_service()
-    return service.synthesize_text(
+    return await service.asynthesize_encoded(
         text=text,
+        audio_format=audio_format,
         language=language,
-        speaker=(SPEAKER_ALIASES.get(speaker, speaker) if speaker else "anushka")
+        speaker=(SPEAKER_ALIASES.get(speaker, speaker) if speaker else "anushka"),
     )
@@ -0,0 +1,223 @@
+"""bounded in-process conversation memory.
+
+lowercase: replaces the unbounded `defaultdict(list)` in ChatWorkflow. each
+session keeps its last `max_turns` turns in a ring buffer, sessions idle for
+longer than `ttl_s` expire, and when the total size of all stored lines
+passes `max_bytes` whole sessions are evicted least-recently-used first. a
+background task sweeps expired sessions; expiry is also checked on access.
+a session may also carry a rolling summary of turns compacted out of it.
+"""
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict, deque
+import asyncio
+import logging
+import threading
+import time
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SESSIONS_ACTIVE = REGISTRY.gauge(
+    "supermuseum_sessions_active", "Conversation sessions held in memory."
+)
+SESSIONS_BYTES = REGISTRY.gauge(
+    "supermuseum_sessions_bytes", "UTF-8 bytes of conversation history held in memory."
+)
+SESSION_EVICTIONS = REGISTRY.counter(
+    "supermuseum_session_evictions_total",
+    "Sessions dropped from memory, by reason (ttl or memory).",
+    ["reason"],
+)
+
+
+class _Session:
+    __slots__ = ("lines", "summary", "bytes", "last_seen")
+
+    def __init__(self, max_lines: int, now: float) -> None:
+        self.lines: Deque[str] = deque(maxlen=max_lines)
+        self.summary = ""
+        self.bytes = 0
+        self.last_seen = now
+
+
+def _size(line: str) -> int:
+    return len(line.encode("utf-8"))
+
+
+class SessionMemory:
+    """per-session ring buffers with idle TTL and a global byte cap.
+
+    usage:
+        memory = SessionMemory(max_turns=20, ttl_s=1800, max_bytes=32 * 2**20)
+        memory.append("s1", "user: hi", "assistant: namaste!")
+        memory.get("s1")  # ["user: hi", "assistant: namaste!"]
+    """
+
+    def __init__(
+        self,
+        max_turns: int = 20,
+        ttl_s: float = 1800.0,
+        max_bytes: int = 32 * 2**20,
+        sweep_interval_s: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        # a turn is one user line plus one assistant line
+        self.max_lines = max(2, int(max_turns) * 2)
+        self.ttl_s = float(ttl_s)
+        self.max_bytes = int(max_bytes)
+        self.sweep_interval_s = float(sweep_interval_s)
+        self._clock = clock
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._sweeper: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "SessionMemory":
+        cfg = config.get("session_memory", {}) or {}
+        return cls(
+            max_turns=cfg.get("max_turns", 20),
+            ttl_s=cfg.get("ttl_s", 1800),
+            max_bytes=int(cfg.get("max_mb", 32) * 2**20),
+            sweep_interval_s=cfg.get("sweep_interval_s", 60),
+        )
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def _publish(self) -> None:
+        SESSIONS_ACTIVE.set(len(self._sessions))
+        SESSIONS_BYTES.set(self._bytes)
+
+    def _expired(self, session: _Session, now: float) -> bool:
+        return self.ttl_s > 0 and now - session.last_seen > self.ttl_s
+
+    def _drop(self, session_id: str, reason: Optional[str] = None) -> None:
+        session = self._sessions.pop(session_id)
+        self._bytes -= session.bytes
+        if reason:
+            SESSION_EVICTIONS.inc(reason=reason)
+
+    def _touch(self, session_id: str) -> Optional[_Session]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        now = self._clock()
+        if self._expired(session, now):
+            self._drop(session_id, "ttl")
+            self._publish()
+            return None
+        session.last_seen = now
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def get(self, session_id: str) -> List[str]:
+        """history lines oldest first; touching a session refreshes its TTL."""
+        with self._lock:
+            session = self._touch(session_id)
+            return list(session.lines) if session else []
+
+    def load(self, session_id: str) -> Tuple[str, List[str]]:
+        """(rolling summary, history lines) in one consistent read."""
+        with self._lock:
+            session = self._touch(session_id)
+            return (session.summary, list(session.lines)) if session else ("", [])
+
+    def compact(self, session_id: str, summary: str, covered: Sequence[str]) -> bool:
+        """replace the oldest lines with a summary of them.
+
+        `covered` must still be the head of the history (turns appended while
+        the summary was being written are kept); otherwise nothing changes
+        and False is returned.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or list(session.lines)[: len(covered)] != list(covered):
+                return False
+            delta = _size(summary) - _size(session.summary)
+            for _ in covered:
+                delta -= _size(session.lines.popleft())
+            session.summary = summary
+            session.bytes += delta
+            self._bytes += delta
+            self._publish()
+            return True
+
+    def append(self, session_id: str, *lines: str) -> None:
+        """add lines atomically, trimming the oldest beyond the turn cap."""
+        with self._lock:
+            now = self._clock()
+            session = self._sessions.get(session_id)
+            if session is not None and self._expired(session, now):
+                self._drop(session_id, "ttl")
+                session = None
+            if session is None:
+                session = self._sessions[session_id] = _Session(self.max_lines, now)
+            for line in lines:
+                if len(session.lines) == self.max_lines:
+                    old = _size(session.lines[0])
+                    session.bytes -= old
+                    self._bytes -= old
+                session.lines.append(line)
+                size = _size(line)
+                session.bytes += size
+                self._bytes += size
+            session.last_seen = now
+            self._sessions.move_to_end(session_id)
+            # evict least recently used sessions, never the one just written
+            while self._bytes > self.max_bytes and len(self._sessions) > 1:
+                oldest = next(iter(self._sessions))
+                self._drop(oldest, "memory")
+            self._publish()
+
+    def clear(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._drop(session_id)
+            self._publish()
+            return True
+
+    def sweep(self) -> int:
+        """drop every idle-expired session; returns how many were removed."""
+        with self._lock:
+            now = self._clock()
+            # LRU order means expired sessions sit at the front
+            expired = []
+            for sid, session in self._sessions.items():
+                if not self._expired(session, now):
+                    break
+                expired.append(sid)
+            for sid in expired:
+                self._drop(sid, "ttl")
+            self._publish()
+        if expired:
+            logger.info("session memory: expired %d idle sessions", len(expired))
+        return len(expired)
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval_s)
+            self.sweep()
+
+    def start_sweeper(self) -> None:
+        """start the background sweep task on the running loop (idempotent)."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever())
+
+    async def stop_sweeper(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+
+__all__ = ["SessionMemory"]
@@ -0,0 +1,229 @@
+"""pluggable async conversation history store.
+
+lowercase: ChatWorkflow talks to a SessionStore so history can be shared by
+every worker. `RedisSessionStore` keeps one Redis list per session with one
+compact JSON element per append (a user/assistant turn), trimmed to the turn
+cap and given an idle TTL, all in a single pipelined round trip. a rolling
+summary of compacted older turns lives next to the list under `<key>:summary`.
+`InMemorySessionStore` wraps the bounded SessionMemory for single-worker
+runs and tests. `create_session_store` picks Redis when REDIS_URL is set.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+import json
+import logging
+
+from services.session_memory import SessionMemory
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionHistory:
+    """what a prompt needs: the rolling summary plus the recent raw lines."""
+
+    summary: str = ""
+    lines: List[str] = field(default_factory=list)
+
+
+class SessionStore(ABC):
+    """async interface for per-session history lines (oldest first)."""
+
+    @abstractmethod
+    async def get(self, session_id: str) -> List[str]:
+        """the stored lines for a session, oldest first."""
+
+    @abstractmethod
+    async def load(self, session_id: str) -> SessionHistory:
+        """summary and lines in one read."""
+
+    @abstractmethod
+    async def compact(self, session_id: str, summary: str, covered: Sequence[str]) -> bool:
+        """swap the oldest lines (`covered`, still at the head) for `summary`."""
+
+    @abstractmethod
+    async def append(self, session_id: str, *lines: str) -> None:
+        """store lines as one unit: either all are kept or none."""
+
+    @abstractmethod
+    async def clear(self, session_id: str) -> bool:
+        """drop a session's history; True if there was any."""
+
+    def start(self) -> None:
+        """start background work (sweeping); called on app startup."""
+
+    async def close(self) -> None:
+        """release connections and stop background work."""
+
+
+class InMemorySessionStore(SessionStore):
+    """process-local store backed by SessionMemory (turn cap, TTL, byte cap)."""
+
+    def __init__(self, memory: Optional[SessionMemory] = None) -> None:
+        self.memory = memory if memory is not None else SessionMemory()
+
+    async def get(self, session_id: str) -> List[str]:
+        return self.memory.get(session_id)
+
+    async def load(self, session_id: str) -> SessionHistory:
+        summary, lines = self.memory.load(session_id)
+        return SessionHistory(summary=summary, lines=lines)
+
+    async def compact(self, session_id: str, summary: str, covered: Sequence[str]) -> bool:
+        return self.memory.compact(session_id, summary, covered)
+
+    async def append(self, session_id: str, *lines: str) -> None:
+        self.memory.append(session_id, *lines)
+
+    async def clear(self, session_id: str) -> bool:
+        return self.memory.clear(session_id)
+
+    def start(self) -> None:
+        self.memory.start_sweeper()
+
+    async def close(self) -> None:
+        await self.memory.stop_sweeper()
+
+
+def _encode(lines: tuple) -> str:
+    return json.dumps(lines, ensure_ascii=False, separators=(",", ":"))
+
+
+class RedisSessionStore(SessionStore):
+    """history in Redis lists shared by all workers.
+
+    usage:
+        store = RedisSessionStore.from_url("redis://localhost:6379/0", max_turns=20, ttl_s=1800)
+        await store.append("s1", "user: hi", "assistant: namaste!")
+        await store.get("s1")
+
+    redis errors are logged and degrade to "no history" so a cache outage
+    never fails a chat turn.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_turns: int = 20,
+        ttl_s: int = 1800,
+        prefix: str = "supermuseum:session:",
+    ) -> None:
+        self.client = client
+        self.max_turns = max(1, int(max_turns))
+        self.ttl_s = int(ttl_s)
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisSessionStore":
+        import redis.asyncio as aioredis
+
+        client = aioredis.from_url(url, decode_responses=True, health_check_interval=30)
+        return cls(client, **kwargs)
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    async def get(self, session_id: str) -> List[str]:
+        return (await self.load(session_id)).lines
+
+    async def load(self, session_id: str) -> SessionHistory:
+        key = self._key(session_id)
+        skey = f"{key}:summary"
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.lrange(key, 0, -1)
+                pipe.get(skey)
+                if self.ttl_s > 0:
+                    # reading counts as activity
+                    pipe.expire(key, self.ttl_s)
+                    pipe.expire(skey, self.ttl_s)
+                items, summary = (await pipe.execute())[:2]
+        except Exception as exc:
+            logger.warning("session store read failed for %s: %s", session_id, exc)
+            return SessionHistory()
+        lines = [line for item in items for line in json.loads(item)]
+        return SessionHistory(summary=summary or "", lines=lines)
+
+    async def compact(self, session_id: str, summary: str, covered: Sequence[str]) -> bool:
+        from redis.exceptions import WatchError
+
+        key = self._key(session_id)
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                # optimistic lock: abort if another worker touches the list meanwhile
+                await pipe.watch(key)
+                items = await pipe.lrange(key, 0, -1)
+                taken: List[str] = []
+                count = 0
+                for item in items:
+                    if len(taken) >= len(covered):
+                        break
+                    taken.extend(json.loads(item))
+                    count += 1
+                if taken != list(covered):
+                    await pipe.reset()
+                    return False
+                pipe.multi()
+                pipe.ltrim(key, count, -1)
+                pipe.set(f"{key}:summary", summary, ex=self.ttl_s if self.ttl_s > 0 else None)
+                await pipe.execute()
+            return True
+        except WatchError:
+            return False
+        except Exception as exc:
+            logger.warning("session store compact failed for %s: %s", session_id, exc)
+            return False
+
+    async def append(self, session_id: str, *lines: str) -> None:
+        if not lines:
+            return
+        key = self._key(session_id)
+        try:
+            # MULTI/EXEC: push, trim to the turn cap and refresh the TTL atomically
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.rpush(key, _encode(lines))
+                pipe.ltrim(key, -self.max_turns, -1)
+                if self.ttl_s > 0:
+                    pipe.expire(key, self.ttl_s)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("session store write failed for %s: %s", session_id, exc)
+
+    async def clear(self, session_id: str) -> bool:
+        try:
+            key = self._key(session_id)
+            return bool(await self.client.delete(key, f"{key}:summary"))
+        except Exception as exc:
+            logger.warning("session store delete failed for %s: %s", session_id, exc)
+            return False
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_session_store(redis_url: Optional[str], config: Dict) -> SessionStore:
+    """Redis when a URL is configured (and the client is installed), else in-memory."""
+    cfg = config.get("session_memory", {}) or {}
+    if redis_url:
+        try:
+            store = RedisSessionStore.from_url(
+                redis_url,
+                max_turns=cfg.get("max_turns", 20),
+                ttl_s=cfg.get("ttl_s", 1800),
+            )
+            logger.info("session store: redis")
+            return store
+        except ImportError as exc:
+            logger.warning("REDIS_URL set but redis client unavailable (%s); using memory", exc)
+    logger.info("session store: in-memory")
+    return InMemorySessionStore(SessionMemory.from_config(config))
+
+
+__all__ = [
+    "InMemorySessionStore",
+    "RedisSessionStore",
+    "SessionHistory",
+    "SessionStore",
+    "create_session_store",
+]
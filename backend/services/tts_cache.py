@@ -0,0 +1,253 @@
+"""content-addressed cache for synthesized speech.
+
+lowercase: exhibit greetings and standard answers are the same audio for
+every visitor. clips are keyed by a sha256 of every parameter that changes
+the output (text, language code, speaker, pitch, pace, loudness, model,
+preprocessing) and stored as files under `directory`, evicted
+least-recently-used once the directory passes `max_disk_bytes`. encoded
+variants of a clip (e.g. "32k.opus") sit next to its wav as `<key>.<variant>`.
+a small in-memory tier keeps the hottest clips without touching disk.
+`max_disk_bytes <= 0` disables eviction (the precomputed clip store).
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from utils.config_loader import resolve_project_path
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+TTS_CACHE_REQUESTS = REGISTRY.counter(
+    "supermuseum_tts_cache_requests_total",
+    "TTS cache lookups by result (memory, disk or miss).",
+    ["result"],
+)
+TTS_CACHE_BYTES_SAVED = REGISTRY.counter(
+    "supermuseum_tts_cache_bytes_saved_total",
+    "Audio bytes served from the TTS cache instead of being synthesized.",
+)
+TTS_CACHE_DISK_BYTES = REGISTRY.gauge(
+    "supermuseum_tts_cache_disk_bytes", "Bytes of audio stored in the TTS disk cache."
+)
+
+
+def tts_cache_key(**params: Any) -> str:
+    """sha256 over the canonical JSON of the synthesis parameters."""
+    canonical = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """two-tier (memory + disk) LRU of audio bytes keyed by content hash.
+
+    usage:
+        cache = TTSCache("data/cache/tts", max_disk_bytes=512 * 2**20)
+        key = tts_cache_key(text="namaste", language_code="hi-IN", speaker="anushka", ...)
+        audio = cache.get(key) or synthesize(...)
+        cache.put(key, audio)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_disk_bytes: int = 512 * 2**20,
+        max_memory_bytes: int = 32 * 2**20,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_disk_bytes = int(max_disk_bytes)
+        self.max_memory_bytes = int(max_memory_bytes)
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        # "<key>.<variant>" -> size on disk, least recently used first
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._scan()
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "TTSCache":
+        return cls(
+            resolve_project_path(cfg.get("directory", "data/cache/tts")),
+            max_disk_bytes=int(float(cfg.get("max_disk_mb", 512)) * 2**20),
+            max_memory_bytes=int(float(cfg.get("max_memory_mb", 32)) * 2**20),
+        )
+
+    def _path(self, entry: str) -> Path:
+        # two-level fan-out keeps directories small
+        return self.directory / entry[:2] / entry
+
+    def _scan(self) -> None:
+        """rebuild the disk index, oldest access first."""
+        if not self.directory.exists():
+            return
+        entries = []
+        for path in self.directory.glob("*/*.*"):
+            if path.suffix == ".tmp":
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((max(st.st_atime, st.st_mtime), path.name, st.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        TTS_CACHE_DISK_BYTES.set(self._disk_bytes)
+        if entries:
+            logger.info(
+                "tts cache: %d clips, %.1f MB on disk", len(entries), self._disk_bytes / 2**20
+            )
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.max_memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _hit(self, tier: str, audio: bytes) -> bytes:
+        TTS_CACHE_REQUESTS.inc(result=tier)
+        TTS_CACHE_BYTES_SAVED.inc(len(audio))
+        self.bytes_saved += len(audio)
+        return audio
+
+    def get(self, key: str, variant: str = "wav") -> Optional[bytes]:
+        key = f"{key}.{variant}"
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                return self._hit("memory", audio)
+            on_disk = key in self._disk
+        if on_disk:
+            path = self._path(key)
+            try:
+                audio = path.read_bytes()
+                os.utime(path)  # access time drives LRU order after a restart
+            except OSError:
+                audio = None
+            with self._lock:
+                if audio is None:
+                    self._forget_disk(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self._remember(key, audio)
+                    self.disk_hits += 1
+                    return self._hit("disk", audio)
+        with self._lock:
+            self.misses += 1
+        TTS_CACHE_REQUESTS.inc(result="miss")
+        return None
+
+    def _forget_disk(self, key: str) -> None:
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
+            TTS_CACHE_DISK_BYTES.set(self._disk_bytes)
+
+    def put(self, key: str, audio: bytes, variant: str = "wav") -> None:
+        if not audio:
+            return
+        key = f"{key}.{variant}"
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(audio)
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("tts cache write failed: %s", exc)
+            with self._lock:
+                self._remember(key, audio)
+            return
+        evict = []
+        with self._lock:
+            self._remember(key, audio)
+            self._forget_disk(key)
+            self._disk[key] = len(audio)
+            self._disk_bytes += len(audio)
+            while 0 < self.max_disk_bytes < self._disk_bytes and len(self._disk) > 1:
+                old_key = next(iter(self._disk))
+                evict.append(old_key)
+                self._forget_disk(old_key)
+            TTS_CACHE_DISK_BYTES.set(self._disk_bytes)
+        for old_key in evict:
+            try:
+                self._path(old_key).unlink()
+            except OSError:
+                pass
+
+    def file_path(self, key: str, variant: str = "wav") -> Path:
+        """where the clip lives on disk (whether or not it exists yet)."""
+        return self._path(f"{key}.{variant}")
+
+    def contains(self, key: str, variant: str = "wav") -> bool:
+        """presence check that doesn't count as a lookup or touch LRU order."""
+        return self.file_path(key, variant).exists()
+
+    def stored(self) -> List[Tuple[str, str]]:
+        """(key, variant) of every clip on disk, least recently used first."""
+        with self._lock:
+            return [tuple(entry.split(".", 1)) for entry in self._disk]  # type: ignore[misc]
+
+    def delete(self, key: str, variant: str = "wav") -> int:
+        """remove one clip from both tiers; returns the bytes freed on disk."""
+        entry = f"{key}.{variant}"
+        with self._lock:
+            size = self._disk.get(entry, 0)
+            self._forget_disk(entry)
+            audio = self._memory.pop(entry, None)
+            if audio is not None:
+                self._memory_bytes -= len(audio)
+        try:
+            self._path(entry).unlink()
+        except OSError:
+            pass
+        return size
+
+    async def aget(self, key: str, variant: str = "wav") -> Optional[bytes]:
+        with self._lock:
+            in_memory = f"{key}.{variant}" in self._memory
+        # memory hits are instant; disk reads go to a worker thread
+        if in_memory:
+            return self.get(key, variant)
+        return await asyncio.to_thread(self.get, key, variant)
+
+    async def aput(self, key: str, audio: bytes, variant: str = "wav") -> None:
+        await asyncio.to_thread(self.put, key, audio, variant)
+
+    def stats(self) -> Dict[str, float]:
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (hits / total) if total else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "disk_bytes": self._disk_bytes,
+            "memory_bytes": self._memory_bytes,
+            "entries": len(self._disk),
+        }
+
+
+__all__ = ["TTSCache", "tts_cache_key"]
@@ -0,0 +1,336 @@
+"""pre-voiced exhibit clips: manifest, batch synthesis and the served index.
+
+lowercase: curators list exhibit blurbs in a manifest (YAML or JSON); every
+text x language x speaker combination is synthesized ahead of time into a
+content-addressed store that is never evicted, and a compact index maps
+(clip id, language, speaker) to the stored key and its variants. the API
+serves clips straight from the store with no synthesis on the request path.
+store files no index slot references (an edited text or voice gets a new
+key) are marked superseded in the index and deleted by the first run after
+`delete_grace_s`, so an API process still serving the previous index keeps
+its files; slots for clips that left the manifest are dropped with
+`prune=True`.
+
+manifest:
+    defaults:
+      languages: all            # or a list; "all" = every Sarvam language
+      speakers: [anushka]
+      pace: 1.0                 # optional pitch / pace / loudness / model
+    clips:
+      - id: bronze-gallery-welcome
+        text: "Welcome to the bronze gallery."      # one text for every language
+      - id: nataraja
+        text: {english: "Shiva as the lord of dance.", hindi: "नृत्य के देवता शिव।"}
+        speakers: [anushka, rahul]
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import asyncio
+import json
+import logging
+import os
+import time
+
+from services.tts_cache import TTSCache
+from utils.config_loader import resolve_project_path
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+_VOICE_PARAMS = ("pitch", "pace", "loudness", "model", "enable_preprocessing")
+
+
+@dataclass
+class ClipJob:
+    """one clip to synthesize: a text in one language with one speaker."""
+
+    clip_id: str
+    language: str
+    speaker: str
+    text: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def slot(self) -> str:
+        return f"{self.language}/{self.speaker}"
+
+
+@dataclass
+class PrecomputeReport:
+    """counts and timings from one precompute run."""
+
+    jobs: int = 0
+    synthesized: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes_written: int = 0
+    pruned: int = 0
+    files_removed: int = 0
+    bytes_freed: int = 0
+    elapsed_s: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+
+def load_manifest(path: str, all_languages: Sequence[str]) -> List[ClipJob]:
+    """expand a manifest into jobs; "all" languages means `all_languages`."""
+    raw = Path(path).read_text(encoding="utf-8")
+    if path.endswith((".yaml", ".yml")):
+        import yaml
+
+        manifest = yaml.safe_load(raw) or {}
+    else:
+        manifest = json.loads(raw)
+    defaults = manifest.get("defaults", {}) or {}
+    jobs: List[ClipJob] = []
+    for clip in manifest.get("clips", []) or []:
+        clip_id = str(clip["id"])
+        params = {
+            k: clip.get(k, defaults.get(k))
+            for k in _VOICE_PARAMS
+            if clip.get(k, defaults.get(k)) is not None
+        }
+        speakers = clip.get("speakers") or defaults.get("speakers") or ["anushka"]
+        texts = clip["text"]
+        if isinstance(texts, dict):
+            wanted = clip.get("languages")
+            pairs = [(lang, text) for lang, text in texts.items() if not wanted or lang in wanted]
+        else:
+            languages = clip.get("languages") or defaults.get("languages") or "all"
+            if languages == "all":
+                languages = list(all_languages)
+            pairs = [(lang, texts) for lang in languages]
+        for language, text in pairs:
+            for speaker in speakers:
+                jobs.append(
+                    ClipJob(
+                        clip_id,
+                        str(language).lower(),
+                        str(speaker).lower(),
+                        str(text).strip(),
+                        params,
+                    )
+                )
+    return jobs
+
+
+class ClipLibrary:
+    """the never-evicted clip store plus its index.
+
+    usage:
+        library = ClipLibrary("data/tts_clips")
+        path = library.locate("nataraja", "hindi", "anushka", "opus")
+    """
+
+    def __init__(
+        self, directory: str, index_name: str = "index.json", delete_grace_s: float = 3600.0
+    ) -> None:
+        self.directory = Path(directory)
+        self.store = TTSCache(directory, max_disk_bytes=0, max_memory_bytes=0)
+        self.index_path = self.directory / index_name
+        self.delete_grace_s = max(0.0, float(delete_grace_s))
+        self.clips: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # "<key>.<variant>" -> when it was first found unreferenced
+        self.superseded: Dict[str, float] = {}
+        self._mtime = 0.0
+        self.refresh()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ClipLibrary":
+        cfg = (config.get("tts", {}) or {}).get("precomputed", {}) or {}
+        return cls(
+            resolve_project_path(cfg.get("directory", "data/tts_clips")),
+            delete_grace_s=cfg.get("delete_grace_s", 3600.0),
+        )
+
+    def refresh(self) -> None:
+        """reload the index if a precompute run rewrote it."""
+        try:
+            mtime = self.index_path.stat().st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("tts clip index unreadable: %s", exc)
+            return
+        if data.get("version") != INDEX_VERSION:
+            logger.warning(
+                "tts clip index version %s != %s, ignoring", data.get("version"), INDEX_VERSION
+            )
+            return
+        self.clips = data.get("clips", {})
+        self.superseded = data.get("superseded", {})
+        self._mtime = mtime
+
+    def entry(
+        self, clip_id: str, language: str, speaker: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """index entry for a clip; without a speaker, the first one voiced in that language."""
+        slots = self.clips.get(clip_id, {})
+        if speaker:
+            return slots.get(f"{language}/{speaker}")
+        for slot, entry in sorted(slots.items()):
+            if slot.split("/", 1)[0] == language:
+                return entry
+        return None
+
+    def locate(
+        self, clip_id: str, language: str, speaker: Optional[str], fmt: str = "wav"
+    ) -> Optional[Path]:
+        """file path of a stored clip in `fmt` ("wav", "opus", "mp3"), or None."""
+        entry = self.entry(clip_id, language, speaker)
+        if entry is None:
+            return None
+        for variant in sorted(entry["variants"]):
+            if variant == fmt or variant.endswith(f".{fmt}"):
+                path = self.store.file_path(entry["key"], variant)
+                if path.exists():
+                    return path
+        return None
+
+    def record(self, job: ClipJob, key: str, variants: Dict[str, int]) -> None:
+        slot = self.clips.setdefault(job.clip_id, {}).setdefault(
+            job.slot, {"key": key, "variants": {}}
+        )
+        if slot["key"] != key:
+            slot.update(key=key, variants={})
+        slot["variants"].update(variants)
+
+    def save(self) -> None:
+        """write the index atomically (compact, stable key order)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        payload = {"version": INDEX_VERSION, "clips": self.clips, "superseded": self.superseded}
+        tmp.write_text(
+            json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.index_path)
+        self._mtime = self.index_path.stat().st_mtime
+
+    def drop_missing(self, keep: Iterable[Tuple[str, str]]) -> int:
+        """drop index slots whose (clip id, slot) is not in `keep`; returns how many."""
+        wanted: Set[Tuple[str, str]] = set(keep)
+        dropped = 0
+        for clip_id in list(self.clips):
+            slots = self.clips[clip_id]
+            for slot in [slot for slot in slots if (clip_id, slot) not in wanted]:
+                del slots[slot]
+                dropped += 1
+            if not slots:
+                del self.clips[clip_id]
+        return dropped
+
+    def remove_unreferenced(self, now: Optional[float] = None) -> Tuple[int, int]:
+        """delete store files unreferenced for `delete_grace_s`; returns (files, bytes).
+
+        newly unreferenced files are only marked in `superseded`; call `save`
+        afterwards so the marks survive until a later run deletes them.
+        """
+        now = time.time() if now is None else now
+        referenced = {
+            f"{entry['key']}.{variant}"
+            for slots in self.clips.values()
+            for entry in slots.values()
+            for variant in entry["variants"]
+        }
+        superseded: Dict[str, float] = {}
+        files = freed = 0
+        for key, variant in self.store.stored():
+            name = f"{key}.{variant}"
+            if name in referenced:
+                continue
+            since = self.superseded.get(name, now)
+            if now - since >= self.delete_grace_s:
+                freed += self.store.delete(key, variant)
+                files += 1
+            else:
+                superseded[name] = since
+        self.superseded = superseded
+        return files, freed
+
+
+async def precompute(
+    service: Any,
+    library: ClipLibrary,
+    jobs: Sequence[ClipJob],
+    formats: Sequence[str] = ("wav",),
+    concurrency: int = 4,
+    retries: int = 3,
+    backoff_s: float = 1.0,
+    force: bool = False,
+    prune: bool = False,
+) -> PrecomputeReport:
+    """synthesize every job not already in the store; returns a report.
+
+    at most `concurrency` jobs run at once (the service's own semaphore still
+    caps requests to Sarvam). a failed job is retried `retries` times with
+    exponential backoff, then counted as failed; the index is saved at the end
+    with whatever succeeded, and store files it no longer references are
+    deleted once they have been unreferenced for the library's
+    `delete_grace_s`. with `prune`, index slots not in `jobs` are dropped first, so
+    `jobs` must be the whole manifest.
+    """
+    report = PrecomputeReport(jobs=len(jobs))
+    start = time.perf_counter()
+    limit = asyncio.Semaphore(max(1, concurrency))
+    variants = [fmt if fmt == "wav" else f"{service.encoder.bitrate(fmt)}.{fmt}" for fmt in formats]
+
+    async def _one(job: ClipJob) -> None:
+        key = service.request_key(
+            job.text, language=job.language, speaker=job.speaker, **job.params
+        )
+        have = {
+            v: library.store.file_path(key, v).stat().st_size
+            for v in variants
+            if library.store.contains(key, v)
+        }
+        if not force and len(have) == len(variants):
+            library.record(job, key, have)
+            report.skipped += 1
+            return
+        async with limit:
+            for attempt in range(retries + 1):
+                try:
+                    wav = await service.asynthesize_text(
+                        job.text, language=job.language, speaker=job.speaker, **job.params
+                    )
+                    written = {}
+                    for fmt, variant in zip(formats, variants):
+                        audio = wav if fmt == "wav" else await service.encoder.encode(wav, fmt)
+                        await library.store.aput(key, audio, variant)
+                        written[variant] = len(audio)
+                    break
+                except Exception as exc:
+                    if attempt == retries:
+                        report.failed += 1
+                        report.errors.append(f"{job.clip_id} {job.slot}: {exc}")
+                        logger.error("tts clip %s %s failed: %s", job.clip_id, job.slot, exc)
+                        return
+                    delay = backoff_s * 2**attempt
+                    logger.warning(
+                        "tts clip %s %s failed (%s), retrying in %.1fs",
+                        job.clip_id,
+                        job.slot,
+                        exc,
+                        delay,
+                    )
+                    await asyncio.sleep(delay)
+        library.record(job, key, written)
+        report.synthesized += 1
+        report.bytes_written += sum(written.values())
+
+    await asyncio.gather(*(_one(job) for job in jobs))
+    if prune:
+        report.pruned = library.drop_missing((job.clip_id, job.slot) for job in jobs)
+    # files deleted here were already unreferenced by the index on disk
+    report.files_removed, report.bytes_freed = library.remove_unreferenced()
+    library.save()
+    report.elapsed_s = time.perf_counter() - start
+    return report
+
+
+__all__ = ["ClipJob", "ClipLibrary", "PrecomputeReport", "load_manifest", "precompute"]
@@ -1,43 +1,98 @@
-"""vectorstore service that provides a Chroma-backed retriever.
+"""vectorstore service that provides a Chroma- or NumPy-backed retriever.
 
 lowercase: this module migrates retrieval logic from the old retriever and
 provides a simple synchronous API used by agents. it uses the project's
-ModelLoader to obtain embeddings and the existing YAML config loader.
+ModelLoader to obtain embeddings and the existing YAML config loader. the
+backend is chosen by `settings.vectorstore` ("chroma" or "numpy").
+
+`asearch` is the async entrypoint: blocking embedding/index work runs in a
+dedicated thread pool and results are cached per (normalized query, k),
+stamped with the index generation so nothing is served after re-ingestion.
 """
-from typing import List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
 import logging
 from pathlib import Path
 import os
+import threading
+import time
 
 # import legacy helpers from the original conversational_bot package
-from utils.config_loader import load_config
+from config.settings import settings
+from utils.config_loader import load_config, resolve_project_path
+from utils.embedding_cache import CachedEmbeddings
 from utils.model_loader import ModelLoader
+from utils.metrics import REGISTRY, track_call
 
 logger = logging.getLogger(__name__)
 
+RESULTS_CACHE = REGISTRY.counter(
+    "supermuseum_retrieval_cache_total",
+    "Retrieval results cache lookups by outcome.",
+    ["result"],
+)
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join((query or "").lower().split())
+
 
 class VectorStore:
-    """Chroma-backed vector store wrapper.
+    """Chroma- or NumPy-backed vector store wrapper.
 
     usage:
         vs = VectorStore()
         docs = vs.search("query text")
     """
 
-    def __init__(self) -> None:
+    def __init__(self, backend: Optional[str] = None) -> None:
+        self.backend = (backend or settings.vectorstore or "chroma").lower()
         # load yaml config from the original project layout
         self.config = load_config()
         self.model_loader = ModelLoader()
         self._vstore = None
         self._retriever = None
+        self.embeddings: Optional[CachedEmbeddings] = None
+        # retrievers are cheap to reuse but not to rebuild; keyed by (k, search params)
+        self._retrievers: Dict[Tuple[Any, ...], Any] = {}
+        self._bm25: Any = None
+        self._bm25_mtime: float = 0.0
+        retriever_cfg = self.config.get("retriever", {}) or {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(retriever_cfg.get("workers", 4)), thread_name_prefix="retrieval"
+        )
+        # (normalized query, k) -> (generation, docs)
+        self._results: "OrderedDict[Tuple[str, int], Tuple[Tuple[int, int], List[Any]]]" = (
+            OrderedDict()
+        )
+        self._results_max = int(retriever_cfg.get("results_cache_size", 256))
+        self._inflight: Dict[Tuple[str, int], "asyncio.Future[List[Any]]"] = {}
+        # generation = (ingestion manifest generation, in-process write count)
+        self._local_generation = 0
+        self._manifest_generation = 0
+        self._manifest_mtime: Optional[float] = None
+        self._generation_lock = threading.Lock()
+        # the manifest is stat-ed at most this often (asearch reads it on the event loop)
+        self._generation_check_s = float(retriever_cfg.get("generation_check_s", 2.0))
+        self._manifest_checked_at: Optional[float] = None
+        # set when another process re-ingested; the next search reopens the backend
+        self._reload_backend = False
 
     def _get_collection_name(self) -> str:
         # prefer explicit vector collection config, otherwise fall back
-        return (
+        name = (
             self.config.get("vector", {}).get("collection_name")
             or self.config.get("astra_db", {}).get("collection_name")
             or "cultural_knowledge"
         )
+        # local vectors have a different dimension; never mix them into the same collection
+        if (self.config.get("embedding_model", {}) or {}).get("provider") == "local":
+            name = f"{name}_local"
+        return name
 
     def _get_persist_directory(self) -> str:
         # store Chroma DB in data/chroma by default
@@ -45,10 +100,67 @@ class VectorStore:
         base.mkdir(parents=True, exist_ok=True)
         return str(base)
 
+    def _search_kwargs(self, top_k: int) -> Dict[str, Any]:
+        retriever_cfg = self.config.get("retriever", {}) or {}
+        return {
+            "k": top_k,
+            "fetch_k": retriever_cfg.get("fetch_k", 20),
+            "lambda_mult": retriever_cfg.get("lambda_mult", 0.7),
+            "score_threshold": retriever_cfg.get("score_threshold", 0.3),
+        }
+
+    def _wrap_embeddings(self, embeddings: Any) -> Any:
+        """put the query-embedding LRU (and optional disk cache) in front of the model."""
+        cache_cfg = self.config.get("embedding_cache", {}) or {}
+        if not cache_cfg.get("enabled", True):
+            return embeddings
+        persist_path = cache_cfg.get("persist_path") or None
+        if persist_path:
+            persist_path = resolve_project_path(persist_path)
+        emb_cfg = self.config.get("embedding_model", {}) or {}
+        local_cfg = emb_cfg.get("local", {}) or {}
+        return CachedEmbeddings(
+            embeddings,
+            namespace=self.model_loader.embedding_identity(),
+            max_entries=cache_cfg.get("max_entries", 2048),
+            persist_path=persist_path,
+            max_disk_entries=cache_cfg.get("max_disk_entries", 50_000),
+            max_disk_documents=cache_cfg.get("max_disk_documents", 200_000),
+            # local models are cheap per query but seeding still benefits from disk reuse
+            cache_documents=emb_cfg.get("provider") == "local"
+            and local_cfg.get("cache_documents", True),
+        )
+
+    def embedding_cache_stats(self) -> Dict[str, float]:
+        """hit/miss counts for the query-embedding cache (empty if disabled)."""
+        if isinstance(self.embeddings, CachedEmbeddings):
+            return self.embeddings.stats()
+        return {}
+
+    def _ensure_numpy_index(self) -> None:
+        """open the memory-mapped NumPy index; cheap enough for serverless too."""
+        try:
+            from services.numpy_index import NumpyVectorIndex
+
+            self.embeddings = self._wrap_embeddings(self.model_loader.load_embeddings())
+            self._vstore = NumpyVectorIndex(
+                self._get_persist_directory(), self._get_collection_name()
+            )
+            logger.info(
+                "numpy vectorstore initialized: %s (%d rows)", self._vstore.name, self._vstore.size
+            )
+        except Exception as exc:  # pragma: no cover - import/runtime issues
+            logger.exception("failed to initialize numpy vectorstore: %s", exc)
+            self._vstore = None
+
     def _ensure_vstore(self) -> None:
         if self._vstore is not None:
             return
 
+        if self.backend == "numpy":
+            self._ensure_numpy_index()
+            return
+
         # Skip heavy Chroma in serverless/Vercel
         if os.getenv("VERCEL") == "1":
             logger.info("Vercel/serverless: skipping local ChromaDB initialization")
@@ -61,7 +173,8 @@ class VectorStore:
             except Exception:
                 from langchain.vectorstores import Chroma  # fallback for older langchain
 
-            embeddings = self.model_loader.load_embeddings()
+            embeddings = self._wrap_embeddings(self.model_loader.load_embeddings())
+            self.embeddings = embeddings
 
             collection_name = self._get_collection_name()
             persist_directory = self._get_persist_directory()
@@ -77,6 +190,134 @@ class VectorStore:
             logger.exception("failed to initialize chroma vectorstore: %s", exc)
             self._vstore = None
 
+    def warmup(self) -> bool:
+        """open the index (and BM25 sidecar) before the first query.
+
+        raises when the store cannot be opened so readiness reports it;
+        returns False on serverless where chroma is intentionally skipped.
+        """
+        if self.backend != "numpy" and os.getenv("VERCEL") == "1":
+            return False
+        self._ensure_vstore()
+        if self._vstore is None:
+            raise RuntimeError(f"{self.backend} vectorstore failed to initialize")
+        if self._hybrid_config().get("enabled"):
+            self._load_bm25()
+        return True
+
+    def manifest_path(self) -> str:
+        """location of the ingestion manifest that tracks embedded chunks."""
+        return str(
+            Path(self._get_persist_directory()) / f"{self._get_collection_name()}_manifest.json"
+        )
+
+    @property
+    def generation(self) -> Tuple[int, int]:
+        """current index generation; changes whenever indexed content changes.
+
+        ingestion bumps the manifest generation (also from other processes such
+        as scripts/seed_chroma.py); writes through this instance bump the local part.
+        the manifest is checked at most every `retriever.generation_check_s`
+        seconds. a changed generation drops cached results and makes the next
+        search reopen the backend.
+        """
+        now = time.monotonic()
+        with self._generation_lock:
+            first = self._manifest_checked_at is None
+            if not first and now - self._manifest_checked_at < self._generation_check_s:
+                return (self._manifest_generation, self._local_generation)
+            self._manifest_checked_at = now
+        path = self.manifest_path()
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+        with self._generation_lock:
+            if mtime != self._manifest_mtime:
+                self._manifest_mtime = mtime
+                previous = self._manifest_generation
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        self._manifest_generation = int(json.load(f).get("generation", 0))
+                except (OSError, ValueError):
+                    self._manifest_generation = 0
+                if self._manifest_generation != previous and not first:
+                    self._results.clear()
+                    self._reload_backend = True
+            return (self._manifest_generation, self._local_generation)
+
+    def bump_generation(self) -> None:
+        """invalidate cached results after the index changed in this process."""
+        with self._generation_lock:
+            self._local_generation += 1
+
+    def bm25_path(self) -> str:
+        """location of the BM25 index built by the ingestion pipeline."""
+        return str(
+            Path(self._get_persist_directory()) / f"{self._get_collection_name()}.bm25.json.gz"
+        )
+
+    def _hybrid_config(self) -> Dict[str, Any]:
+        return (self.config.get("retriever", {}) or {}).get("hybrid", {}) or {}
+
+    def _load_bm25(self) -> Any:
+        """load (or reload after re-ingestion) the persisted BM25 index."""
+        from services.bm25_index import BM25Index
+
+        path = Path(self.bm25_path())
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return None
+        if self._bm25 is None or mtime != self._bm25_mtime:
+            self._bm25 = BM25Index.load(str(path))
+            self._bm25_mtime = mtime
+        return self._bm25
+
+    def upsert_embeddings(
+        self,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+    ) -> None:
+        """write pre-computed embeddings (used by the ingestion pipeline)."""
+        self._ensure_vstore()
+        if not self._vstore:
+            raise RuntimeError("vectorstore not initialized")
+        if self.backend == "numpy":
+            self._vstore.upsert(ids, texts, metadatas, embeddings)
+        else:
+            # langchain's add_texts would embed again; go straight to the collection
+            self._vstore._collection.upsert(
+                ids=ids, documents=texts, metadatas=metadatas, embeddings=embeddings
+            )
+        self.bump_generation()
+
+    @contextmanager
+    def bulk(self) -> Iterator["VectorStore"]:
+        """group writes; the NumPy backend publishes them as one version on exit."""
+        self._ensure_vstore()
+        if self.backend == "numpy" and self._vstore is not None:
+            with self._vstore.bulk():
+                yield self
+            self.bump_generation()
+        else:
+            yield self
+
+    def delete(self, ids: List[str]) -> None:
+        """remove chunks by id."""
+        self._ensure_vstore()
+        if not self._vstore:
+            raise RuntimeError("vectorstore not initialized")
+        if not ids:
+            return
+        if self.backend == "numpy":
+            self._vstore.delete(ids)
+        else:
+            self._vstore.delete(ids=ids)
+        self.bump_generation()
+
     def load_retriever(self, top_k: Optional[int] = None):
         """return a LangChain retriever configured for mmr search.
 
@@ -85,18 +326,25 @@ class VectorStore:
         self._ensure_vstore()
         if not self._vstore:
             raise RuntimeError("vectorstore not initialized")
+        if self.backend == "numpy":
+            raise RuntimeError("load_retriever is only available for the chroma backend")
 
         top_k = top_k or self.config.get("retriever", {}).get("top_k", 3)
+        search_kwargs = self._search_kwargs(top_k)
+        cache_key = ("mmr",) + tuple(sorted(search_kwargs.items()))
+        cached = self._retrievers.get(cache_key)
+        if cached is not None:
+            self._retriever = cached
+            return cached
         # configure an MMR retriever similar to previous implementation
         try:
-            self._retriever = self._vstore.as_retriever(
-                search_type="mmr",
-                search_kwargs={"k": top_k, "fetch_k": 20, "lambda_mult": 0.7, "score_threshold": 0.3},
-            )
-            return self._retriever
+            retriever = self._vstore.as_retriever(search_type="mmr", search_kwargs=search_kwargs)
         except Exception:
             # fallback: return default retriever
-            return self._vstore.as_retriever()
+            retriever = self._vstore.as_retriever()
+        self._retrievers[cache_key] = retriever
+        self._retriever = retriever
+        return retriever
 
     def search(self, query: str, top_k: int = 10) -> List[Any]:
         """perform semantic search and return LangChain Document objects.
@@ -109,17 +357,140 @@ class VectorStore:
             if not self._vstore:
                 logger.warning("vectorstore unavailable: returning empty results")
                 return []
-        
+
+        if self.backend == "numpy":
+            if self._reload_backend:
+                self._reload_backend = False
+                self._vstore.load()
+            else:
+                # pick up a re-ingest published by another process (one stat when unchanged)
+                self._vstore.refresh()
+
+        hybrid_cfg = self._hybrid_config()
+        if hybrid_cfg.get("enabled"):
+            bm25 = self._load_bm25()
+            if bm25 is not None and bm25.size:
+                return self._search_hybrid(query, top_k, bm25, hybrid_cfg)
+
+        return self._search_vector(query, top_k)
+
+    async def asearch(self, query: str, top_k: int = 10) -> List[Any]:
+        """async search: cached by (normalized query, k), computed in a thread pool.
+
+        cached entries carry the generation they were computed under and are
+        ignored once ingestion has bumped it. concurrent identical queries share
+        one computation.
+        """
+        key = (_normalize_query(query), int(top_k))
+        generation = self.generation
+        cached = self._results.get(key)
+        if cached is not None and cached[0] == generation:
+            self._results.move_to_end(key)
+            RESULTS_CACHE.inc(result="hit")
+            return list(cached[1])
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            RESULTS_CACHE.inc(result="coalesced")
+            return list(await asyncio.shield(pending))
+
+        RESULTS_CACHE.inc(result="miss")
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self.search, query, top_k)
+        self._inflight[key] = future
+        try:
+            docs = await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+        # stamp with the generation observed *before* searching: if ingestion ran
+        # meanwhile, the next lookup sees a newer generation and recomputes
+        self._results[key] = (generation, list(docs))
+        self._results.move_to_end(key)
+        while len(self._results) > self._results_max:
+            self._results.popitem(last=False)
+        return list(docs)
+
+    def _search_vector(self, query: str, top_k: int) -> List[Any]:
+        if self.backend == "numpy":
+            return self._search_numpy(query, top_k)
+
         retriever = self.load_retriever(top_k=top_k)
         # prefer modern invoke API; fall back to legacy methods
-        try:
-            docs = retriever.invoke(query)  # type: ignore[attr-defined]
-        except Exception:
+        with track_call("chroma", "search"):
             try:
-                docs = retriever.get_relevant_documents(query)
-            except AttributeError:
-                docs = retriever.retrieve(query)
+                docs = retriever.invoke(query)  # type: ignore[attr-defined]
+            except Exception:
+                try:
+                    docs = retriever.get_relevant_documents(query)
+                except AttributeError:
+                    docs = retriever.retrieve(query)
         return docs
 
+    def _search_numpy(self, query: str, top_k: int) -> List[Any]:
+        """MMR over the NumPy index, returning LangChain Documents like Chroma does."""
+        from langchain_core.documents import Document
+
+        params = self._search_kwargs(top_k)
+        with track_call("numpy_index", "search"):
+            query_vec = self.embeddings.embed_query(query)
+            # rows are only meaningful against the snapshot that produced them
+            snap = self._vstore.snapshot()
+            hits = snap.mmr(
+                query_vec,
+                k=params["k"],
+                fetch_k=params["fetch_k"],
+                lambda_mult=params["lambda_mult"],
+                score_threshold=params["score_threshold"],
+            )
+        return [
+            Document(page_content=snap.texts[row], metadata=dict(snap.metadatas[row]))
+            for row, _score in hits
+        ]
+
+    def _fetch_by_ids(self, ids: List[str]) -> Dict[str, Any]:
+        """load Documents for chunk ids (lexical hits the vector side did not return)."""
+        from langchain_core.documents import Document
+
+        if not ids:
+            return {}
+        if self.backend == "numpy":
+            snap = self._vstore.snapshot()
+            rows = [(cid, snap.row_of.get(cid)) for cid in ids]
+            return {
+                cid: Document(page_content=snap.texts[r], metadata=dict(snap.metadatas[r]))
+                for cid, r in rows
+                if r is not None
+            }
+        got = self._vstore.get(ids=ids)
+        return {
+            cid: Document(page_content=text, metadata=meta or {})
+            for cid, text, meta in zip(
+                got.get("ids", []), got.get("documents", []), got.get("metadatas", [])
+            )
+        }
+
+    def _search_hybrid(self, query: str, top_k: int, bm25: Any, cfg: Dict[str, Any]) -> List[Any]:
+        """fuse vector (MMR) and BM25 rankings with reciprocal rank fusion.
+
+        chunk ids are content hashes (see ingestion_service), so vector hits are
+        matched to lexical hits by hashing their page content.
+        """
+        from services.bm25_index import reciprocal_rank_fusion
+        from services.ingestion_service import content_hash
+
+        candidates = int(cfg.get("candidates", max(top_k * 2, 20)))
+        vector_docs = self._search_vector(query, candidates)
+        with track_call("bm25", "search"):
+            lexical = bm25.search(query, k=candidates)
+        by_id = {content_hash(d.page_content): d for d in vector_docs}
+        fused = reciprocal_rank_fusion(
+            [list(by_id), [cid for cid, _ in lexical]],
+            k=int(cfg.get("rrf_k", 60)),
+            weights=[float(cfg.get("vector_weight", 1.0)), float(cfg.get("lexical_weight", 1.0))],
+        )[:top_k]
+        missing = [cid for cid, _ in fused if cid not in by_id]
+        by_id.update(self._fetch_by_ids(missing))
+        return [by_id[cid] for cid, _ in fused if cid in by_id]
+
 
 vectorstore = VectorStore()
@@ -1,24 +1,270 @@
 """speech-to-text service using faster-whisper.
 
-lowercase: provide async transcription helper that returns text, language and confidence.
+lowercase: one WhisperModel per process (int8 on CPU by default, size from
+the `stt` config block or WHISPER_MODEL_SIZE) with silero VAD filtering so
+silence is skipped. transcription runs in a dedicated thread pool so it never
+blocks the event loop, and every call reports its real-time factor (compute
+seconds per second of audio). live partial transcripts get their own pool
+and model workers and are dropped, not queued, when those are busy, so they
+never delay a final transcription. WHISPER_OFFLINE=1 returns a stub result
+without loading a model.
 """
-from typing import Dict
+from typing import Any, Dict, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
+import math
+import os
+import threading
+import time
+
+from utils.config_loader import load_config, resolve_project_path
+from utils.metrics import REGISTRY, track_call
 
 logger = logging.getLogger(__name__)
 
+STT_REAL_TIME_FACTOR = REGISTRY.histogram(
+    "supermuseum_stt_real_time_factor",
+    "Transcription compute time divided by audio duration (lower is faster).",
+    ["model"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 4.0),
+)
+STT_AUDIO_SECONDS = REGISTRY.counter(
+    "supermuseum_stt_audio_seconds_total",
+    "Seconds of audio transcribed (before VAD trimming).",
+    ["model"],
+)
+
+# whisper language codes -> names used across the agents / Sarvam mapping
+WHISPER_LANGUAGES = {
+    "en": "english",
+    "hi": "hindi",
+    "bn": "bengali",
+    "ta": "tamil",
+    "te": "telugu",
+    "kn": "kannada",
+    "ml": "malayalam",
+    "mr": "marathi",
+    "gu": "gujarati",
+    "pa": "punjabi",
+    "or": "odia",
+    "ur": "urdu",
+}
+
+# audio input: a file path / file-like object, or 16 kHz mono float32 samples
+AudioInput = Union[str, Any]
+
+
+class WhisperTranscriber:
+    """lazily loaded faster-whisper model with its own executor.
+
+    usage:
+        stt = WhisperTranscriber(model_size="small")
+        result = await stt.transcribe("clip.wav")  # {"text", "language", "confidence", ...}
+    """
+
+    def __init__(
+        self,
+        model_size: str = "small",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        workers: int = 1,
+        partial_workers: int = 1,
+        beam_size: int = 1,
+        vad_filter: bool = True,
+        vad_min_silence_ms: int = 500,
+        download_root: Optional[str] = None,
+    ) -> None:
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.cpu_threads = int(cpu_threads)
+        self.workers = max(1, int(workers))
+        self.partial_workers = max(0, int(partial_workers))
+        self.beam_size = max(1, int(beam_size))
+        self.vad_filter = vad_filter
+        self.vad_min_silence_ms = int(vad_min_silence_ms)
+        self.download_root = download_root
+        self._model: Any = None
+        self._lock = threading.Lock()
+        # one thread per concurrent decode; ctranslate2 uses cpu_threads inside each
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="whisper")
+        self._partial_executor = ThreadPoolExecutor(
+            max_workers=max(1, self.partial_workers), thread_name_prefix="whisper-partial"
+        )
+        self._partials_running = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "WhisperTranscriber":
+        cfg = config.get("stt", {}) or {}
+        download_root = cfg.get("download_root") or None
+        if download_root:
+            download_root = resolve_project_path(download_root)
+        return cls(
+            model_size=os.getenv("WHISPER_MODEL_SIZE") or cfg.get("model_size", "small"),
+            device=cfg.get("device", "cpu"),
+            compute_type=cfg.get("compute_type", "int8"),
+            cpu_threads=cfg.get("cpu_threads", 0),
+            workers=cfg.get("workers", 1),
+            partial_workers=cfg.get("partial_workers", 1),
+            beam_size=cfg.get("beam_size", 1),
+            vad_filter=cfg.get("vad_filter", True),
+            vad_min_silence_ms=cfg.get("vad_min_silence_ms", 500),
+            download_root=download_root,
+        )
+
+    def _ensure_model(self) -> Any:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from faster_whisper import WhisperModel
+
+                    logger.info(
+                        "loading whisper model: %s (%s, %s)",
+                        self.model_size,
+                        self.device,
+                        self.compute_type,
+                    )
+                    self._model = WhisperModel(
+                        self.model_size,
+                        device=self.device,
+                        compute_type=self.compute_type,
+                        cpu_threads=self.cpu_threads,
+                        # separate model workers for partials, so finals never wait on them
+                        num_workers=self.workers + self.partial_workers,
+                        download_root=self.download_root,
+                    )
+        return self._model
+
+    def warmup(self) -> bool:
+        """load weights ahead of the first request."""
+        self._ensure_model()
+        return True
+
+    def transcribe_sync(self, audio: AudioInput, language: Optional[str] = None) -> Dict[str, Any]:
+        """blocking transcription; call through `transcribe` from async code."""
+        model = self._ensure_model()
+        start = time.perf_counter()
+        with track_call("whisper", "transcribe"):
+            segments, info = model.transcribe(
+                audio,
+                language=language,
+                beam_size=self.beam_size,
+                vad_filter=self.vad_filter,
+                vad_parameters={"min_silence_duration_ms": self.vad_min_silence_ms},
+            )
+            # segments is a lazy generator: decoding happens while iterating
+            parts, logprobs = [], []
+            for seg in segments:
+                parts.append(seg.text.strip())
+                logprobs.append(seg.avg_logprob)
+        elapsed = time.perf_counter() - start
+        duration = float(info.duration or 0.0)
+        rtf = elapsed / duration if duration > 0 else 0.0
+        if duration > 0:
+            STT_REAL_TIME_FACTOR.observe(rtf, model=self.model_size)
+            STT_AUDIO_SECONDS.inc(duration, model=self.model_size)
+        confidence = (
+            math.exp(sum(logprobs) / len(logprobs))
+            if logprobs
+            else float(info.language_probability or 0.0)
+        )
+        logger.info(
+            "whisper: %.2fs audio (%.2fs after vad) in %.2fs, rtf=%.2f, lang=%s",
+            duration,
+            float(info.duration_after_vad or 0.0),
+            elapsed,
+            rtf,
+            info.language,
+        )
+        return {
+            "text": " ".join(p for p in parts if p),
+            "language": WHISPER_LANGUAGES.get(info.language, info.language or "english"),
+            "confidence": round(min(1.0, confidence), 3),
+            "duration_s": round(duration, 3),
+            "rtf": round(rtf, 3),
+        }
+
+    async def transcribe(self, audio: AudioInput, language: Optional[str] = None) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.transcribe_sync, audio, language)
+
+    async def transcribe_partial(
+        self, audio: AudioInput, language: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """best-effort transcription for live partials; None when the partial pool is busy."""
+        if self._partials_running >= self.partial_workers:
+            return None
+        self._partials_running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._partial_executor, self.transcribe_sync, audio, language
+            )
+        finally:
+            self._partials_running -= 1
+
+
+_transcriber: Optional[WhisperTranscriber] = None
+_transcriber_lock = threading.Lock()
+
+
+def _offline() -> bool:
+    return os.getenv("WHISPER_OFFLINE") == "1" or os.getenv("VERCEL") == "1"
+
+
+def get_transcriber() -> WhisperTranscriber:
+    """the per-process transcriber built from config."""
+    global _transcriber
+    if _transcriber is None:
+        with _transcriber_lock:
+            if _transcriber is None:
+                try:
+                    config = load_config()
+                except Exception:
+                    config = {}
+                _transcriber = WhisperTranscriber.from_config(config)
+    return _transcriber
+
+
+def warmup() -> bool:
+    """load the model at startup; False when offline."""
+    if _offline():
+        return False
+    return get_transcriber().warmup()
+
+
+async def transcribe_partial(audio: AudioInput) -> Optional[Dict[str, object]]:
+    """partial transcript of live audio, or None if skipped (offline or pool busy)."""
+    if _offline():
+        return None
+    return await get_transcriber().transcribe_partial(audio)
+
 
-async def transcribe_audio(file_path: str, model_size: str = "medium") -> Dict[str, object]:
+async def transcribe_audio(
+    file_path: AudioInput, model_size: Optional[str] = None
+) -> Dict[str, object]:
     """transcribe an audio file and return transcription details.
 
     args:
-        file_path: path to audio file (mp3, wav, webm, etc.)
-        model_size: model size for faster-whisper (e.g., medium, large-v2)
+        file_path: path to audio file (mp3, wav, webm, etc.), a file-like
+            object, or 16 kHz mono float32 samples
+        model_size: ignored unless it differs from the configured model, in
+            which case a warning is logged (one model is kept per process)
 
     returns:
         dict with keys: text (str), language (str), confidence (float)
+        plus duration_s and rtf when a model ran
     """
-    # Serverless stub: faster-whisper not available in lean deployment
-    # STT feature is disabled; this function always returns empty transcript
-    logger.warning("whisper_service: STT not available in serverless mode; returning empty transcript")
-    return {"text": "", "language": "english", "confidence": 0.0}
+    if _offline():
+        logger.info("WHISPER_OFFLINE=1: returning stub transcript")
+        return {"text": "", "language": "english", "confidence": 0.0}
+    transcriber = get_transcriber()
+    if model_size and model_size != transcriber.model_size:
+        logger.warning(
+            "whisper: model_size=%s requested but %s is loaded; using the loaded model",
+            model_size,
+            transcriber.model_size,
+        )
+    return await transcriber.transcribe(file_path)
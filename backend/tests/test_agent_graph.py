@@ -0,0 +1,77 @@
+"""tests for the agent dependency-graph executor."""
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+from agents.base_agent import BaseAgent
+from workflows.agent_graph import AgentGraph
+
+
+class _SleepAgent(BaseAgent):
+    def __init__(self, name: str, reads=(), writes=(), delay: float = 0.05) -> None:
+        self._name = name
+        self.reads = tuple(reads)
+        self.writes = tuple(writes)
+        self.delay = delay
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        await asyncio.sleep(self.delay)
+        for key in self.writes:
+            state[key] = f"{self._name}:{','.join(sorted(k for k in state if k in self.reads))}"
+        # undeclared writes must not leak into the shared state
+        state["scratch"] = self._name
+        return state
+
+
+def test_dependencies_follow_declared_keys():
+    graph = AgentGraph(
+        [
+            _SleepAgent("emotion", reads=["user_input"], writes=["emotion"]),
+            _SleepAgent("language", reads=["user_input", "language"], writes=["language"]),
+            _SleepAgent("rag", reads=["user_input"], writes=["retrieved_context"]),
+            _SleepAgent("tone", reads=["emotion"], writes=["tone"]),
+        ]
+    )
+    assert graph.dependencies["tone"] == {"emotion"}
+    assert graph.dependencies["rag"] == set()
+    assert graph.stages() == [["emotion", "language", "rag"], ["tone"]]
+
+
+def test_independent_agents_run_concurrently():
+    graph = AgentGraph(
+        [
+            _SleepAgent("a", reads=["user_input"], writes=["x"], delay=0.1),
+            _SleepAgent("b", reads=["user_input"], writes=["y"], delay=0.1),
+            _SleepAgent("c", reads=["x"], writes=["z"], delay=0.01),
+        ]
+    )
+
+    async def _go():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        out = await graph.run({"user_input": "hi"})
+        return out, loop.time() - start
+
+    (state, timings), elapsed = asyncio.get_event_loop().run_until_complete(_go())
+    assert elapsed < 0.18
+    assert state["z"] == "c:x"
+    assert "scratch" not in state
+    assert set(timings) == {"a", "b", "c"}
+    assert all(ms > 0 for ms in timings.values())
+
+
+def test_failure_cancels_remaining_nodes():
+    class _Boom(BaseAgent):
+        writes = ("x",)
+
+        async def run(self, state):
+            raise RuntimeError("boom")
+
+    graph = AgentGraph([_Boom(), _SleepAgent("slow", reads=["x"], writes=["y"])])
+    with pytest.raises(RuntimeError):
+        asyncio.get_event_loop().run_until_complete(graph.run({}))
@@ -0,0 +1,101 @@
+"""tests for the opus / mp3 output stage."""
+import asyncio
+import base64
+import io
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from config.settings import settings
+from services.audio_encoder import AudioEncoder
+from services.sarvam_service import SarvamTTSService
+from services.tts_cache import TTSCache
+
+av = pytest.importorskip("av")
+
+
+def _wav(seconds: float = 1.0, rate: int = 22050) -> bytes:
+    t = np.arange(int(seconds * rate)) / rate
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((np.sin(2 * np.pi * 440 * t) * 8000).astype("<i2").tobytes())
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("fmt,magic", [("opus", b"OggS"), ("mp3", b"ID3")])
+def test_encode_shrinks_wav(fmt, magic):
+    wav = _wav()
+    encoded = AudioEncoder().encode_sync(wav, fmt)
+    assert encoded.startswith(magic)
+    assert len(encoded) < len(wav) / 4
+    with av.open(io.BytesIO(encoded)) as container:
+        assert container.streams.audio[0].codec_context.name in (
+            "opus",
+            "libopus",
+            "mp3",
+            "mp3float",
+        )
+
+
+def test_encoded_variants_cached_next_to_wav(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sarvam_api_key", "test-key")
+    service = SarvamTTSService()
+    service.cache = TTSCache(str(tmp_path))
+    calls, encodes = [], []
+    wav = _wav(0.5)
+
+    async def _convert(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(audios=[base64.b64encode(wav).decode()])
+
+    real_encode = service.encoder.encode
+
+    async def _encode(*args, **kwargs):
+        encodes.append(args[1])
+        return await real_encode(*args, **kwargs)
+
+    service._async_client.text_to_speech.convert = _convert
+    service.encoder.encode = _encode
+
+    async def _go():
+        first = await service.asynthesize_encoded("namaste", audio_format="opus")
+        again = await service.asynthesize_encoded("namaste", audio_format="opus")
+        mp3 = await service.asynthesize_encoded("namaste", audio_format="mp3", bitrate="48k")
+        same = await service.asynthesize_encoded("namaste", audio_format="mp3", bitrate="48000")
+        plain = await service.asynthesize_encoded("namaste")
+        await service.aclose()
+        return first, again, mp3, same, plain
+
+    first, again, mp3, same, plain = asyncio.get_event_loop().run_until_complete(_go())
+    assert first == again and first.startswith(b"OggS")
+    assert same == mp3
+    assert plain == wav
+    assert len(calls) == 1 and encodes == ["opus", "mp3"]
+    names = sorted(p.name.split(".", 1)[1] for p in tmp_path.glob("*/*"))
+    assert names == ["32k.opus", "48k.mp3", "wav"]
+
+
+def test_bitrate_normalized_and_clamped():
+    encoder = AudioEncoder()
+    assert {encoder.bitrate("opus", b) for b in ("32", "32000", "32k", " 32K")} == {"32k"}
+    assert encoder.bitrate("opus", "1") == "6k"
+    assert encoder.bitrate("opus", "999999k") == "256k"
+    assert encoder.bitrate("mp3", "999999k") == "320k"
+    assert encoder.bitrate("mp3") == "64k"
+
+
+def test_request_rejects_zero_bitrate():
+    from pydantic import ValidationError
+
+    from models.schemas import TTSRequest
+
+    with pytest.raises(ValidationError):
+        TTSRequest(text="hi", bitrate="0")
+    with pytest.raises(ValidationError):
+        TTSRequest(text="hi", bitrate="9999999k")
+    assert TTSRequest(text="hi", bitrate="48k").bitrate == "48k"
@@ -0,0 +1,84 @@
+"""tests for in-memory upload handling and PCM decoding."""
+import asyncio
+import io
+import shutil
+import wave
+
+import pytest
+
+from utils.audio_processor import (
+    AudioDecodeError,
+    UploadTooLarge,
+    WavFormat,
+    decode_to_pcm,
+    join_wav,
+    read_upload,
+    split_wav,
+    wav_header,
+)
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class _Upload:
+    def __init__(self, data: bytes) -> None:
+        self._buf = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self._buf.read(size)
+
+
+def _wav_bytes(seconds: float = 0.5, rate: int = 8000) -> bytes:
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"\x00\x10" * 2 * int(seconds * rate))
+    return out.getvalue()
+
+
+def test_read_upload_enforces_limit_and_spools(tmp_path):
+    with pytest.raises(UploadTooLarge):
+        _run(read_upload(_Upload(b"x" * 1000), max_bytes=999, spool_dir=str(tmp_path)))
+
+    buf = _run(
+        read_upload(
+            _Upload(b"y" * 5000), max_bytes=10_000, spool_bytes=1000, spool_dir=str(tmp_path)
+        )
+    )
+    assert buf.read() == b"y" * 5000
+    buf.close()
+    # the spill file is anonymous: nothing is left in the spool directory
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_decode_to_pcm_resamples_to_16k_mono():
+    if not shutil.which("ffmpeg"):
+        pytest.importorskip("faster_whisper")
+    pcm = _run(decode_to_pcm(io.BytesIO(_wav_bytes(0.5, 8000))))
+    assert pcm.dtype.name == "float32"
+    assert abs(len(pcm) - 8000) < 400  # 0.5 s at 16 kHz, mono
+
+
+def test_decode_to_pcm_rejects_garbage():
+    if not shutil.which("ffmpeg"):
+        pytest.importorskip("faster_whisper")
+    with pytest.raises(AudioDecodeError):
+        _run(decode_to_pcm(io.BytesIO(b"definitely not audio")))
+
+
+def test_wav_helpers_round_trip():
+    clip = _wav_bytes(0.25)
+    fmt, pcm = split_wav(clip)
+    assert fmt == WavFormat(channels=2, sample_width=2, sample_rate=8000)
+    assert wav_header(fmt, len(pcm)) + pcm == clip
+    joined = join_wav([clip, clip])
+    with wave.open(io.BytesIO(joined), "rb") as wav:
+        assert wav.getnframes() == 2 * 2000
+    with pytest.raises(AudioDecodeError):
+        join_wav([clip, _wav_bytes(0.25, rate=16000)])
+    with pytest.raises(AudioDecodeError):
+        split_wav(b"not a wav")
@@ -0,0 +1,61 @@
+"""tests for audio content negotiation and binary bodies."""
+import asyncio
+import json
+from urllib.parse import unquote
+
+import pytest
+from fastapi import HTTPException
+
+from utils.audio_response import (
+    JSON,
+    MULTIPART,
+    WAV,
+    metadata_headers,
+    multipart_response,
+    negotiate,
+)
+
+
+def test_negotiate_keeps_json_default():
+    offers = [JSON, MULTIPART, WAV]
+    assert negotiate(None, offers) == JSON
+    assert negotiate("*/*", offers) == JSON
+    assert negotiate("audio/wav", offers) == WAV
+    assert negotiate("audio/x-wav", offers) == WAV
+    assert negotiate("audio/*;q=0.9, application/json;q=0.5", offers) == WAV
+    assert negotiate("multipart/mixed, */*;q=0.1", offers) == MULTIPART
+
+
+def test_negotiate_rejects_unacceptable_accept():
+    with pytest.raises(HTTPException) as exc:
+        negotiate("text/html", [JSON, WAV])
+    assert exc.value.status_code == 406
+    with pytest.raises(HTTPException):
+        negotiate("audio/wav;q=0", [JSON, WAV])
+    assert negotiate("text/html, */*;q=0.1", [JSON, WAV]) == JSON
+
+
+def test_metadata_headers_are_latin1_safe():
+    headers = metadata_headers({"transcript": "नमस्ते दोस्त", "confidence": 0.9, "emotion": None})
+    assert set(headers) == {"X-Transcript", "X-Confidence"}
+    headers["X-Transcript"].encode("latin-1")
+    assert unquote(headers["X-Transcript"]) == "नमस्ते दोस्त"
+
+
+def test_multipart_body_has_json_then_audio():
+    audio = b"RIFF" + bytes(100)
+    response = multipart_response({"transcript": "hello"}, audio)
+    boundary = response.media_type.split("boundary=")[1]
+
+    async def _collect():
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.get_event_loop().run_until_complete(_collect())
+    assert any(chunk is audio for chunk in chunks)  # sent as-is, not copied
+    body = b"".join(chunks)
+    assert int(response.headers["content-length"]) == len(body)
+    parts = body.split(f"--{boundary}".encode())[1:-1]
+    head, meta = parts[0].split(b"\r\n\r\n", 1)
+    assert JSON.encode() in head and json.loads(meta) == {"transcript": "hello"}
+    head, clip = parts[1].split(b"\r\n\r\n", 1)
+    assert WAV.encode() in head and clip == audio + b"\r\n"
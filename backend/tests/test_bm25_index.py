@@ -0,0 +1,38 @@
+"""tests for the BM25 index and reciprocal rank fusion."""
+from services.bm25_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+def _index():
+    return BM25Index.build(
+        ["konark", "yaman", "pongal"],
+        [
+            "The Konark Sun Temple in Odisha is shaped like a chariot.",
+            "Raga Yaman is sung in the evening and uses a sharp fourth.",
+            "Pongal is a harvest festival celebrated in Tamil Nadu.",
+        ],
+    )
+
+
+def test_tokenize_keeps_devanagari_words_whole():
+    assert tokenize("राग यमन is an evening raga") == ["राग", "यमन", "evening", "raga"]
+
+
+def test_search_ranks_exact_proper_noun_first():
+    hits = _index().search("tell me about raga yaman", k=2)
+    assert hits[0][0] == "yaman"
+    assert _index().search("nothing matches here", k=3) == []
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    path = str(tmp_path / "idx.bm25.json.gz")
+    original = _index()
+    original.save(path)
+    loaded = BM25Index.load(path)
+    assert loaded.postings == original.postings
+    assert loaded.search("harvest festival") == original.search("harvest festival")
+
+
+def test_rrf_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], k=60)
+    assert fused[0][0] == "b"
+    assert {doc for doc, _ in fused} == {"a", "b", "c", "d"}
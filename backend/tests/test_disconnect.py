@@ -0,0 +1,45 @@
+"""tests for cancelling handler work on client disconnect."""
+import asyncio
+
+import pytest
+
+from utils.disconnect import REQUESTS_CANCELLED, ClientDisconnected, cancel_on_disconnect
+
+
+class _FakeRequest:
+    def __init__(self, disconnect_after: float) -> None:
+        self.disconnect_after = disconnect_after
+        self._start = None
+
+    async def is_disconnected(self) -> bool:
+        loop = asyncio.get_running_loop()
+        if self._start is None:
+            self._start = loop.time()
+        return loop.time() - self._start >= self.disconnect_after
+
+
+def test_returns_result_when_client_stays():
+    async def _work():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    out = asyncio.get_event_loop().run_until_complete(
+        cancel_on_disconnect(_FakeRequest(10.0), _work(), route="t_ok", poll_interval=0.005)
+    )
+    assert out == "done"
+
+
+def test_cancels_work_when_client_leaves():
+    history = []
+
+    async def _work():
+        await asyncio.sleep(5)
+        history.append("assistant: reply")
+
+    before = REQUESTS_CANCELLED.value(route="t_gone")
+    with pytest.raises(ClientDisconnected):
+        asyncio.get_event_loop().run_until_complete(
+            cancel_on_disconnect(_FakeRequest(0.02), _work(), route="t_gone", poll_interval=0.01)
+        )
+    assert history == []
+    assert REQUESTS_CANCELLED.value(route="t_gone") == before + 1
@@ -0,0 +1,102 @@
+"""tests for the query-embedding LRU cache."""
+from utils.embedding_cache import CachedEmbeddings
+
+
+class _CountingEmbeddings:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return [float(len(text)), 1.0, 0.5]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+
+def test_repeated_queries_hit_memory():
+    base = _CountingEmbeddings()
+    emb = CachedEmbeddings(base, namespace="test", max_entries=2)
+    assert emb.embed_query("Sun Temple") == emb.embed_query("  Sun   Temple ")
+    assert base.calls == 1
+    assert emb.stats()["memory_hits"] == 1
+
+
+def test_case_is_part_of_the_key():
+    base = _CountingEmbeddings()
+    emb = CachedEmbeddings(base)
+    emb.embed_query("Sun Temple")
+    emb.embed_query("sun temple")
+    assert base.calls == 2
+
+
+def test_lru_evicts_oldest():
+    base = _CountingEmbeddings()
+    emb = CachedEmbeddings(base, max_entries=2)
+    for q in ["a", "b", "c", "a"]:
+        emb.embed_query(q)
+    assert base.calls == 4
+    assert emb.stats()["entries"] == 2
+
+
+def test_disk_persistence_survives_restart(tmp_path):
+    db = tmp_path / "emb.sqlite"
+    first = CachedEmbeddings(_CountingEmbeddings(), namespace="m", persist_path=str(db))
+    vec = first.embed_query("konark")
+    first.close()
+
+    base = _CountingEmbeddings()
+    second = CachedEmbeddings(base, namespace="m", persist_path=str(db))
+    assert second.embed_query("konark") == vec
+    assert base.calls == 0
+    assert second.stats()["disk_hits"] == 1
+
+
+def test_document_cache_only_embeds_new_texts(tmp_path):
+    base = _CountingEmbeddings()
+    emb = CachedEmbeddings(base, persist_path=str(tmp_path / "e.sqlite"), cache_documents=True)
+    first = emb.embed_documents(["a", "bb"])
+    assert base.calls == 2
+    again = emb.embed_documents(["bb", "ccc", "a"])
+    assert base.calls == 3
+    assert again[0] == first[1] and again[2] == first[0]
+
+
+def test_disk_table_is_bounded(tmp_path):
+    db = tmp_path / "emb.sqlite"
+    emb = CachedEmbeddings(
+        _CountingEmbeddings(), persist_path=str(db), max_entries=1, max_disk_entries=3
+    )
+    for q in ["a", "bb", "ccc", "dddd", "a"]:
+        emb.embed_query(q)
+    rows = emb._db.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0]
+    emb.close()
+    assert rows == 3
+
+    base = _CountingEmbeddings()
+    reopened = CachedEmbeddings(base, persist_path=str(db), max_disk_entries=3)
+    reopened.embed_query("dddd")
+    assert base.calls == 0
+    reopened.embed_query("bb")  # oldest write, evicted
+    assert base.calls == 1
+
+
+def test_documents_do_not_evict_cached_queries(tmp_path):
+    base = _CountingEmbeddings()
+    emb = CachedEmbeddings(
+        base,
+        persist_path=str(tmp_path / "e.sqlite"),
+        cache_documents=True,
+        max_entries=1,
+        max_disk_entries=2,
+        max_disk_documents=3,
+    )
+    emb.embed_query("konark")
+    emb.embed_documents([f"doc {i}" for i in range(10)])
+    tables = ("query_embeddings", "document_embeddings")
+    counts = [emb._db.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in tables]
+    assert counts == [1, 3]
+    emb.embed_query("other")
+    calls = base.calls
+    emb.embed_query("konark")  # evicted from memory, still on disk
+    assert base.calls == calls
@@ -0,0 +1,99 @@
+"""tests for chunking and incremental ingestion."""
+from services.ingestion_service import IngestionPipeline, chunk_text, split_sentences
+
+
+class _Store:
+    def __init__(self):
+        self.rows = {}
+
+    def upsert_embeddings(self, ids, texts, metadatas, embeddings):
+        for cid, text, meta, vec in zip(ids, texts, metadatas, embeddings):
+            self.rows[cid] = (text, meta, vec)
+
+    def delete(self, ids):
+        for cid in ids:
+            self.rows.pop(cid, None)
+
+
+class _Embed:
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        return [[float(len(t))] for t in texts]
+
+
+def test_split_sentences_handles_danda():
+    assert split_sentences("मंदिर पुराना है। यह सुंदर है॥ Is it old? Yes.") == [
+        "मंदिर पुराना है।",
+        "यह सुंदर है॥",
+        "Is it old?",
+        "Yes.",
+    ]
+
+
+def test_chunks_respect_size_and_overlap():
+    text = " ".join(f"Sentence number {i} is here." for i in range(20))
+    chunks = chunk_text(text, max_chars=80, overlap=1)
+    assert len(chunks) > 1
+    assert all(len(c) <= 80 for c in chunks)
+    # the last sentence of each chunk opens the next one
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert nxt.startswith(split_sentences(prev)[-1])
+
+
+def test_paragraph_that_fits_is_not_split():
+    first = "Konark is a sun temple. It faces east."
+    second = "The chariot has twelve wheels. Each wheel is a sundial."
+    chunks = chunk_text(f"{first}\n\n{second}", max_chars=80, overlap=1)
+    # the second paragraph moves to a fresh chunk whole, after the overlap sentence
+    assert chunks == [first, f"It faces east. {second}"]
+    assert chunk_text(f"{first}\n\n{second}", max_chars=60, overlap=1) == [first, second]
+    assert chunk_text(f"{first}\n\n{second}", max_chars=200) == [f"{first} {second}"]
+
+
+def test_incremental_run_only_embeds_changed_chunks(tmp_path):
+    manifest = str(tmp_path / "manifest.json")
+    pipeline = IngestionPipeline(manifest, chunk_size=60, overlap=0, batch_size=2, workers=2)
+    store, embed = _Store(), _Embed()
+    sources = {
+        "a.txt": "Konark is a sun temple. It faces east.\n\nIt was built in stone.",
+        "b.txt": "Konark is a sun temple. It faces east.",  # duplicate content
+    }
+    first = pipeline.run(sources, embed_fn=embed, store=store)
+    assert first.duplicates == 1
+    assert first.added == len(store.rows) == first.chunks
+    assert first.generation == 1
+
+    embed.texts.clear()
+    second = pipeline.run(sources, embed_fn=embed, store=store)
+    assert second.added == 0 and embed.texts == []
+    assert second.generation == 1
+
+    sources["a.txt"] = "Konark is a sun temple. It faces east.\n\nIt was carved from khondalite."
+    third = pipeline.run(sources, embed_fn=embed, store=store)
+    assert third.added == 1 and third.deleted == 1
+    assert embed.texts == ["It was carved from khondalite."]
+    assert third.generation == 2
+
+
+def test_run_writes_inside_the_store_bulk_block(tmp_path):
+    from contextlib import contextmanager
+
+    events = []
+
+    class _BulkStore(_Store):
+        @contextmanager
+        def bulk(self):
+            events.append("begin")
+            yield self
+            events.append("commit")
+
+        def upsert_embeddings(self, ids, texts, metadatas, embeddings):
+            events.append("upsert")
+            super().upsert_embeddings(ids, texts, metadatas, embeddings)
+
+    pipeline = IngestionPipeline(str(tmp_path / "m.json"), chunk_size=40, batch_size=2)
+    pipeline.run({"a.txt": " ".join(f"Fact {i} here." for i in range(10))}, _Embed(), _BulkStore())
+    assert events[0] == "begin" and events[-1] == "commit" and events.count("upsert") > 1
@@ -0,0 +1,48 @@
+"""tests for the in-process metrics registry and agent instrumentation."""
+import asyncio
+
+import pytest
+
+from agents.base_agent import BaseAgent
+from utils.metrics import AGENT_RUNS, EXTERNAL_CALLS, MetricsRegistry, REGISTRY, track_call
+
+
+def test_render_prometheus_text():
+    reg = MetricsRegistry()
+    c = reg.counter("demo_total", "Demo counter.", ["route"])
+    h = reg.histogram("demo_seconds", "Demo latency.", ["route"], buckets=(0.1, 1.0))
+    g = reg.gauge("demo_sessions", "Demo gauge.")
+    c.inc(route="chat")
+    c.inc(2, route="chat")
+    h.observe(0.05, route="chat")
+    h.observe(0.5, route="chat")
+    g.set_function(lambda: 7)
+
+    text = reg.render()
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{route="chat"} 3' in text
+    assert 'demo_seconds_bucket{route="chat",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{route="chat",le="1"} 2' in text
+    assert 'demo_seconds_bucket{route="chat",le="+Inf"} 2' in text
+    assert 'demo_seconds_count{route="chat"} 2' in text
+    assert "demo_sessions 7" in text
+    assert reg.counter("demo_total", "again", ["route"]) is c
+
+
+def test_track_call_counts_errors():
+    before = EXTERNAL_CALLS.value(service="test", operation="op", status="error")
+    with pytest.raises(ValueError):
+        with track_call("test", "op"):
+            raise ValueError("boom")
+    assert EXTERNAL_CALLS.value(service="test", operation="op", status="error") == before + 1
+
+
+def test_agent_run_is_instrumented():
+    class _EchoAgent(BaseAgent):
+        async def run(self, state):
+            return state
+
+    before = AGENT_RUNS.value(agent="_EchoAgent", status="ok")
+    asyncio.get_event_loop().run_until_complete(_EchoAgent().run({}))
+    assert AGENT_RUNS.value(agent="_EchoAgent", status="ok") == before + 1
+    assert 'supermuseum_agent_run_seconds_count{agent="_EchoAgent"}' in REGISTRY.render()
@@ -0,0 +1,110 @@
+"""tests for the memory-mapped NumPy vector index."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from services.numpy_index import NumpyVectorIndex  # noqa: E402
+
+
+def _vecs():
+    return [[1.0, 0.0, 0.0], [0.98, 0.2, 0.0], [0.6, 0.0, 0.8], [0.0, 1.0, 0.0]]
+
+
+def test_top_k_and_persistence(tmp_path):
+    index = NumpyVectorIndex(str(tmp_path), "t")
+    index.upsert(["a", "b", "c", "d"], ["A", "B", "C", "D"], [{"i": n} for n in range(4)], _vecs())
+    hits = index.top_k([1.0, 0.0, 0.0], k=2)
+    assert [index.ids[r] for r, _ in hits] == ["a", "b"]
+
+    reopened = NumpyVectorIndex(str(tmp_path), "t")
+    assert isinstance(reopened.snapshot().matrix, np.memmap)
+    assert reopened.size == 4 and reopened.texts[2] == "C"
+
+
+def test_mmr_prefers_diverse_results(tmp_path):
+    index = NumpyVectorIndex(str(tmp_path), "t")
+    index.upsert(["a", "b", "c", "d"], ["A", "B", "C", "D"], [{}] * 4, _vecs())
+    query = [1.0, 0.0, 0.15]
+    assert [index.ids[r] for r, _ in index.mmr(query, k=2, fetch_k=4, lambda_mult=1.0)] == [
+        "a",
+        "b",
+    ]
+    # "b" is nearly a duplicate of "a", so MMR picks the more diverse "c"
+    hits = index.mmr(query, k=2, fetch_k=4, lambda_mult=0.5)
+    assert [index.ids[r] for r, _ in hits] == ["a", "c"]
+    assert index.mmr([0.0, -1.0, 0.0], k=2, score_threshold=0.3) == []
+
+
+def test_upsert_replaces_and_delete_compacts(tmp_path):
+    index = NumpyVectorIndex(str(tmp_path), "t")
+    index.upsert(["a", "b"], ["A", "B"], [{}, {}], _vecs()[:2])
+    index.upsert(["a"], ["A2"], [{"v": 2}], [[0.0, 0.0, 1.0]])
+    assert index.size == 2 and index.texts[0] == "A2"
+    index.delete(["a"])
+    assert index.ids == ["b"]
+    assert index.top_k([1.0, 0.0, 0.0], k=5)[0][0] == 0
+
+
+def test_upsert_dedupes_batch_and_keeps_old_snapshot(tmp_path):
+    index = NumpyVectorIndex(str(tmp_path), "t")
+    index.upsert(["a", "b"], ["A", "B"], [{}, {}], _vecs()[:2])
+    before = index.snapshot()
+    index.upsert(["c", "c", "a"], ["C1", "C2", "A2"], [{}, {"v": 2}, {}], _vecs()[1:4])
+    assert index.ids == ["a", "b", "c"] and index.texts == ["A2", "B", "C2"]
+    assert index.metadatas[2] == {"v": 2}
+    assert index.snapshot().matrix.shape[0] == 3
+    # a search holding the earlier snapshot still sees rows that match its lists
+    assert before.ids == ["a", "b"] and before.texts == ["A", "B"] and before.matrix.shape[0] == 2
+
+
+def test_failed_save_leaves_index_unchanged(tmp_path, monkeypatch):
+    index = NumpyVectorIndex(str(tmp_path), "t")
+    index.upsert(["a"], ["A"], [{}], _vecs()[:1])
+
+    def _boom(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, "save", _boom)
+    with pytest.raises(OSError):
+        index.upsert(["b"], ["B"], [{}], _vecs()[1:2])
+    assert index.ids == ["a"] and index.snapshot().row_of == {"a": 0}
+
+
+def test_bulk_publishes_one_version_and_other_processes_refresh(tmp_path):
+    reader = NumpyVectorIndex(str(tmp_path), "t")
+    writer = NumpyVectorIndex(str(tmp_path), "t")
+    with writer.bulk():
+        writer.upsert(["a", "b"], ["A", "B"], [{}, {}], _vecs()[:2])
+        writer.upsert(["c", "a"], ["C", "A2"], [{}, {}], _vecs()[2:4])
+        writer.delete(["b"])
+        assert writer.size == 0  # nothing visible until the block ends
+    assert writer.version == 1 and writer.ids == ["a", "c"] and writer.texts == ["A2", "C"]
+
+    assert reader.size == 0 and reader.refresh()
+    assert reader.ids == ["a", "c"] and not reader.refresh()
+
+    writer.upsert(["d"], ["D"], [{}], _vecs()[:1])
+    writer.upsert(["e"], ["E"], [{}], _vecs()[1:2])
+    assert reader.refresh() and reader.version == 3 and reader.size == 4
+    # only the live version and the one before it stay on disk
+    assert sorted(p.name for p in tmp_path.glob("t.v*.npy")) == ["t.v2.npy", "t.v3.npy"]
+
+
+def test_bulk_discards_writes_when_the_block_fails(tmp_path):
+    index = NumpyVectorIndex(str(tmp_path), "t")
+    with pytest.raises(RuntimeError):
+        with index.bulk():
+            index.upsert(["a"], ["A"], [{}], _vecs()[:1])
+            raise RuntimeError("embedding failed")
+    assert index.size == 0 and not list(tmp_path.glob("t.v*"))
+
+
+def test_unversioned_files_still_load(tmp_path):
+    vecs = np.asarray(_vecs()[:2], dtype=np.float32)
+    np.save(tmp_path / "t.npy", vecs)
+    (tmp_path / "t.meta.json").write_text('{"ids":["a","b"],"texts":["A","B"],"metadatas":[{},{}]}')
+    index = NumpyVectorIndex(str(tmp_path), "t")
+    assert index.ids == ["a", "b"] and index.version == 0
+    index.delete(["a"])
+    index.upsert(["c"], ["C"], [{}], _vecs()[2:3])
+    assert index.ids == ["b", "c"] and not (tmp_path / "t.npy").exists()
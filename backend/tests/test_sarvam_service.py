@@ -0,0 +1,117 @@
+"""tests for the async Sarvam TTS path (no network)."""
+import asyncio
+import base64
+import io
+import wave
+from types import SimpleNamespace
+
+import pytest
+
+from config.settings import settings
+from services.sarvam_service import SarvamTTSService
+from utils.language_utils import split_for_speech
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "sarvam_api_key", "test-key")
+    svc = SarvamTTSService()
+    svc.max_concurrency = 2
+    svc.cache = None
+    yield svc
+    asyncio.get_event_loop().run_until_complete(svc.aclose())
+
+
+def test_async_tts_caps_concurrency_and_keeps_loop_free(service):
+    active, peak, calls = 0, 0, []
+
+    async def _convert(**kwargs):
+        nonlocal active, peak
+        calls.append(kwargs)
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        return SimpleNamespace(audios=[base64.b64encode(b"RIFFdata").decode()])
+
+    service._async_client.text_to_speech.convert = _convert
+    ticks = []
+
+    async def _ticker():
+        for _ in range(5):
+            ticks.append(1)
+            await asyncio.sleep(0.01)
+
+    async def _go():
+        return await asyncio.gather(
+            _ticker(),
+            *(
+                service.asynthesize_text("namaste", language="hindi", speaker="meera")
+                for _ in range(5)
+            ),
+        )
+
+    results = asyncio.get_event_loop().run_until_complete(_go())
+    assert results[1:] == [b"RIFFdata"] * 5
+    assert peak == 2
+    assert len(ticks) == 5
+    assert calls[0]["target_language_code"] == "hi-IN"
+    assert calls[0]["speaker"] == "anushka"  # alias resolved
+
+
+def test_async_tts_wraps_failures(service):
+    async def _convert(**kwargs):
+        raise ValueError("bad request")
+
+    service._async_client.text_to_speech.convert = _convert
+    with pytest.raises(RuntimeError, match="synthesis failed"):
+        asyncio.get_event_loop().run_until_complete(service.asynthesize_text("hi"))
+
+
+def _clip(text: str) -> str:
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(22050)
+        wav.writeframes(text.encode("utf-8").ljust(2 * len(text), b"_"))
+    return base64.b64encode(out.getvalue()).decode()
+
+
+def test_split_for_speech_handles_danda():
+    text = "नमस्ते! संग्रहालय में आपका स्वागत है।आज आप क्या देखना चाहेंगे? यह 3.5 मीटर ऊँची है।"
+    assert split_for_speech(text, "hindi") == [
+        "नमस्ते!",
+        "संग्रहालय में आपका स्वागत है।",
+        "आज आप क्या देखना चाहेंगे?",
+        "यह 3.5 मीटर ऊँची है।",
+    ]
+    long = "This bronze, cast in the tenth century, shows Shiva dancing."
+    assert all(len(piece) <= 30 for piece in split_for_speech(long, "english", max_chars=30))
+
+
+def test_stream_speech_is_ordered_and_capped(service):
+    service.stream_parallel = 2
+    active, peak = 0, 0
+    # the first sentence is the slowest: later ones finish first but must wait
+    delays = {"One.": 0.06, "Two.": 0.01, "Three.": 0.01}
+
+    async def _convert(**kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(delays[kwargs["text"]])
+        active -= 1
+        return SimpleNamespace(audios=[_clip(kwargs["text"])])
+
+    service._async_client.text_to_speech.convert = _convert
+
+    async def _go():
+        return [
+            chunk async for chunk in service.astream_speech("One. Two. Three.", language="english")
+        ]
+
+    chunks = asyncio.get_event_loop().run_until_complete(_go())
+    assert chunks[0][:4] == b"RIFF" and len(chunks[0]) == 44
+    assert [c.rstrip(b"_") for c in chunks[1:]] == [b"One.", b"Two.", b"Three."]
+    assert peak == 2
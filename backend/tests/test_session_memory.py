@@ -0,0 +1,64 @@
+"""tests for bounded per-session conversation memory."""
+import asyncio
+
+from services.session_memory import SESSION_EVICTIONS, SESSIONS_ACTIVE, SessionMemory
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ring_buffer_keeps_last_turns_and_tracks_bytes():
+    mem = SessionMemory(max_turns=2)
+    for i in range(5):
+        mem.append("s", f"user: q{i}", f"assistant: a{i}")
+    assert mem.get("s") == ["user: q3", "assistant: a3", "user: q4", "assistant: a4"]
+    assert mem.total_bytes == sum(len(line) for line in mem.get("s"))
+
+
+def test_idle_sessions_expire_on_access_and_sweep():
+    clock = _Clock()
+    mem = SessionMemory(ttl_s=10, clock=clock)
+    mem.append("old", "user: a")
+    clock.now = 5
+    mem.append("fresh", "user: b")
+    clock.now = 12
+    assert mem.sweep() == 1
+    assert mem.get("old") == []
+    assert mem.get("fresh") == ["user: b"]
+    clock.now = 30
+    assert mem.get("fresh") == []
+    assert len(mem) == 0 and mem.total_bytes == 0
+    assert SESSIONS_ACTIVE.value() == 0
+
+
+def test_memory_cap_evicts_least_recently_used_session():
+    before = SESSION_EVICTIONS.value(reason="memory")
+    mem = SessionMemory(max_bytes=30)
+    mem.append("a", "x" * 10)
+    mem.append("b", "y" * 10)
+    mem.get("a")  # a is now more recent than b
+    mem.append("c", "z" * 15)
+    assert mem.get("b") == []
+    assert mem.get("a") and mem.get("c")
+    assert mem.total_bytes == 25
+    assert SESSION_EVICTIONS.value(reason="memory") == before + 1
+
+
+def test_background_sweeper_runs():
+    clock = _Clock()
+    mem = SessionMemory(ttl_s=1, sweep_interval_s=0.01, clock=clock)
+    mem.append("s", "user: hi")
+    clock.now = 5
+
+    async def _go():
+        mem.start_sweeper()
+        await asyncio.sleep(0.05)
+        await mem.stop_sweeper()
+
+    asyncio.get_event_loop().run_until_complete(_go())
+    assert len(mem) == 0
@@ -0,0 +1,76 @@
+"""tests for the async session stores (in-memory and redis)."""
+import asyncio
+
+import pytest
+
+from services.session_memory import SessionMemory
+from services.session_store import InMemorySessionStore, RedisSessionStore, SessionStore
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def test_in_memory_store_round_trip():
+    store = InMemorySessionStore(SessionMemory(max_turns=2))
+
+    async def _go():
+        for i in range(3):
+            await store.append("s", f"user: q{i}", f"assistant: a{i}")
+        lines = await store.get("s")
+        cleared = await store.clear("s")
+        return lines, cleared, await store.get("s")
+
+    lines, cleared, after = _run(_go())
+    assert lines == ["user: q1", "assistant: a1", "user: q2", "assistant: a2"]
+    assert cleared and after == []
+
+
+def test_incomplete_store_fails_at_construction():
+    class GetOnly(SessionStore):
+        async def get(self, session_id):
+            return []
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+def test_redis_store_trims_turns_and_sets_ttl():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    store = RedisSessionStore(client, max_turns=2, ttl_s=60, prefix="t:")
+
+    async def _go():
+        for i in range(3):
+            await store.append("s", f"user: q{i}", f"assistant: अ{i}")
+        lines = await store.get("s")
+        ttl = await client.ttl("t:s")
+        raw = await client.lrange("t:s", 0, -1)
+        deleted = await store.clear("s")
+        return lines, ttl, raw, deleted, await store.get("s")
+
+    lines, ttl, raw, deleted, after = _run(_go())
+    assert lines == ["user: q1", "assistant: अ1", "user: q2", "assistant: अ2"]
+    assert 0 < ttl <= 60
+    assert raw[0] == '["user: q1","assistant: अ1"]'  # one compact element per turn
+    assert deleted and after == []
+
+
+def test_redis_store_compacts_head_into_summary():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    store = RedisSessionStore(client, max_turns=10, ttl_s=60, prefix="t:")
+
+    async def _go():
+        for i in range(3):
+            await store.append("s", f"user: q{i}", f"assistant: a{i}")
+        stale = await store.compact("s", "nope", ["user: q1", "assistant: a1"])
+        ok = await store.compact(
+            "s", "asked q0 and q1", ["user: q0", "assistant: a0", "user: q1", "assistant: a1"]
+        )
+        return stale, ok, await store.load("s")
+
+    stale, ok, history = _run(_go())
+    assert not stale and ok
+    assert history.summary == "asked q0 and q1"
+    assert history.lines == ["user: q2", "assistant: a2"]
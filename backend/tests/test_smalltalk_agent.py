@@ -0,0 +1,52 @@
+"""tests for the small-talk fast path."""
+import asyncio
+
+import pytest
+
+from agents.smalltalk_agent import FAST_PATH_HITS, SmallTalkAgent
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.delenv("FAST_PATH_DISABLED", raising=False)
+    a = SmallTalkAgent()
+    a.enabled = True
+    return a
+
+
+@pytest.mark.parametrize(
+    "text,intent",
+    [
+        ("Hi!", "greeting"),
+        ("namaste ji", "greeting"),
+        ("नमस्ते", "greeting"),
+        ("Thank you so much", "thanks"),
+        ("bye bye", "goodbye"),
+        ("Tell me about temple architecture", None),
+        ("hi, what is a raga?", None),
+        ("", None),
+    ],
+)
+def test_classify(agent, text, intent):
+    assert agent.classify(text) == intent
+
+
+def test_fast_path_answers_from_templates(agent):
+    before = FAST_PATH_HITS.value(intent="greeting", language="hindi")
+    state = asyncio.get_event_loop().run_until_complete(
+        agent.run({"user_input": "namaste", "language": "hindi"})
+    )
+    assert state["fast_path"] is True
+    assert state["final_response"].startswith("नमस्ते")
+    assert FAST_PATH_HITS.value(intent="greeting", language="hindi") == before + 1
+
+
+def test_unknown_language_falls_back_to_english(agent):
+    assert agent.respond("thanks", "odia").startswith("You're welcome")
+
+
+def test_env_toggle_disables_fast_path(agent, monkeypatch):
+    monkeypatch.setenv("FAST_PATH_DISABLED", "1")
+    state = asyncio.get_event_loop().run_until_complete(agent.run({"user_input": "hello"}))
+    assert state["fast_path"] is False
+    assert "final_response" not in state
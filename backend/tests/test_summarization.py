@@ -0,0 +1,77 @@
+"""tests for background rolling summarization of long sessions."""
+import asyncio
+
+import pytest
+
+from services.session_memory import SessionMemory
+from services.session_store import InMemorySessionStore
+from workflows.chat_workflow import ChatWorkflow
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    for var in ("LLM_OFFLINE", "EMOTION_OFFLINE", "RAG_DISABLED", "FAST_PATH_DISABLED"):
+        monkeypatch.setenv(var, "1")
+
+
+def _workflow(trigger=3, keep=1):
+    config = {
+        "session_memory": {
+            "summary": {"trigger_turns": trigger, "keep_turns": keep, "max_words": 40}
+        }
+    }
+    return ChatWorkflow(store=InMemorySessionStore(SessionMemory(max_turns=50)), config=config)
+
+
+def test_long_session_keeps_bounded_prompt_history(offline):
+    wf = _workflow()
+
+    async def _go():
+        sizes = []
+        for i in range(12):
+            await wf.run("s", f"tell me about exhibit number {i} please")
+            await wf.drain()
+            history = await wf.store.load("s")
+            sizes.append(len(history.lines))
+        return sizes, history
+
+    sizes, history = asyncio.get_event_loop().run_until_complete(_go())
+    # raw history never grows past trigger turns (+ the turn that tripped it)
+    assert max(sizes) <= 2 * 4
+    assert history.lines[-2] == "user: tell me about exhibit number 11 please"
+    assert "exhibit number 8" in history.summary
+    assert len(history.summary.split()) <= 40
+
+
+def test_summary_reaches_the_prompt_context(offline, monkeypatch):
+    wf = _workflow(trigger=1, keep=1)
+    seen = {}
+    original = wf.agent.handle_text
+
+    async def _spy(*args, **kwargs):
+        seen.update(kwargs)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(wf.agent, "handle_text", _spy)
+
+    async def _go():
+        await wf.run("s", "who built the konark sun temple")
+        await wf.run("s", "what about the chariot wheels there")
+        await wf.drain()
+        await wf.run("s", "and when was it built exactly")
+
+    asyncio.get_event_loop().run_until_complete(_go())
+    assert "konark" in seen["summary"]
+    assert seen["history"] == [
+        "user: what about the chariot wheels there",
+        "assistant: [mythic_narrator] what about the chariot wheels there",
+    ]
+
+
+def test_compact_refuses_when_head_changed():
+    mem = SessionMemory()
+    mem.append("s", "user: a", "assistant: b")
+    assert not mem.compact("s", "summary", ["user: x", "assistant: y"])
+    assert mem.compact("s", "summary", ["user: a", "assistant: b"])
+    assert mem.load("s") == ("summary", [])
+    assert mem.total_bytes == len("summary")
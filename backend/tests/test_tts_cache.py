@@ -0,0 +1,72 @@
+"""tests for the content-addressed TTS cache."""
+import asyncio
+import base64
+from types import SimpleNamespace
+
+from config.settings import settings
+from services.sarvam_service import SarvamTTSService
+from services.tts_cache import TTSCache, tts_cache_key
+
+
+def test_key_covers_every_voice_parameter():
+    base = dict(text="namaste", language_code="hi-IN", speaker="anushka", pitch=0.0, pace=1.0)
+    assert tts_cache_key(**base) == tts_cache_key(**dict(reversed(list(base.items()))))
+    assert tts_cache_key(**base) != tts_cache_key(**{**base, "pace": 1.1})
+    assert tts_cache_key(**base) != tts_cache_key(**{**base, "speaker": "rahul"})
+
+
+def test_disk_lru_eviction_and_memory_tier(tmp_path):
+    cache = TTSCache(str(tmp_path), max_disk_bytes=250, max_memory_bytes=250)
+    for name in ("a", "b"):
+        cache.put(name * 64, name.encode() * 100)
+    assert cache.get("a" * 64) == b"a" * 100  # memory hit; "a" is now most recent
+    cache.put("c" * 64, b"c" * 100)  # over 250 bytes: evicts "b"
+    assert not (tmp_path / "bb" / f"{'b' * 64}.wav").exists()
+    assert cache.get("b" * 64) is None
+
+    # a fresh instance (restart) serves from disk and rebuilds the index
+    reopened = TTSCache(str(tmp_path), max_disk_bytes=250, max_memory_bytes=150)
+    assert reopened.get("a" * 64) == b"a" * 100
+    stats = reopened.stats()
+    assert stats["disk_hits"] == 1 and stats["entries"] == 2
+    assert reopened.get("a" * 64) == b"a" * 100
+    assert reopened.stats()["memory_hits"] == 1
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["bytes_saved"] == 100
+
+
+def test_service_synthesizes_repeated_text_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sarvam_api_key", "test-key")
+    service = SarvamTTSService()
+    service.cache = TTSCache(str(tmp_path))
+    calls = []
+
+    async def _convert(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(
+            audios=[base64.b64encode(b"RIFF" + kwargs["text"].encode()).decode()]
+        )
+
+    service._async_client.text_to_speech.convert = _convert
+
+    async def _go():
+        first = await service.asynthesize_text(
+            "welcome to the gallery", language="hindi", speaker="meera"
+        )
+        again = await service.asynthesize_text(
+            "welcome to the gallery", language="hindi", speaker="anushka"
+        )
+        slower = await service.asynthesize_text(
+            "welcome to the gallery", language="hindi", pace=0.8
+        )
+        await service.aclose()
+        return first, again, slower
+
+    first, again, slower = asyncio.get_event_loop().run_until_complete(_go())
+    assert first == again == slower == b"RIFFwelcome to the gallery"
+    # meera is an alias for anushka, so only the pace change misses
+    assert len(calls) == 2
+    assert service.cache.stats()["bytes_saved"] == len(first)
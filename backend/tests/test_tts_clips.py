@@ -0,0 +1,166 @@
+"""tests for manifest-driven TTS precomputation and the clip index."""
+import asyncio
+import base64
+import importlib.util
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from config.settings import settings
+from services.sarvam_service import TTS_LANGUAGES, SarvamTTSService
+from services.tts_clips import ClipLibrary, load_manifest, precompute
+
+MANIFEST = {
+    "defaults": {"languages": ["english", "hindi"], "speakers": ["anushka"], "pace": 0.9},
+    "clips": [
+        {"id": "welcome", "text": "Welcome to the bronze gallery."},
+        {
+            "id": "nataraja",
+            "text": {"english": "Shiva as lord of dance.", "tamil": "நடராஜர்."},
+            "speakers": ["rahul"],
+        },
+        {"id": "everywhere", "text": "Namaste.", "languages": "all"},
+    ],
+}
+
+
+def _manifest(tmp_path):
+    path = tmp_path / "clips.json"
+    path.write_text(json.dumps(MANIFEST, ensure_ascii=False), encoding="utf-8")
+    return load_manifest(str(path), TTS_LANGUAGES)
+
+
+def test_manifest_expands_texts_languages_speakers(tmp_path):
+    jobs = _manifest(tmp_path)
+    slots = {(job.clip_id, job.slot) for job in jobs}
+    assert ("welcome", "hindi/anushka") in slots and ("nataraja", "tamil/rahul") in slots
+    assert len(jobs) == 2 + 2 + len(TTS_LANGUAGES)
+    assert all(job.params == {"pace": 0.9} for job in jobs)
+
+
+def test_precompute_retries_skips_and_indexes(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sarvam_api_key", "test-key")
+    service = SarvamTTSService()
+    service.cache = None
+    jobs = [job for job in _manifest(tmp_path) if job.clip_id != "everywhere"]
+    calls, failures = [], {"Welcome to the bronze gallery.": 1}
+
+    async def _convert(**kwargs):
+        calls.append(kwargs["text"])
+        if failures.get(kwargs["text"]):
+            failures[kwargs["text"]] -= 1
+            raise ConnectionError("sarvam 503")
+        return SimpleNamespace(
+            audios=[base64.b64encode(b"RIFF" + kwargs["text"].encode()).decode()]
+        )
+
+    service._async_client.text_to_speech.convert = _convert
+    library = ClipLibrary(str(tmp_path / "clips"))
+
+    async def _go():
+        first = await precompute(service, library, jobs, concurrency=2, retries=2, backoff_s=0.01)
+        second = await precompute(service, library, jobs)
+        await service.aclose()
+        return first, second
+
+    first, second = asyncio.get_event_loop().run_until_complete(_go())
+    assert (first.synthesized, first.failed) == (4, 0)
+    assert len(calls) == 5  # one retry
+    assert (second.synthesized, second.skipped) == (0, 4)
+    assert len(calls) == 5
+
+    fresh = ClipLibrary(str(tmp_path / "clips"))
+    assert sorted(fresh.clips["nataraja"]) == ["english/rahul", "tamil/rahul"]
+    path = fresh.locate("nataraja", "tamil", None, "wav")
+    assert path.read_bytes() == "RIFFநடராஜர்.".encode()
+    assert fresh.locate("nataraja", "hindi", None, "wav") is None
+    assert fresh.locate("welcome", "english", "anushka", "opus") is None
+
+
+def test_edited_and_removed_clips_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sarvam_api_key", "test-key")
+    service = SarvamTTSService()
+    service.cache = None
+
+    async def _convert(**kwargs):
+        return SimpleNamespace(
+            audios=[base64.b64encode(b"RIFF" + kwargs["text"].encode()).decode()]
+        )
+
+    service._async_client.text_to_speech.convert = _convert
+    library = ClipLibrary(str(tmp_path / "clips"), delete_grace_s=0)
+    jobs = [job for job in _manifest(tmp_path) if job.clip_id == "welcome"]
+    old = library.store.file_path(
+        service.request_key(jobs[0].text, language="english", speaker="anushka", pace=0.9)
+    )
+
+    async def _go():
+        await precompute(service, library, jobs)
+        for job in jobs:
+            job.text = "Welcome to the new bronze gallery."
+        edited = await precompute(service, library, jobs)
+        pruned = await precompute(service, library, jobs[:1], prune=True)
+        await service.aclose()
+        return edited, pruned
+
+    edited, pruned = asyncio.get_event_loop().run_until_complete(_go())
+    assert (edited.synthesized, edited.files_removed) == (2, 2)
+    assert not old.exists()
+    assert (pruned.pruned, pruned.files_removed) == (1, 1)
+    assert sorted(ClipLibrary(str(tmp_path / "clips")).clips["welcome"]) == ["english/anushka"]
+    assert len(library.store.stored()) == 1
+
+
+def test_superseded_files_outlive_the_grace_period(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sarvam_api_key", "test-key")
+    service = SarvamTTSService()
+    service.cache = None
+
+    async def _convert(**kwargs):
+        return SimpleNamespace(
+            audios=[base64.b64encode(b"RIFF" + kwargs["text"].encode()).decode()]
+        )
+
+    service._async_client.text_to_speech.convert = _convert
+    library = ClipLibrary(str(tmp_path / "clips"), delete_grace_s=60)
+    jobs = [job for job in _manifest(tmp_path) if job.clip_id == "welcome"][:1]
+    old = library.store.file_path(
+        service.request_key(jobs[0].text, language="english", speaker="anushka", pace=0.9)
+    )
+
+    async def _go():
+        await precompute(service, library, jobs)
+        jobs[0].text = "Welcome to the new bronze gallery."
+        return await precompute(service, library, jobs)
+
+    edited = asyncio.get_event_loop().run_until_complete(_go())
+    assert edited.files_removed == 0 and old.exists()
+    # the mark is saved with the index, so a later run (another process) deletes it
+    reopened = ClipLibrary(str(tmp_path / "clips"), delete_grace_s=60)
+    assert reopened.remove_unreferenced(now=time.time() + 30) == (0, 0)
+    files, freed = reopened.remove_unreferenced(now=time.time() + 61)
+    assert files == 1 and freed > 0 and not old.exists()
+    asyncio.get_event_loop().run_until_complete(service.aclose())
+
+
+def test_precompute_script_filters_ignore_case(tmp_path, capsys):
+    path = Path(__file__).resolve().parents[1] / "scripts" / "precompute_tts.py"
+    spec = importlib.util.spec_from_file_location("precompute_tts", path)
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+    manifest = tmp_path / "clips.json"
+    manifest.write_text(json.dumps(MANIFEST, ensure_ascii=False), encoding="utf-8")
+
+    args = [
+        str(manifest),
+        "--languages",
+        "Hindi",
+        "--speakers",
+        "ANUSHKA",
+        "--out-dir",
+        str(tmp_path / "out"),
+    ]
+    assert script.main([*args, "--dry-run"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(line.split("\t")[1] for line in lines) == ["hindi/anushka", "hindi/anushka"]
@@ -0,0 +1,89 @@
+"""tests for VectorStore.asearch caching and generation-based invalidation."""
+import asyncio
+import json
+
+import pytest
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    try:
+        from services.vectorstore_service import VectorStore
+    except Exception:
+        pytest.skip("vectorstore service not importable")
+    vs = VectorStore(backend="numpy")
+    vs._generation_check_s = 0.0
+    manifest = tmp_path / "manifest.json"
+    monkeypatch.setattr(vs, "manifest_path", lambda: str(manifest))
+    calls = []
+
+    def _search(query, top_k=10):
+        calls.append((query, top_k))
+        return [f"doc-{len(calls)}"]
+
+    monkeypatch.setattr(vs, "search", _search)
+    vs.calls = calls
+    vs.manifest = manifest
+    return vs
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def test_results_cached_per_normalized_query(store):
+    first = _run(store.asearch("Konark  Temple", top_k=5))
+    second = _run(store.asearch("konark temple", top_k=5))
+    assert first == second == ["doc-1"]
+    assert len(store.calls) == 1
+    _run(store.asearch("konark temple", top_k=3))
+    assert len(store.calls) == 2
+
+
+def test_ingestion_generation_invalidates_cache(store):
+    _run(store.asearch("pongal", top_k=5))
+    store.manifest.write_text(json.dumps({"generation": 7}))
+    assert _run(store.asearch("pongal", top_k=5)) == ["doc-2"]
+    store.bump_generation()
+    assert _run(store.asearch("pongal", top_k=5)) == ["doc-3"]
+
+
+def test_concurrent_identical_queries_share_work(store):
+    async def _both():
+        return await asyncio.gather(store.asearch("bihu", 5), store.asearch("bihu", 5))
+
+    a, b = _run(_both())
+    assert a == b and len(store.calls) == 1
+
+
+def test_manifest_bump_reloads_the_backend(store, monkeypatch):
+    from services.vectorstore_service import VectorStore
+
+    class _Index:
+        loads = refreshes = 0
+
+        def load(self):
+            self.loads += 1
+
+        def refresh(self):
+            self.refreshes += 1
+
+    _run(store.asearch("pongal", top_k=5))
+    store.manifest.write_text(json.dumps({"generation": 3}))
+    assert store.generation[0] == 3 and store._reload_backend and not store._results
+
+    index = _Index()
+    store._vstore = index
+    monkeypatch.setattr(store, "_hybrid_config", lambda: {})
+    monkeypatch.setattr(store, "_search_vector", lambda query, top_k: [])
+    VectorStore.search(store, "pongal")
+    VectorStore.search(store, "pongal")
+    assert (index.loads, index.refreshes) == (1, 1)
+
+
+def test_manifest_is_checked_at_most_every_interval(store):
+    store._generation_check_s = 60.0
+    store.manifest.write_text(json.dumps({"generation": 1}))
+    assert store.generation[0] == 1
+    store.manifest.write_text(json.dumps({"generation": 2, "pad": 1}))
+    assert store.generation[0] == 1
@@ -0,0 +1,184 @@
+"""tests for pipelined voice replies (TTS while the LLM is still generating)."""
+import asyncio
+import time
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from services.session_memory import SessionMemory
+from services.session_store import InMemorySessionStore
+from utils.language_utils import SentenceStream
+from workflows.chat_workflow import ChatWorkflow
+from workflows.voice_pipeline import PipelinedVoiceTurn, SpokenSentence
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def test_sentence_stream_waits_for_sentence_ends():
+    stream = SentenceStream("hindi")
+    fed = [stream.feed(t) for t in ["नमस्ते", "! यह मूर्ति ", "3", ".5 मीटर ऊँची है", "।आप क्या", " देखेंगे?"]]
+    assert fed == [[], ["नमस्ते!"], [], [], ["यह मूर्ति 3.5 मीटर ऊँची है।"], []]
+    assert stream.flush() == ["आप क्या देखेंगे?"]
+
+
+class _StreamingWorkflow:
+    """emits the reply token by token with a delay, like a streaming LLM."""
+
+    def __init__(self, tokens, delay=0.03):
+        self.tokens, self.delay, self.finished_at = tokens, delay, None
+
+    async def run(self, session_id, text, is_voice=False, language=None, on_delta=None):
+        state = {"language": "english"}
+        for token in self.tokens:
+            await asyncio.sleep(self.delay)
+            await on_delta(token, state)
+        self.finished_at = time.perf_counter()
+        state["final_response"] = "".join(self.tokens)
+        return state
+
+
+def test_first_sentence_is_spoken_before_generation_ends():
+    tokens = ["The bronze ", "is old. ", "It shows ", "Shiva. ", "Do you ", "like it?"]
+    workflow = _StreamingWorkflow(tokens)
+    spoken = []
+
+    async def _speak(sentence, language):
+        # the first sentence is the slowest to synthesize; order must hold anyway
+        await asyncio.sleep(0.05 if sentence.startswith("The") else 0.01)
+        spoken.append(language)
+        return sentence.encode()
+
+    async def _go():
+        items = []
+        async for item in PipelinedVoiceTurn(workflow, _speak, "s", "hi", max_parallel=2).run():
+            items.append((time.perf_counter(), item))
+        return items
+
+    items = _run(_go())
+    sentences = [item for _, item in items if isinstance(item, SpokenSentence)]
+    assert [s.audio for s in sentences] == [
+        b"The bronze is old.",
+        b"It shows Shiva.",
+        b"Do you like it?",
+    ]
+    assert [s.seq for s in sentences] == [0, 1, 2]
+    assert items[0][0] < workflow.finished_at  # audio went out mid-generation
+    assert items[-1][1]["final_response"] == "".join(tokens)
+    assert spoken == ["english"] * 3
+
+
+def test_closing_the_stream_cancels_the_turn():
+    workflow = _StreamingWorkflow(["One. "] + ["more "] * 50, delay=0.02)
+
+    async def _speak(sentence, language):
+        return b"x"
+
+    async def _go():
+        run = PipelinedVoiceTurn(workflow, _speak, "s", "hi").run()
+        first = await run.__anext__()
+        await run.aclose()
+        return first
+
+    assert isinstance(_run(_go()), SpokenSentence)
+    assert workflow.finished_at is None
+
+
+def test_agent_streams_llm_tokens(monkeypatch):
+    for var in ("EMOTION_OFFLINE", "RAG_DISABLED", "FAST_PATH_DISABLED"):
+        monkeypatch.setenv(var, "1")
+    monkeypatch.delenv("LLM_OFFLINE", raising=False)
+    wf = ChatWorkflow(store=InMemorySessionStore(SessionMemory()), config={})
+    wf.agent._llm = GenericFakeChatModel(
+        messages=iter([AIMessage(content="Hello there. How are you?")])
+    )
+    deltas = []
+
+    async def _on_delta(delta, state):
+        deltas.append(delta)
+
+    state = _run(wf.run("s", "tell me about bronzes", is_voice=True, on_delta=_on_delta))
+    assert (
+        len(deltas) > 1
+        and "".join(deltas) == state["final_response"] == "Hello there. How are you?"
+    )
+    assert _run(wf.store.load("s")).lines[-1] == "assistant: Hello there. How are you?"
+
+
+def _voice_client(monkeypatch, speak):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    import api.chat as chat
+
+    async def _decode(src):
+        return b""
+
+    async def _transcribe(pcm):
+        return {"text": "tell me about the bronze", "language": "english", "confidence": 0.9}
+
+    monkeypatch.setattr(chat, "decode_to_pcm", _decode)
+    monkeypatch.setattr(chat, "transcribe_audio", _transcribe)
+    monkeypatch.setattr(
+        chat, "chat_workflow", _StreamingWorkflow(["It is old. ", "It shows Shiva."], delay=0)
+    )
+    monkeypatch.setattr(chat, "synthesize_text", speak)
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/api/chat")
+    return TestClient(app)
+
+
+def _post_voice(client, accept):
+    return client.post(
+        "/api/chat/voice",
+        files={"file": ("q.wav", b"RIFF", "audio/wav")},
+        data={"stream": "true"},
+        headers={"Accept": accept},
+    )
+
+
+def test_streamed_voice_route_returns_one_wav(monkeypatch):
+    from utils.audio_processor import WavFormat, split_wav, wav_header
+
+    fmt = WavFormat(channels=1, sample_rate=22050, sample_width=2)
+
+    async def _speak(sentence, language=None, audio_format="wav"):
+        pcm = sentence.encode()[:8].ljust(8, b"\0")
+        return wav_header(fmt, len(pcm)) + pcm
+
+    response = _post_voice(_voice_client(monkeypatch, _speak), "audio/wav")
+    assert response.status_code == 200 and response.headers["content-type"] == "audio/wav"
+    assert response.headers["x-transcript"] == "tell me about the bronze"
+    body_fmt, pcm = split_wav(response.content)
+    assert body_fmt == fmt and pcm == b"It is ol" + b"It shows"
+
+
+def test_streamed_voice_route_without_audio_is_204(monkeypatch):
+    async def _speak(sentence, language=None, audio_format="wav"):
+        raise RuntimeError("tts down")
+
+    response = _post_voice(_voice_client(monkeypatch, _speak), "audio/wav")
+    assert response.status_code == 204 and response.content == b""
+    assert response.headers["x-transcript"] == "tell me about the bronze"
+
+
+def test_streamed_voice_route_honours_compressed_accept(monkeypatch):
+    formats = []
+
+    async def _speak(sentence, language=None, audio_format="wav"):
+        formats.append(audio_format)
+        return b"OggS" + sentence.encode()
+
+    response = _post_voice(_voice_client(monkeypatch, _speak), "audio/ogg")
+    assert response.status_code == 200 and response.headers["content-type"] == "audio/ogg"
+    assert response.content == b"OggSIt is old.OggSIt shows Shiva."
+    assert formats == ["opus", "opus"]
+
+
+def test_voice_route_rejects_unacceptable_accept(monkeypatch):
+    async def _speak(sentence, language=None, audio_format="wav"):
+        raise AssertionError("nothing should be synthesized")
+
+    response = _post_voice(_voice_client(monkeypatch, _speak), "text/html")
+    assert response.status_code == 406
@@ -0,0 +1,137 @@
+"""tests for energy VAD and the streaming voice session."""
+import asyncio
+
+import numpy as np
+
+from utils.vad import EnergyVAD
+from workflows.voice_stream import SAMPLE_RATE, VoiceStreamSession
+
+
+def _tone(seconds, amp=6000):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amp * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+
+
+def _silence(seconds, amp=50, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(0, amp, int(seconds * SAMPLE_RATE)).astype(np.int16)
+
+
+def test_vad_detects_start_and_end_of_speech():
+    vad = EnergyVAD(sample_rate=SAMPLE_RATE, end_silence_ms=300)
+    events = []
+    for chunk in (_silence(0.5), _tone(0.6), _silence(0.2), _silence(0.3, seed=1)):
+        events += vad.process(chunk)
+    assert events == ["start", "end"]
+
+
+class _Workflow:
+    def __init__(self):
+        self.calls = []
+
+    async def run(self, session_id, text, is_voice=False, language=None):
+        self.calls.append((session_id, text, is_voice))
+        return {
+            "final_response": f"reply to {text}",
+            "language": "english",
+            "emotion": {"label": "curious"},
+        }
+
+
+def test_session_sends_partials_then_final_and_reply():
+    sent = []
+    workflow = _Workflow()
+
+    async def _send(msg):
+        sent.append(msg)
+
+    async def _transcribe(audio):
+        await asyncio.sleep(0)
+        return {
+            "text": f"heard {len(audio) // SAMPLE_RATE}s",
+            "language": "english",
+            "confidence": 0.9,
+        }
+
+    async def _synthesize(text, language="english"):
+        return b"RIFFwav"
+
+    async def _go():
+        session = VoiceStreamSession(
+            _send,
+            workflow,
+            _transcribe,
+            synthesize=_synthesize,
+            session_id="ws1",
+            partial_interval_s=0.5,
+            vad=EnergyVAD(sample_rate=SAMPLE_RATE, end_silence_ms=300),
+        )
+        stream = np.concatenate([_silence(0.3), _tone(1.6), _silence(0.6)])
+        for i in range(0, len(stream), 1600):  # 100 ms frames, as a client would send
+            await session.feed(stream[i : i + 1600].tobytes())
+            await asyncio.sleep(0)
+        await session.wait_idle()
+        await session.close()
+
+    asyncio.get_event_loop().run_until_complete(_go())
+    kinds = [m["type"] for m in sent]
+    assert "partial" in kinds
+    assert kinds[-3:] == ["final", "response", "audio"]
+    assert all(k == "partial" for k in kinds[: kinds.index("final")])
+    assert workflow.calls == [("ws1", sent[kinds.index("final")]["text"], True)]
+    assert sent[-2]["text"].startswith("reply to heard")
+
+
+def test_slow_partials_do_not_delay_the_final():
+    sent, partial_lengths = [], []
+    release = asyncio.Event()
+
+    async def _send(msg):
+        sent.append(msg)
+
+    async def _transcribe(audio):
+        return {"text": "final text", "language": "english", "confidence": 0.9}
+
+    async def _partial(audio):
+        partial_lengths.append(len(audio))
+        await release.wait()  # a partial stuck on a busy model
+        return {"text": "late partial"}
+
+    async def _go():
+        session = VoiceStreamSession(
+            _send,
+            _Workflow(),
+            _transcribe,
+            transcribe_partial=_partial,
+            partial_interval_s=0.5,
+            partial_window_s=1.0,
+            vad=EnergyVAD(sample_rate=SAMPLE_RATE, end_silence_ms=300),
+        )
+        stream = np.concatenate([_silence(0.3), _tone(2.5), _silence(0.6)])
+        for i in range(0, len(stream), 1600):
+            await session.feed(stream[i : i + 1600].tobytes())
+            await asyncio.sleep(0)
+        await session.wait_idle()
+        release.set()
+        await session.close()
+
+    asyncio.get_event_loop().run_until_complete(_go())
+    kinds = [m["type"] for m in sent]
+    assert kinds == ["final", "response"]
+    assert partial_lengths and max(partial_lengths) <= SAMPLE_RATE
+
+
+def test_websocket_rejects_non_object_control_frames():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    import api.chat as chat
+
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/api/chat")
+    with TestClient(app).websocket_connect("/api/chat/voice/ws?tts=false") as ws:
+        assert ws.receive_json()["type"] == "ready"
+        for frame in ("[1]", "5", "not json"):
+            ws.send_text(frame)
+            assert ws.receive_json()["type"] == "error"
+        ws.send_text('{"type": "stop"}')
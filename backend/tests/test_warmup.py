@@ -0,0 +1,53 @@
+"""tests for the startup warm-up orchestrator and readiness reporting."""
+import asyncio
+import time
+
+from utils.warmup import WarmupOrchestrator
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def test_components_warm_in_parallel_and_report_state():
+    orch = WarmupOrchestrator(timeout_s=5)
+    orch.register("slow_a", lambda: time.sleep(0.2))
+    orch.register("slow_b", lambda: time.sleep(0.2))
+
+    async def _async_ok():
+        await asyncio.sleep(0.2)
+        return True
+
+    orch.register("async_c", _async_ok, required=True)
+    orch.register("offline", lambda: False)
+    assert not orch.ready
+
+    start = time.perf_counter()
+    _run(orch.run())
+    assert time.perf_counter() - start < 0.5  # concurrent, not 0.6s sequential
+
+    status = orch.status()
+    assert status["ready"] is True
+    comps = status["components"]
+    assert comps["slow_a"]["state"] == "ready"
+    assert comps["async_c"]["state"] == "ready"
+    assert comps["offline"]["state"] == "skipped"
+    assert comps["slow_a"]["duration_ms"] >= 150
+
+
+def test_required_failure_blocks_readiness_optional_does_not():
+    def _boom():
+        raise RuntimeError("no api key")
+
+    orch = WarmupOrchestrator(timeout_s=5)
+    orch.register("optional", _boom)
+    _run(orch.run())
+    assert orch.ready
+    assert "no api key" in orch.components["optional"].error
+
+    orch = WarmupOrchestrator(timeout_s=0.05)
+    orch.register("llm", lambda: time.sleep(0.5), required=True)
+    _run(orch.run())
+    assert not orch.ready
+    assert orch.components["llm"].state == "failed"
+    assert "timed out" in orch.components["llm"].error
@@ -16,3 +16,70 @@ def test_whisper_offline(monkeypatch, tmp_path: Path):
 
     out = asyncio.get_event_loop().run_until_complete(transcribe_audio(str(f)))
     assert set(out.keys()) == {"text", "language", "confidence"}
+
+
+class _Seg:
+    def __init__(self, text, avg_logprob):
+        self.text = text
+        self.avg_logprob = avg_logprob
+
+
+class _Info:
+    language = "hi"
+    language_probability = 0.9
+    duration = 4.0
+    duration_after_vad = 3.0
+
+
+class _FakeModel:
+    def __init__(self):
+        self.kwargs = None
+
+    def transcribe(self, audio, **kwargs):
+        self.kwargs = kwargs
+        return iter([_Seg(" namaste ", -0.1), _Seg("konark mandir", -0.3)]), _Info()
+
+
+def test_transcriber_runs_in_executor_and_reports_rtf():
+    from services.whisper_service import STT_AUDIO_SECONDS, STT_REAL_TIME_FACTOR, WhisperTranscriber
+
+    stt = WhisperTranscriber(model_size="unit", vad_min_silence_ms=300)
+    stt._model = _FakeModel()
+    before = STT_REAL_TIME_FACTOR.count(model="unit")
+
+    out = asyncio.get_event_loop().run_until_complete(stt.transcribe("clip.wav"))
+
+    assert out["text"] == "namaste konark mandir"
+    assert out["language"] == "hindi"
+    assert 0.8 < out["confidence"] < 0.85  # exp(mean avg_logprob)
+    assert out["duration_s"] == 4.0
+    assert stt._model.kwargs["vad_filter"] is True
+    assert stt._model.kwargs["vad_parameters"] == {"min_silence_duration_ms": 300}
+    assert STT_REAL_TIME_FACTOR.count(model="unit") == before + 1
+    assert STT_AUDIO_SECONDS.value(model="unit") >= 4.0
+
+
+def test_partials_are_skipped_when_their_pool_is_busy():
+    import threading
+
+    from services.whisper_service import WhisperTranscriber
+
+    gate = threading.Event()
+
+    class _SlowModel(_FakeModel):
+        def transcribe(self, audio, **kwargs):
+            gate.wait(5)
+            return super().transcribe(audio, **kwargs)
+
+    stt = WhisperTranscriber(model_size="unit", partial_workers=1)
+    stt._model = _SlowModel()
+
+    async def _go():
+        first = asyncio.ensure_future(stt.transcribe_partial("a.wav"))
+        await asyncio.sleep(0.01)
+        skipped = await stt.transcribe_partial("b.wav")
+        gate.set()
+        return await first, skipped
+
+    first, skipped = asyncio.get_event_loop().run_until_complete(_go())
+    assert skipped is None and first["text"] == "namaste konark mandir"
@@ -1,3 +1,3 @@
-"""utility helper modules for audio, language and caching."""
+"""utility helper modules for audio, language, caching and metrics."""
 
-__all__ = ["audio_processor", "language_utils", "cache"]
+__all__ = ["audio_processor", "language_utils", "cache", "metrics"]
@@ -1,30 +1,195 @@
-"""audio file helpers for handling uploads and conversions."""
+"""audio file helpers for handling uploads and conversions.
+
+lowercase: voice uploads are read into a size-capped spooled buffer (memory
+below `spool_bytes`, an anonymous temp file above it that is removed on
+close) and decoded straight to 16 kHz mono float32 PCM for whisper, either by
+piping through ffmpeg's stdin/stdout with an asyncio subprocess or, when no
+ffmpeg binary is installed, in memory with PyAV. nothing is written next to
+the app and nothing outlives the request. the wav helpers at the bottom split
+synthesized clips into format + frames so sentence clips can be streamed or
+joined behind a single header.
+"""
 from pathlib import Path
-from typing import Tuple
-import subprocess
+from typing import Any, BinaryIO, Iterable, NamedTuple, Optional, Tuple
+import asyncio
+import io
 import logging
+import shutil
+import struct
+import tempfile
+import wave
 
 logger = logging.getLogger(__name__)
 
+SAMPLE_RATE = 16000
+_CHUNK = 64 * 1024
+
+
+class WavFormat(NamedTuple):
+    """pcm layout of a wav clip."""
+
+    channels: int
+    sample_width: int
+    sample_rate: int
+
+
+class UploadTooLarge(ValueError):
+    """the upload exceeded the configured byte limit."""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__(f"upload exceeds {limit} bytes")
+        self.limit = limit
 
-def convert_to_wav(input_path: str, output_path: str) -> Tuple[str, int]:
-    """convert an audio file to wav using pydub/ffmpeg; returns (path, duration_ms).
 
-    note: pydub/ffmpeg must be installed in the environment.
+class AudioDecodeError(ValueError):
+    """the upload could not be decoded as audio."""
+
+
+async def read_upload(
+    upload: Any,
+    max_bytes: int,
+    spool_bytes: int = 2 * 2**20,
+    spool_dir: Optional[str] = None,
+) -> tempfile.SpooledTemporaryFile:
+    """copy an UploadFile into a spooled buffer, enforcing `max_bytes`.
+
+    the caller owns the returned file and must close it (that also deletes
+    any spill file). on error the buffer is closed here.
     """
-    # minimal implementation using ffmpeg CLI for portability
-    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        input_path,
-        "-ar",
-        "16000",
-        "-ac",
-        "1",
-        output_path,
-    ]
-    subprocess.run(cmd, check=True)
-    # TODO: compute real duration
-    return output_path, 0
+    if spool_dir:
+        Path(spool_dir).mkdir(parents=True, exist_ok=True)
+    buf = tempfile.SpooledTemporaryFile(max_size=spool_bytes, dir=spool_dir)
+    try:
+        total = 0
+        while True:
+            chunk = await upload.read(_CHUNK)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            buf.write(chunk)
+        buf.seek(0)
+        return buf
+    except BaseException:
+        buf.close()
+        raise
+
+
+def _ffmpeg_cmd(*io: str) -> list:
+    return ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", *io]
+
+
+async def ffmpeg_pipe(src: BinaryIO, args: list) -> bytes:
+    """stream `src` into ffmpeg's stdin and collect stdout; kills ffmpeg on cancel."""
+    proc = await asyncio.create_subprocess_exec(
+        *_ffmpeg_cmd("-i", "pipe:0", *args, "pipe:1"),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def _feed() -> None:
+        try:
+            while True:
+                # a spilled spool is a real file; read it off the event loop
+                chunk = await asyncio.to_thread(src.read, _CHUNK)
+                if not chunk:
+                    break
+                proc.stdin.write(chunk)
+                await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg stopped reading (bad input); stderr says why
+        finally:
+            proc.stdin.close()
+
+    feeder = asyncio.create_task(_feed())
+    try:
+        out, err = await asyncio.gather(proc.stdout.read(), proc.stderr.read())
+        await feeder
+        returncode = await proc.wait()
+    except BaseException:
+        feeder.cancel()
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    if returncode != 0:
+        raise AudioDecodeError(
+            err.decode("utf-8", "replace").strip() or f"ffmpeg exited {returncode}"
+        )
+    return out
+
+
+async def decode_to_pcm(src: BinaryIO, sample_rate: int = SAMPLE_RATE) -> Any:
+    """decode any ffmpeg-readable audio to mono float32 samples at `sample_rate`."""
+    import numpy as np
+
+    if shutil.which("ffmpeg"):
+        raw = await ffmpeg_pipe(
+            src, ["-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(sample_rate)]
+        )
+        return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    try:
+        from faster_whisper.audio import decode_audio
+    except ImportError as exc:
+        raise AudioDecodeError("neither ffmpeg nor PyAV is available to decode audio") from exc
+    try:
+        return await asyncio.to_thread(decode_audio, src, sampling_rate=sample_rate)
+    except Exception as exc:
+        raise AudioDecodeError(f"could not decode audio: {exc}") from exc
+
+
+# sizes in a streamed header are unknown; players read until the stream ends
+_STREAMING_SIZE = 0xFFFFFFFF
+
+
+def split_wav(data: bytes) -> Tuple[WavFormat, bytes]:
+    """parse a PCM wav clip into its format and raw frames."""
+    try:
+        with wave.open(io.BytesIO(data), "rb") as wav:
+            fmt = WavFormat(wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+            return fmt, wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError) as exc:
+        raise AudioDecodeError(f"not a PCM wav clip: {exc}") from exc
+
+
+def wav_header(fmt: WavFormat, data_bytes: Optional[int] = None) -> bytes:
+    """44-byte RIFF header; without `data_bytes` it is for a stream of unknown length."""
+    data_size = _STREAMING_SIZE if data_bytes is None else data_bytes
+    riff_size = _STREAMING_SIZE if data_bytes is None else 36 + data_bytes
+    block_align = fmt.channels * fmt.sample_width
+    return b"".join(
+        [
+            struct.pack("<4sI4s", b"RIFF", riff_size, b"WAVE"),
+            struct.pack(
+                "<4sIHHIIHH",
+                b"fmt ",
+                16,
+                1,  # PCM
+                fmt.channels,
+                fmt.sample_rate,
+                fmt.sample_rate * block_align,
+                block_align,
+                fmt.sample_width * 8,
+            ),
+            struct.pack("<4sI", b"data", data_size),
+        ]
+    )
+
+
+def join_wav(clips: Iterable[bytes]) -> bytes:
+    """concatenate wav clips that share one format into a single clip."""
+    fmt: Optional[WavFormat] = None
+    frames = []
+    for clip in clips:
+        clip_fmt, pcm = split_wav(clip)
+        if fmt is None:
+            fmt = clip_fmt
+        elif clip_fmt != fmt:
+            raise AudioDecodeError(f"wav format mismatch: {clip_fmt} != {fmt}")
+        frames.append(pcm)
+    if fmt is None:
+        raise AudioDecodeError("no clips to join")
+    pcm = b"".join(frames)
+    return wav_header(fmt, len(pcm)) + pcm
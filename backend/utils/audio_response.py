@@ -0,0 +1,192 @@
+"""content negotiation and binary bodies for audio endpoints.
+
+lowercase: JSON with base64 audio stays the default so existing clients keep
+working. a client that sends `Accept: audio/wav` (or audio/ogg for Opus,
+audio/mpeg for MP3) gets the raw clip with its metadata in `X-` headers, and
+`Accept: multipart/mixed` gets a JSON part followed by the audio part. the
+audio bytes are handed to the response as-is (no base64, no joined copy of
+the multipart body).
+"""
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+import json
+import uuid
+
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+
+JSON = "application/json"
+WAV = "audio/wav"
+OGG = "audio/ogg"
+MPEG = "audio/mpeg"
+MULTIPART = "multipart/mixed"
+
+# spellings browsers and players use for the same thing
+_ALIASES = {
+    "audio/x-wav": WAV,
+    "audio/wave": WAV,
+    "audio/vnd.wave": WAV,
+    "audio/opus": OGG,
+    "audio/mp3": MPEG,
+}
+
+# audio media type <-> tts output format
+AUDIO_FORMATS = {WAV: "wav", OGG: "opus", MPEG: "mp3"}
+FORMAT_MEDIA_TYPES = {fmt: media for media, fmt in AUDIO_FORMATS.items()}
+FORMAT_EXTENSIONS = {"wav": "wav", "opus": "ogg", "mp3": "mp3"}
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    ranges = []
+    for item in accept.split(","):
+        parts = [p.strip() for p in item.split(";")]
+        media = _ALIASES.get(parts[0].lower(), parts[0].lower())
+        if not media:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        ranges.append((media, q))
+    return ranges
+
+
+def _quality(offer: str, ranges: List[Tuple[str, float]]) -> float:
+    # the most specific matching range decides: type/subtype > type/* > */*
+    best, specificity = 0.0, -1
+    major = offer.split("/")[0]
+    for media, q in ranges:
+        if media == offer:
+            level = 2
+        elif media == f"{major}/*":
+            level = 1
+        elif media == "*/*":
+            level = 0
+        else:
+            continue
+        if level > specificity:
+            best, specificity = q, level
+    return best
+
+
+def negotiate(accept: Optional[str], offers: Sequence[str]) -> str:
+    """pick the offer the client prefers; ties and a missing header go to the first offer.
+
+    raises a 406 HTTPException when the header rules out every offer.
+    """
+    if not accept:
+        return offers[0]
+    ranges = _parse_accept(accept)
+    if not ranges:
+        return offers[0]
+    chosen, chosen_q = offers[0], 0.0
+    for offer in offers:
+        q = _quality(offer, ranges)
+        if q > chosen_q:
+            chosen, chosen_q = offer, q
+    if chosen_q <= 0.0:
+        raise HTTPException(status_code=406, detail=f"acceptable types: {', '.join(offers)}")
+    return chosen
+
+
+def output_format(wants: str, requested: Optional[str] = None) -> str:
+    """tts format for a negotiated media type; an explicit request field wins."""
+    return requested or AUDIO_FORMATS.get(wants, "wav")
+
+
+def metadata_headers(metadata: Dict[str, object], prefix: str = "X-") -> Dict[str, str]:
+    """metadata as response headers; values are percent-encoded UTF-8 (headers are latin-1)."""
+    headers = {}
+    for key, value in metadata.items():
+        if value is None:
+            continue
+        name = prefix + "-".join(part.capitalize() for part in key.split("_"))
+        headers[name] = quote(str(value), safe=" ,.:;/-_")
+    return headers
+
+
+def audio_response(
+    audio: bytes, metadata: Optional[Dict[str, object]] = None, media_type: str = WAV
+) -> Response:
+    """the raw clip as the body, metadata in headers."""
+    return Response(content=audio, media_type=media_type, headers=metadata_headers(metadata or {}))
+
+
+def multipart_response(
+    metadata: Dict[str, object],
+    audio: Optional[bytes],
+    audio_type: str = WAV,
+    filename: str = "reply.wav",
+) -> StreamingResponse:
+    """multipart/mixed: a JSON part with `metadata`, then the audio part (if any)."""
+    boundary = uuid.uuid4().hex
+    meta = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+    chunks: List[bytes] = [
+        f"--{boundary}\r\nContent-Type: {JSON}; charset=utf-8\r\n"
+        f"Content-Disposition: inline; name=\"metadata\"\r\n\r\n".encode("ascii"),
+        meta,
+    ]
+    if audio is not None:
+        chunks += [
+            f"\r\n--{boundary}\r\nContent-Type: {audio_type}\r\n"
+            f"Content-Disposition: attachment; name=\"audio\"; filename=\"{filename}\"\r\n"
+            f"Content-Length: {len(audio)}\r\n\r\n".encode("ascii"),
+            audio,
+        ]
+    chunks.append(f"\r\n--{boundary}--\r\n".encode("ascii"))
+    return StreamingResponse(
+        _iterate(chunks),
+        media_type=f"{MULTIPART}; boundary={boundary}",
+        headers={"Content-Length": str(sum(len(c) for c in chunks))},
+    )
+
+
+def multipart_part(
+    content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None
+) -> Tuple[bytes, bytes]:
+    """(part head, body) for `streaming_multipart_response`; the boundary is added there."""
+    lines = [f"Content-Type: {content_type}", f"Content-Length: {len(body)}"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"), body
+
+
+def streaming_multipart_response(parts: AsyncIterator[Tuple[bytes, bytes]]) -> StreamingResponse:
+    """multipart/mixed written part by part as `parts` produces them (no Content-Length)."""
+    boundary = uuid.uuid4().hex
+
+    async def _body():
+        async for head, body in parts:
+            yield f"--{boundary}\r\n".encode("ascii") + head
+            yield body
+            yield b"\r\n"
+        yield f"--{boundary}--\r\n".encode("ascii")
+
+    return StreamingResponse(_body(), media_type=f"{MULTIPART}; boundary={boundary}")
+
+
+def _iterate(chunks: Iterable[bytes]):
+    # each part is sent as its own write, so the audio is never joined into a new buffer
+    for chunk in chunks:
+        yield chunk
+
+
+__all__ = [
+    "JSON",
+    "WAV",
+    "OGG",
+    "MPEG",
+    "MULTIPART",
+    "AUDIO_FORMATS",
+    "FORMAT_MEDIA_TYPES",
+    "FORMAT_EXTENSIONS",
+    "negotiate",
+    "output_format",
+    "metadata_headers",
+    "audio_response",
+    "multipart_response",
+    "multipart_part",
+    "streaming_multipart_response",
+]
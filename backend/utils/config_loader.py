@@ -13,6 +13,13 @@ def _project_root() -> Path:
 	return Path(__file__).resolve().parents[1]
 
 
+def resolve_project_path(path: str) -> str:
+	"""absolute paths as given; relative ones are taken from the backend root."""
+	if os.path.isabs(path):
+		return path
+	return str(_project_root() / path)
+
+
 def load_config(config_path: Optional[str] = None) -> dict:
 	"""load YAML config with robust path resolution.
 
@@ -34,4 +41,4 @@ def load_config(config_path: Optional[str] = None) -> dict:
 		return yaml.safe_load(f) or {}
 
 
-__all__ = ["load_config"]
+__all__ = ["load_config", "resolve_project_path"]
@@ -0,0 +1,81 @@
+"""cancel in-flight work when the HTTP client goes away.
+
+lowercase: runs a handler's coroutine as a task and polls the request for a
+disconnect; if the client has left, the task (and every agent call or
+outbound HTTP request awaited inside it) is cancelled and ClientDisconnected
+is raised so the app can answer with status 499.
+"""
+from typing import Any, Awaitable, Protocol, TypeVar
+import asyncio
+import logging
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# nginx convention for "client closed request"
+CLIENT_CLOSED_REQUEST = 499
+
+REQUESTS_CANCELLED = REGISTRY.counter(
+    "supermuseum_requests_cancelled_total",
+    "Requests whose downstream work was cancelled because the client disconnected.",
+    ["route"],
+)
+
+
+class ClientDisconnected(Exception):
+    """raised when the client disconnected before the response was ready."""
+
+    def __init__(self, route: str) -> None:
+        super().__init__(f"client disconnected during {route}")
+        self.route = route
+
+
+class _SupportsDisconnect(Protocol):
+    async def is_disconnected(self) -> bool: ...
+
+
+async def cancel_on_disconnect(
+    request: _SupportsDisconnect,
+    awaitable: Awaitable[T],
+    route: str,
+    poll_interval: float = 0.2,
+) -> T:
+    """await `awaitable`, cancelling it if the client disconnects first.
+
+    args:
+        request: starlette Request (anything with async is_disconnected())
+        awaitable: the handler work to run
+        route: label used for logging and the cancellation counter
+        poll_interval: seconds between disconnect checks
+
+    raises: ClientDisconnected if the client went away
+    """
+    task: "asyncio.Task[Any]" = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                break
+    except BaseException:
+        # the handler itself was cancelled (e.g. server shutdown): stop the work too
+        task.cancel()
+        raise
+
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    except Exception as exc:  # pragma: no cover - work failed while being cancelled
+        logger.debug("cancelled %s raised during cancellation: %s", route, exc)
+    REQUESTS_CANCELLED.inc(route=route)
+    logger.info("client disconnected: cancelled in-flight work for %s", route)
+    raise ClientDisconnected(route)
+
+
+__all__ = ["ClientDisconnected", "CLIENT_CLOSED_REQUEST", "cancel_on_disconnect"]
@@ -0,0 +1,202 @@
+"""bounded LRU cache for query embeddings with optional sqlite persistence.
+
+lowercase: wraps any LangChain-style embeddings object (embed_query /
+embed_documents). repeated exhibit questions are served from memory, or from
+an on-disk sqlite table across restarts, instead of calling the remote model.
+with cache_documents=True, document embeddings are also kept on disk (not in
+the memory LRU) so re-seeding unchanged text costs no model calls. queries and
+documents live in separate sqlite tables capped at `max_disk_entries` and
+`max_disk_documents` rows, so a large corpus can't push out cached queries;
+the oldest writes go first. a batch of documents is one transaction.
+keys only collapse whitespace: casing is part of what the model embeds.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_HITS = REGISTRY.counter(
+    "supermuseum_embedding_cache_hits_total",
+    "Query embeddings served from cache (each hit is one embedding call saved).",
+    ["tier"],
+)
+EMBEDDING_CACHE_MISSES = REGISTRY.counter(
+    "supermuseum_embedding_cache_misses_total",
+    "Query embeddings that required a call to the embedding model.",
+)
+
+
+def _normalize_query(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+class CachedEmbeddings:
+    """LangChain-compatible embeddings wrapper with a query-embedding LRU.
+
+    usage:
+        emb = CachedEmbeddings(GoogleGenerativeAIEmbeddings(...), namespace="text-embedding-004")
+        vec = emb.embed_query("who built the sun temple?")
+    """
+
+    def __init__(
+        self,
+        base: Any,
+        namespace: str = "",
+        max_entries: int = 2048,
+        persist_path: Optional[str] = None,
+        cache_documents: bool = False,
+        max_disk_entries: int = 50_000,
+        max_disk_documents: int = 200_000,
+    ) -> None:
+        self.base = base
+        self.cache_documents = cache_documents
+        self.namespace = namespace
+        self.max_entries = max(1, int(max_entries))
+        self.max_disk_entries = max(1, int(max_disk_entries))
+        self.max_disk_documents = max(1, int(max_disk_documents))
+        self._lru: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if persist_path:
+            self._open_db(persist_path)
+
+    def _open_db(self, persist_path: str) -> None:
+        try:
+            path = Path(persist_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            for table in ("query_embeddings", "document_embeddings"):
+                self._db.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+                )
+            self._db.commit()
+            logger.info("embedding cache persisted at %s", path)
+        except sqlite3.Error as exc:
+            logger.warning("embedding cache persistence disabled (%s): %s", persist_path, exc)
+            self._db = None
+
+    def _key(self, text: str) -> str:
+        raw = f"{self.namespace}\x00{_normalize_query(text)}".encode("utf-8")
+        return hashlib.sha1(raw).hexdigest()
+
+    def _remember(self, key: str, vec: List[float]) -> None:
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def _disk_get(self, key: str, table: str = "query_embeddings") -> Optional[List[float]]:
+        if self._db is None:
+            return None
+        row = self._db.execute(f"SELECT vec FROM {table} WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        return array("f", row[0]).tolist()
+
+    def _disk_put(
+        self, rows: List[Tuple[str, List[float]]], table: str = "query_embeddings"
+    ) -> None:
+        """write rows in one transaction, then trim the table to its cap."""
+        if self._db is None or not rows:
+            return
+        cap = self.max_disk_documents if table == "document_embeddings" else self.max_disk_entries
+        try:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {table} (key, vec) VALUES (?, ?)",
+                [(key, array("f", vec).tobytes()) for key, vec in rows],
+            )
+            # a replace gets a fresh rowid, so rowid order is write order; keeping
+            # only the newest `cap` rowids bounds the table
+            self._db.execute(
+                f"DELETE FROM {table} WHERE rowid <= (SELECT MAX(rowid) FROM {table}) - ?", (cap,)
+            )
+            self._db.commit()
+        except sqlite3.Error as exc:  # pragma: no cover - disk full / locked
+            logger.debug("embedding cache write failed: %s", exc)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        with self._lock:
+            vec = self._lru.get(key)
+            if vec is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                EMBEDDING_CACHE_HITS.inc(tier="memory")
+                return list(vec)
+            vec = self._disk_get(key)
+            if vec is not None:
+                self._remember(key, vec)
+                self.disk_hits += 1
+                EMBEDDING_CACHE_HITS.inc(tier="disk")
+                return list(vec)
+        vec = list(self.base.embed_query(text))
+        with self._lock:
+            self.misses += 1
+            EMBEDDING_CACHE_MISSES.inc()
+            self._remember(key, vec)
+            self._disk_put([(key, vec)])
+        return list(vec)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await asyncio.to_thread(self.embed_query, text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not self.cache_documents or self._db is None:
+            return self.base.embed_documents(texts)
+        keys = [self._key(t) for t in texts]
+        out: List[Optional[List[float]]] = [None] * len(texts)
+        with self._lock:
+            for i, key in enumerate(keys):
+                out[i] = self._disk_get(key, "document_embeddings")
+        missing = [i for i, vec in enumerate(out) if vec is None]
+        if len(missing) < len(texts):
+            EMBEDDING_CACHE_HITS.inc(len(texts) - len(missing), tier="disk")
+        if missing:
+            vecs = self.base.embed_documents([texts[i] for i in missing])
+            with self._lock:
+                EMBEDDING_CACHE_MISSES.inc(len(missing))
+                for i, vec in zip(missing, vecs):
+                    out[i] = list(vec)
+                self._disk_put([(keys[i], out[i]) for i in missing], "document_embeddings")
+        return out  # type: ignore[return-value]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    def stats(self) -> Dict[str, float]:
+        """return hit/miss counts and the fraction of embedding calls saved."""
+        saved = self.hits + self.disk_hits
+        total = saved + self.misses
+        return {
+            "entries": len(self._lru),
+            "memory_hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "calls_saved_ratio": (saved / total) if total else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __getattr__(self, name: str) -> Any:
+        # delegate anything else (model name, client, ...) to the wrapped object
+        if name == "base":
+            raise AttributeError(name)
+        return getattr(self.base, name)
+
+
+__all__ = ["CachedEmbeddings"]
@@ -2,8 +2,9 @@
 
 lowercase: minimal detection using langdetect or heuristics.
 """
-from typing import Optional
+from typing import List, Optional
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -25,3 +26,103 @@ def detect_language(text: str) -> str:
     if any(w in low for w in ["namaste", "dhanyavaad", "bhai"]):
         return "hinglish"
     return "english"
+
+
+# sentence-ending marks per language: the devanagari danda / double danda
+# (also used by bengali, odia and gurmukhi) and the urdu full stop; latin
+# punctuation is accepted everywhere since replies mix scripts
+_SENTENCE_ENDS = {
+    "hindi": "।॥.!?",
+    "marathi": "।॥.!?",
+    "bengali": "।॥.!?",
+    "odia": "।॥.!?",
+    "punjabi": "।॥.!?",
+    "urdu": "۔؟.!?",
+}
+_DEFAULT_ENDS = ".!?।॥"
+# marks that end a sentence even without a following space ("है।आप")
+_TIGHT_ENDS = "।॥۔"
+_CLAUSE_RE = re.compile(r"(?<=[,;:،])\s+")
+
+
+def _boundary(language: str) -> "re.Pattern[str]":
+    ends = _SENTENCE_ENDS.get((language or "").lower(), _DEFAULT_ENDS)
+    tight = "".join(c for c in ends if c in _TIGHT_ENDS)
+    pattern = rf"(?<=[{re.escape(ends)}])\s+"
+    if tight:
+        pattern += rf"|(?<=[{re.escape(tight)}])(?=\S)"
+    return re.compile(pattern)
+
+
+def split_for_speech(text: str, language: str = "english", max_chars: int = 400) -> List[str]:
+    """split text into sentences for chunked TTS, in order.
+
+    sentences longer than `max_chars` are broken at clause marks and then at
+    word boundaries, so no chunk exceeds the limit unless a single word does.
+    pieces without any letters or digits (stray punctuation) are dropped.
+    """
+    sentences = _boundary(language).split(" ".join((text or "").split()))
+    chunks: List[str] = []
+    for sentence in sentences:
+        for piece in _fit(sentence.strip(), max_chars):
+            if any(ch.isalnum() for ch in piece):
+                chunks.append(piece)
+    return chunks
+
+
+def _fit(sentence: str, max_chars: int) -> List[str]:
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces: List[str] = []
+    current = ""
+    for part in _CLAUSE_RE.split(sentence):
+        for word in part.split(" ") if len(part) > max_chars else [part]:
+            if current and len(current) + 1 + len(word) > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+class SentenceStream:
+    """split_for_speech for text that arrives in pieces (LLM tokens).
+
+    usage:
+        stream = SentenceStream("hindi")
+        for token in tokens:
+            for sentence in stream.feed(token):
+                speak(sentence)
+        for sentence in stream.flush():
+            speak(sentence)
+    """
+
+    def __init__(self, language: str = "english", max_chars: int = 400) -> None:
+        self.language = language
+        self.max_chars = max_chars
+        self._boundary = _boundary(language)
+        self._buffer = ""
+
+    def feed(self, delta: str) -> List[str]:
+        """add text; return the sentences it completed, in order."""
+        self._buffer += delta
+        last = None
+        for last in self._boundary.finditer(self._buffer):
+            pass
+        if last is not None:
+            done, self._buffer = self._buffer[: last.start()], self._buffer[last.end() :]
+            return split_for_speech(done, self.language, self.max_chars)
+        if len(self._buffer) > self.max_chars:
+            # no sentence end in sight: release what fits at a word boundary
+            cut = self._buffer.rfind(" ", 0, self.max_chars)
+            if cut > 0:
+                done, self._buffer = self._buffer[:cut], self._buffer[cut + 1 :]
+                return split_for_speech(done, self.language, self.max_chars)
+        return []
+
+    def flush(self) -> List[str]:
+        """the text after the last sentence end (end of stream)."""
+        rest, self._buffer = self._buffer, ""
+        return split_for_speech(rest, self.language, self.max_chars)
@@ -0,0 +1,110 @@
+"""on-box sentence embeddings with transformers on CPU.
+
+lowercase: mean-pooled, L2-normalized embeddings from a small sentence model
+(all-MiniLM-L6-v2 by default) so retrieval and seeding need no network round
+trip. exposes the LangChain embeddings interface (embed_query /
+embed_documents) and batches inputs, sorting by length to minimise padding.
+"""
+from typing import Any, List, Optional
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCAL_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class LocalEmbeddings:
+    """CPU sentence-embedding model loaded lazily on first use.
+
+    usage:
+        emb = LocalEmbeddings(batch_size=64)
+        vecs = emb.embed_documents(["konark sun temple", "raga yaman"])
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_LOCAL_MODEL,
+        batch_size: int = 32,
+        max_length: int = 256,
+        num_threads: int = 0,
+        cache_dir: Optional[str] = None,
+        device: str = "cpu",
+    ) -> None:
+        self.model_name = model_name
+        self.batch_size = max(1, int(batch_size))
+        self.max_length = int(max_length)
+        self.num_threads = int(num_threads)
+        self.cache_dir = cache_dir
+        self.device = device
+        self._tokenizer: Any = None
+        self._model: Any = None
+        self._lock = threading.Lock()
+
+    def _ensure_model(self) -> None:
+        if self._model is not None:
+            return
+        with self._lock:
+            if self._model is not None:
+                return
+            import torch
+            from transformers import AutoModel, AutoTokenizer
+
+            if self.num_threads > 0:
+                torch.set_num_threads(self.num_threads)
+            logger.info("loading local embedding model: %s (%s)", self.model_name, self.device)
+            self._tokenizer = AutoTokenizer.from_pretrained(
+                self.model_name, cache_dir=self.cache_dir
+            )
+            model = AutoModel.from_pretrained(self.model_name, cache_dir=self.cache_dir)
+            model.to(self.device)
+            model.eval()
+            self._model = model
+
+    def warmup(self) -> None:
+        """load weights and run one tiny forward pass."""
+        self.embed_documents(["warmup"])
+
+    def _encode_batch(self, batch: List[str]) -> List[List[float]]:
+        import torch
+
+        enc = self._tokenizer(
+            batch,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="pt",
+        ).to(self.device)
+        with torch.inference_mode():
+            hidden = self._model(**enc).last_hidden_state
+            mask = enc["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+        return pooled.cpu().tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        self._ensure_model()
+        # similar lengths in the same batch means less padding work
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        out: List[Optional[List[float]]] = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            idx = order[start : start + self.batch_size]
+            vecs = self._encode_batch([texts[i] for i in idx])
+            for i, vec in zip(idx, vecs):
+                out[i] = vec
+        return out  # type: ignore[return-value]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await asyncio.to_thread(self.embed_query, text)
+
+
+__all__ = ["LocalEmbeddings", "DEFAULT_LOCAL_MODEL"]
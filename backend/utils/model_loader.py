@@ -11,7 +11,7 @@ import asyncio
 import logging
 from typing import Any
 
-from utils.config_loader import load_config
+from utils.config_loader import load_config, resolve_project_path
 
 logger = logging.getLogger(__name__)
 
@@ -69,8 +69,20 @@ class ModelLoader:
         self.config = load_config()
         logger.info("yaml config loaded: %s", list(self.config.keys()))
 
+    def embedding_identity(self) -> str:
+        """return "<provider>:<model>" for the configured embedding model."""
+        block = self.config.get("embedding_model", {}) or {}
+        provider = block.get("provider", "google")
+        if provider == "local":
+            from utils.local_embeddings import DEFAULT_LOCAL_MODEL
+
+            return f"local:{(block.get('local') or {}).get('model_name', DEFAULT_LOCAL_MODEL)}"
+        return f"{provider}:{block.get('model_name', '')}"
+
     def load_embeddings(self):
-        """load embedding model (google text-embedding-004)."""
+        """load embedding model (google text-embedding-004 or a local CPU model)."""
+        if (self.config.get("embedding_model", {}) or {}).get("provider") == "local":
+            return self._load_local_embeddings()
         try:
             model_name = self.config["embedding_model"]["model_name"]
             logger.info("loading embedding model: %s", model_name)
@@ -91,6 +103,28 @@ class ModelLoader:
             logger.error("failed to load embedding model: %s", e)
             raise ProductAssistantException("failed to load embedding model") from e
 
+    def _load_local_embeddings(self):
+        """load the on-box sentence-embedding model configured under embedding_model.local."""
+        try:
+            from utils.local_embeddings import DEFAULT_LOCAL_MODEL, LocalEmbeddings
+
+            local_cfg = self.config["embedding_model"].get("local", {}) or {}
+            cache_dir = local_cfg.get("cache_dir") or None
+            if cache_dir:
+                cache_dir = resolve_project_path(cache_dir)
+            model_name = local_cfg.get("model_name", DEFAULT_LOCAL_MODEL)
+            logger.info("loading local embedding model: %s", model_name)
+            return LocalEmbeddings(
+                model_name=model_name,
+                batch_size=local_cfg.get("batch_size", 32),
+                max_length=local_cfg.get("max_length", 256),
+                num_threads=local_cfg.get("num_threads", 0),
+                cache_dir=cache_dir,
+            )
+        except Exception as e:  # pragma: no cover - external deps
+            logger.error("failed to load local embedding model: %s", e)
+            raise ProductAssistantException("failed to load embedding model") from e
+
     def load_llm(self):
         """load configured LLM provider (google genai or groq)."""
         llm_block = self.config["llm"]
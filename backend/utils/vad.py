@@ -0,0 +1,86 @@
+"""energy-based voice activity / end-of-speech detection for streamed PCM.
+
+lowercase: cheap enough to run on every incoming chunk. audio is cut into
+fixed frames; a frame counts as speech when its RMS is well above a running
+noise-floor estimate. speech "start" needs `min_speech_ms` of consecutive
+voiced frames and "end" needs `end_silence_ms` of consecutive quiet ones.
+"""
+from typing import List
+import math
+
+import numpy as np
+
+
+class EnergyVAD:
+    """streaming start/end-of-speech detector over int16 mono PCM.
+
+    usage:
+        vad = EnergyVAD(sample_rate=16000)
+        for event in vad.process(samples):  # "start" / "end"
+            ...
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 30,
+        start_ratio: float = 3.0,
+        min_rms: float = 300.0,
+        min_speech_ms: int = 150,
+        end_silence_ms: int = 700,
+    ) -> None:
+        self.frame_len = max(1, sample_rate * frame_ms // 1000)
+        self.frame_ms = frame_ms
+        self.start_ratio = start_ratio
+        self.min_rms = min_rms
+        self.min_speech_frames = max(1, math.ceil(min_speech_ms / frame_ms))
+        self.end_silence_frames = max(1, math.ceil(end_silence_ms / frame_ms))
+        self.noise_floor = min_rms / start_ratio
+        self.in_speech = False
+        self._voiced_run = 0
+        self._silent_run = 0
+        self._rest = np.zeros(0, dtype=np.int16)
+
+    def reset(self) -> None:
+        """forget speech state (keeps the noise estimate)."""
+        self.in_speech = False
+        self._voiced_run = 0
+        self._silent_run = 0
+
+    @property
+    def threshold(self) -> float:
+        return max(self.min_rms, self.noise_floor * self.start_ratio)
+
+    def process(self, samples: np.ndarray) -> List[str]:
+        """feed samples; return the events they trigger, in order."""
+        data = np.concatenate([self._rest, samples.astype(np.int16, copy=False)])
+        n_frames = len(data) // self.frame_len
+        self._rest = data[n_frames * self.frame_len :]
+        if not n_frames:
+            return []
+        frames = (
+            data[: n_frames * self.frame_len].reshape(n_frames, self.frame_len).astype(np.float32)
+        )
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        events: List[str] = []
+        for value in rms:
+            voiced = value > self.threshold
+            if not voiced and not self.in_speech:
+                # track the background level only while nobody is talking
+                self.noise_floor = 0.95 * self.noise_floor + 0.05 * float(value)
+            if voiced:
+                self._voiced_run += 1
+                self._silent_run = 0
+            else:
+                self._silent_run += 1
+                self._voiced_run = 0
+            if not self.in_speech and self._voiced_run >= self.min_speech_frames:
+                self.in_speech = True
+                events.append("start")
+            elif self.in_speech and self._silent_run >= self.end_silence_frames:
+                self.in_speech = False
+                events.append("end")
+        return events
+
+
+__all__ = ["EnergyVAD"]
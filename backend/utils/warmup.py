@@ -0,0 +1,208 @@
+"""startup warm-up orchestrator for slow-to-initialize components.
+
+lowercase: the emotion model, whisper model, vector store, LLM client,
+Sarvam client and Saavn connection pool used to be created on the first visitor's request.
+the orchestrator initializes them concurrently at startup, times each one
+and keeps a per-component state that `/api/ready` reports.
+
+a component callable may be sync (run in a worker thread) or async. it
+returns False when there is nothing to warm (offline mode, feature off),
+which is recorded as "skipped"; raising marks it "failed". only failures
+of `required` components make the service not ready.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+from dataclasses import dataclass
+import asyncio
+import inspect
+import logging
+import os
+import time
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+WarmupFn = Callable[[], Union[Optional[bool], Awaitable[Optional[bool]]]]
+
+WARMUP_SECONDS = REGISTRY.gauge(
+    "supermuseum_warmup_seconds",
+    "Time spent initializing each component at startup.",
+    ["component", "state"],
+)
+
+
+@dataclass
+class ComponentStatus:
+    """warm-up progress of one component."""
+
+    name: str
+    required: bool = False
+    state: str = "pending"  # pending | warming | ready | skipped | failed
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "required": self.required,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+        }
+
+
+class WarmupOrchestrator:
+    """run registered warm-up callables in parallel and track their state.
+
+    usage:
+        warmup = WarmupOrchestrator(timeout_s=60)
+        warmup.register("llm", agent.warmup, required=True)
+        await warmup.run()
+        warmup.ready  # True once done and no required component failed
+    """
+
+    def __init__(self, timeout_s: float = 60.0) -> None:
+        self.timeout_s = timeout_s
+        self._fns: Dict[str, WarmupFn] = {}
+        self.components: Dict[str, ComponentStatus] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def register(self, name: str, fn: WarmupFn, required: bool = False) -> None:
+        self._fns[name] = fn
+        self.components[name] = ComponentStatus(name=name, required=required)
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def ready(self) -> bool:
+        return self.done and not any(
+            c.required and c.state == "failed" for c in self.components.values()
+        )
+
+    async def _call(self, fn: WarmupFn) -> Optional[bool]:
+        if inspect.iscoroutinefunction(fn):
+            return await fn()
+        result = await asyncio.to_thread(fn)
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    async def _warm(self, name: str) -> None:
+        status = self.components[name]
+        status.state = "warming"
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self._call(self._fns[name]), timeout=self.timeout_s)
+            status.state = "skipped" if result is False else "ready"
+        except asyncio.TimeoutError:
+            status.state, status.error = "failed", f"timed out after {self.timeout_s:g}s"
+        except Exception as exc:
+            status.state, status.error = "failed", f"{type(exc).__name__}: {exc}"
+        status.duration_ms = round((time.perf_counter() - start) * 1000.0, 1)
+        WARMUP_SECONDS.set(status.duration_ms / 1000.0, component=name, state=status.state)
+        log = logger.warning if status.state == "failed" else logger.info
+        log(
+            "warmup %s: %s in %.0f ms%s",
+            name,
+            status.state,
+            status.duration_ms,
+            f" ({status.error})" if status.error else "",
+        )
+
+    async def run(self) -> Dict[str, ComponentStatus]:
+        """warm every registered component concurrently; never raises."""
+        self.started_at = time.time()
+        await asyncio.gather(*(self._warm(name) for name in self._fns))
+        self.finished_at = time.time()
+        logger.info("warmup finished: ready=%s", self.ready)
+        return self.components
+
+    def skip_all(self) -> None:
+        """mark everything skipped (warm-up disabled): components load lazily."""
+        self.started_at = self.finished_at = time.time()
+        for status in self.components.values():
+            status.state = "skipped"
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "done": self.done,
+            "duration_ms": (
+                round((self.finished_at - self.started_at) * 1000.0, 1)
+                if self.finished_at and self.started_at
+                else None
+            ),
+            "components": {name: c.as_dict() for name, c in self.components.items()},
+        }
+
+
+def _rag_enabled(config: Dict[str, Any]) -> bool:
+    if os.getenv("RAG_DISABLED") == "1" or os.getenv("RETRIEVAL_OFFLINE") == "1":
+        return False
+    return bool((config.get("rag", {}) or {}).get("enabled", True))
+
+
+def build_default_warmup(config: Optional[Dict[str, Any]] = None) -> WarmupOrchestrator:
+    """register the backend's standard components (imports are deferred)."""
+    if config is None:
+        from utils.config_loader import load_config
+
+        config = load_config()
+    cfg = config.get("warmup", {}) or {}
+    orchestrator = WarmupOrchestrator(timeout_s=float(cfg.get("timeout_s", 60)))
+
+    def emotion() -> bool:
+        from services import emotion_service
+
+        return emotion_service.warmup()
+
+    def whisper() -> bool:
+        from services import whisper_service
+
+        return whisper_service.warmup()
+
+    def vectorstore() -> bool:
+        if not _rag_enabled(config):
+            return False
+        from services.vectorstore_service import vectorstore as store
+
+        return store.warmup()
+
+    def llm() -> bool:
+        from workflows.chat_workflow import chat_workflow
+
+        return chat_workflow.agent.warmup()
+
+    def sarvam() -> bool:
+        from services import sarvam_service
+
+        return sarvam_service.warmup()
+
+    async def saavn() -> bool:
+        from services.saavn_service import saavn_client
+
+        return await saavn_client.warmup()
+
+    orchestrator.register("emotion_model", emotion)
+    orchestrator.register("whisper", whisper)
+    orchestrator.register("vectorstore", vectorstore)
+    orchestrator.register("llm", llm, required=True)
+    orchestrator.register("sarvam", sarvam)
+    orchestrator.register("saavn", saavn)
+    return orchestrator
+
+
+def warmup_enabled(config: Dict[str, Any]) -> bool:
+    if os.getenv("WARMUP_DISABLED") == "1":
+        return False
+    return bool((config.get("warmup", {}) or {}).get("enabled", True))
+
+
+__all__ = [
+    "ComponentStatus",
+    "WarmupOrchestrator",
+    "build_default_warmup",
+    "warmup_enabled",
+]
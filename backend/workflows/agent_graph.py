@@ -0,0 +1,98 @@
+"""small dependency-graph executor for agents.
+
+lowercase: wires agents by their declared `reads`/`writes` state keys and runs
+every agent as soon as the agents it depends on have finished, so independent
+agents execute concurrently. each node works on a snapshot of the state and
+only its declared `writes` are merged back, which keeps concurrent nodes from
+clobbering each other. per-node wall time is recorded in milliseconds.
+"""
+from typing import Any, Dict, List, Sequence, Set, Tuple
+import asyncio
+import logging
+import time
+
+from agents.base_agent import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+
+class AgentGraph:
+    """execute agents as a DAG derived from their state-key declarations.
+
+    an agent depends on every earlier-registered agent that writes a key it
+    reads. registration order therefore breaks ties and guarantees the graph
+    is acyclic.
+
+    usage:
+        graph = AgentGraph([EmotionAgent(), LanguageRouterAgent(), ToneAdapterAgent()])
+        state, timings = await graph.run({"user_input": "hello"})
+    """
+
+    def __init__(self, agents: Sequence[BaseAgent]) -> None:
+        self.agents: List[BaseAgent] = list(agents)
+        names = [a.name for a in self.agents]
+        if len(set(names)) != len(names):
+            raise ValueError(f"duplicate agent names in graph: {names}")
+        self.dependencies: Dict[str, Set[str]] = self._build_dependencies()
+
+    def _build_dependencies(self) -> Dict[str, Set[str]]:
+        deps: Dict[str, Set[str]] = {}
+        for i, agent in enumerate(self.agents):
+            needed = set(agent.reads)
+            deps[agent.name] = {
+                prev.name for prev in self.agents[:i] if needed.intersection(prev.writes)
+            }
+        return deps
+
+    def stages(self) -> List[List[str]]:
+        """return node names grouped by depth; nodes in a stage can run together."""
+        depth: Dict[str, int] = {}
+        for agent in self.agents:
+            parents = self.dependencies[agent.name]
+            depth[agent.name] = 1 + max((depth[p] for p in parents), default=-1)
+        grouped: List[List[str]] = []
+        for name, d in depth.items():
+            while len(grouped) <= d:
+                grouped.append([])
+            grouped[d].append(name)
+        return grouped
+
+    async def run(self, state: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """run all agents and return (merged state, per-node timings in ms).
+
+        if any node fails the remaining nodes are cancelled and the error is
+        re-raised, matching the behaviour of running the agents in sequence.
+        """
+        timings: Dict[str, float] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def _run_node(agent: BaseAgent) -> None:
+            parents = self.dependencies[agent.name]
+            if parents:
+                await asyncio.gather(*(tasks[p] for p in parents))
+            snapshot = dict(state)
+            start = time.perf_counter()
+            try:
+                result = await agent.run(snapshot)
+            finally:
+                timings[agent.name] = (time.perf_counter() - start) * 1000.0
+            result = result if result is not None else snapshot
+            for key in agent.writes:
+                if key in result:
+                    state[key] = result[key]
+
+        for agent in self.agents:
+            tasks[agent.name] = asyncio.create_task(_run_node(agent), name=f"agent:{agent.name}")
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        logger.debug(
+            "agent_graph: %s",
+            ", ".join(f"{name}={ms:.1f}ms" for name, ms in timings.items()),
+        )
+        return state, timings
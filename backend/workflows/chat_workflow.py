@@ -1,11 +1,21 @@
-"""chat workflow with simple in-memory conversation history.
+"""chat workflow with pluggable conversation history.
 
-lowercase: wraps ConversationAgent and keeps per-session history. replace with
-LangGraph StateGraph + Redis for production.
+lowercase: wraps ConversationAgent and keeps per-session history in a
+SessionStore: Redis when REDIS_URL is set (shared by all workers), else a
+bounded in-process SessionMemory (turn cap, idle TTL, global byte cap).
+
+once a session holds more than `summary.trigger_turns` turns, a background
+task (off the request path) folds all but the last `summary.keep_turns`
+into a rolling summary stored with the session, so prompts carry the
+summary plus a few recent turns however long the visitor talks.
 """
-from typing import Dict, Any, DefaultDict, List
-from collections import defaultdict
-from agents.conversation_agent import ConversationAgent
+from typing import Dict, Any, List, Optional
+from agents.conversation_agent import ConversationAgent, DeltaFn
+from agents.summary_agent import SummaryAgent
+from config.settings import settings
+from services.session_store import SessionStore, create_session_store
+from utils.config_loader import load_config
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,33 +24,119 @@ logger = logging.getLogger(__name__)
 class ChatWorkflow:
     """wrap ConversationAgent to provide a simple workflow interface with memory."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self, store: Optional[SessionStore] = None, config: Optional[Dict[str, Any]] = None
+    ) -> None:
         self.agent = ConversationAgent()
-        self._history: DefaultDict[str, List[str]] = defaultdict(list)
+        if config is None:
+            try:
+                config = load_config()
+            except Exception:
+                config = {}
+        if store is None:
+            store = create_session_store(settings.redis_url, config)
+        self.store = store
+        cfg = (config.get("session_memory", {}) or {}).get("summary", {}) or {}
+        self.summary_enabled = bool(cfg.get("enabled", True))
+        self.summary_trigger_lines = int(cfg.get("trigger_turns", 8)) * 2
+        self.summary_keep_lines = int(cfg.get("keep_turns", 4)) * 2
+        self.summary_agent = SummaryAgent(
+            llm_factory=self.agent._get_llm, max_words=int(cfg.get("max_words", 120))
+        )
+        self._summary_tasks: Dict[str, asyncio.Task] = {}
 
-    async def run(self, session_id: str, text: str, is_voice: bool = False, language: str | None = None) -> Dict[str, Any]:
+    async def run(
+        self,
+        session_id: str,
+        text: str,
+        is_voice: bool = False,
+        language: str | None = None,
+        on_delta: Optional[DeltaFn] = None,
+    ) -> Dict[str, Any]:
         """execute conversation flow and return state containing final_response.
 
         is_voice: whether the input came from a voice channel (optimize for TTS)
+        on_delta: called with each piece of the reply as the LLM streams it
+
+        history is only written after the turn completes, so a cancelled turn
+        (client disconnect) leaves no partial user/assistant entry behind.
         """
         logger.debug("chat_workflow: running for session=%s", session_id)
-        history = self._history.get(session_id, [])
+        history = await self.store.load(session_id)
         channel = "voice" if is_voice else "text"
-        state = await self.agent.handle_text(session_id, text, history=history, channel=channel, language=language)
-        # update memory
-        self._history[session_id].append(f"user: {text}")
-        self._history[session_id].append(f"assistant: {state.get('final_response','')}")
+        state = await self.agent.handle_text(
+            session_id,
+            text,
+            history=history.lines,
+            channel=channel,
+            language=language,
+            summary=history.summary,
+            on_delta=on_delta,
+        )
+        # update memory (both lines in one call: all-or-nothing)
+        await self.store.append(
+            session_id, f"user: {text}", f"assistant: {state.get('final_response','')}"
+        )
+        if self.summary_enabled and len(history.lines) + 2 > self.summary_trigger_lines:
+            self._schedule_summary(session_id)
         return state
+
+    def _schedule_summary(self, session_id: str) -> None:
+        """start one summarization task per session; never awaited by the turn."""
+        task = self._summary_tasks.get(session_id)
+        if task is not None and not task.done():
+            return
+        task = asyncio.get_running_loop().create_task(self._summarize(session_id))
+        self._summary_tasks[session_id] = task
+
+        def _forget(done: asyncio.Task) -> None:
+            if self._summary_tasks.get(session_id) is done:
+                del self._summary_tasks[session_id]
+
+        task.add_done_callback(_forget)
+
+    async def _summarize(self, session_id: str) -> None:
+        try:
+            history = await self.store.load(session_id)
+            older = history.lines[: max(0, len(history.lines) - self.summary_keep_lines)]
+            if not older:
+                return
+            state = await self.summary_agent.run({"summary": history.summary, "turns": older})
+            if await self.store.compact(session_id, state["summary"], older):
+                logger.info(
+                    "chat_workflow: summarized %d lines for session=%s", len(older), session_id
+                )
+            else:
+                logger.debug("chat_workflow: history changed during summary; retrying next turn")
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning(
+                "chat_workflow: summarization failed for session=%s: %s", session_id, exc
+            )
+
+    async def drain(self) -> None:
+        """wait for in-flight summarization tasks (tests, shutdown)."""
+        tasks = list(self._summary_tasks.values())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        for task in list(self._summary_tasks.values()):
+            task.cancel()
+        await self.drain()
+        await self.store.close()
     
-    def get_history(self, session_id: str) -> List[str]:
+    async def get_history(self, session_id: str) -> List[str]:
         """retrieve conversation history for a session."""
-        return self._history.get(session_id, [])
+        return await self.store.get(session_id)
     
-    def clear_history(self, session_id: str) -> None:
+    async def clear_history(self, session_id: str) -> bool:
         """clear conversation history for a session."""
-        if session_id in self._history:
-            del self._history[session_id]
+        cleared = await self.store.clear(session_id)
+        if cleared:
             logger.info(f"cleared history for session {session_id}")
+        return cleared
 
 
 chat_workflow = ChatWorkflow()
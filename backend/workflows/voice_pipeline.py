@@ -0,0 +1,138 @@
+"""pipelined voice replies: speak each sentence while the LLM writes the next.
+
+lowercase: the chat turn runs with token streaming; a SentenceStream cuts
+the reply into sentences as they complete and each one goes to TTS at once
+(at most `max_parallel` in flight). clips come back in reply order, so the
+first sentence can play while later ones are still being generated or
+synthesized. history is written by ChatWorkflow as usual when the turn ends.
+"""
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+import asyncio
+import logging
+import time
+
+from utils.language_utils import SentenceStream
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+VOICE_PIPELINE_LATENCY = REGISTRY.histogram(
+    "supermuseum_voice_pipeline_seconds",
+    "Pipelined voice reply latency from the start of generation, by stage.",
+    ["stage"],
+)
+
+# synthesize(sentence, language) -> audio bytes
+SpeakFn = Callable[[str, str], Awaitable[bytes]]
+
+
+@dataclass
+class SpokenSentence:
+    """one synthesized sentence of the reply."""
+
+    seq: int
+    text: str
+    audio: bytes
+
+
+class PipelinedVoiceTurn:
+    """run a voice turn and yield the reply as spoken sentences, then the state.
+
+    usage:
+        turn = PipelinedVoiceTurn(chat_workflow, speak, session_id, transcript)
+        async for item in turn.run():
+            if isinstance(item, SpokenSentence): send(item.audio)
+            else: state = item  # final turn state, last
+    """
+
+    def __init__(
+        self,
+        workflow: Any,
+        speak: SpeakFn,
+        session_id: str,
+        text: str,
+        language: Optional[str] = None,
+        max_parallel: int = 2,
+        max_chars: int = 400,
+    ) -> None:
+        self.workflow = workflow
+        self.speak = speak
+        self.session_id = session_id
+        self.text = text
+        self.language = language
+        self.max_chars = max_chars
+        self._limit = asyncio.Semaphore(max(1, max_parallel))
+        self._queue: "asyncio.Queue[Optional[Tuple[str, asyncio.Task]]]" = asyncio.Queue()
+        self._splitter: Optional[SentenceStream] = None
+        self._speech_language = language or "english"
+        self._tasks: List[asyncio.Task] = []
+
+    async def _synthesize(self, sentence: str) -> bytes:
+        async with self._limit:
+            return await self.speak(sentence, self._speech_language)
+
+    def _schedule(self, sentences: List[str]) -> None:
+        for sentence in sentences:
+            task = asyncio.create_task(self._synthesize(sentence))
+            self._tasks.append(task)
+            self._queue.put_nowait((sentence, task))
+
+    async def _on_delta(self, delta: str, state: Dict[str, Any]) -> None:
+        if self._splitter is None:
+            # the language router has run by the time the first token arrives
+            self._speech_language = self.language or state.get("language") or "english"
+            self._splitter = SentenceStream(self._speech_language, self.max_chars)
+        self._schedule(self._splitter.feed(delta))
+
+    async def _generate(self) -> Dict[str, Any]:
+        try:
+            state = await self.workflow.run(
+                self.session_id,
+                self.text,
+                is_voice=True,
+                language=self.language,
+                on_delta=self._on_delta,
+            )
+            if self._splitter is not None:
+                self._schedule(self._splitter.flush())
+            return state
+        finally:
+            self._queue.put_nowait(None)
+
+    async def run(self) -> AsyncIterator[Union[SpokenSentence, Dict[str, Any]]]:
+        """spoken sentences in order, then the final state; closing it cancels the turn."""
+        start = time.perf_counter()
+        generation = asyncio.create_task(self._generate())
+        seq = 0
+        try:
+            while True:
+                item = await self._queue.get()
+                if item is None:
+                    break
+                sentence, task = item
+                try:
+                    audio = await task
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    # one failed sentence shouldn't silence the rest of the reply
+                    logger.warning("voice_pipeline: synthesis failed for a sentence: %s", exc)
+                    continue
+                if seq == 0:
+                    VOICE_PIPELINE_LATENCY.observe(time.perf_counter() - start, stage="first_audio")
+                yield SpokenSentence(seq, sentence, audio)
+                seq += 1
+            state = await generation
+            VOICE_PIPELINE_LATENCY.observe(time.perf_counter() - start, stage="done")
+            yield state
+        finally:
+            tasks = [generation, *self._tasks]
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # also collects exceptions from sentences that were never awaited
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+__all__ = ["PipelinedVoiceTurn", "SpokenSentence", "VOICE_PIPELINE_LATENCY"]
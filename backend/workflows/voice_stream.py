@@ -0,0 +1,232 @@
+"""streaming voice turns over a WebSocket.
+
+lowercase: the client sends raw 16 kHz mono s16le PCM while the visitor
+speaks. an EnergyVAD watches every chunk; during speech the last
+`partial_window_s` of the utterance is transcribed every `partial_interval_s`
+on a separate best-effort path (`transcribe_partial`, which may skip) and
+sent back as a partial transcript, and as soon as end-of-speech is detected (or the client sends
+{"type": "end"}) the final transcript goes through ChatWorkflow and the
+reply (text, then synthesized audio) is pushed to the client. the socket
+stays open for further turns.
+"""
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+from collections import deque
+import asyncio
+import base64
+import logging
+import time
+
+import numpy as np
+
+from utils.metrics import REGISTRY
+from utils.vad import EnergyVAD
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+VOICE_STREAM_LATENCY = REGISTRY.histogram(
+    "supermuseum_voice_stream_seconds",
+    "Streaming voice turn latency from end-of-speech, by stage.",
+    ["stage"],
+)
+
+SendFn = Callable[[Dict[str, Any]], Awaitable[None]]
+TranscribeFn = Callable[[Any], Awaitable[Dict[str, Any]]]
+# like TranscribeFn, but may return None to skip (e.g. when its workers are busy)
+PartialTranscribeFn = Callable[[Any], Awaitable[Optional[Dict[str, Any]]]]
+SynthesizeFn = Callable[..., Awaitable[bytes]]
+
+
+class VoiceStreamSession:
+    """state for one WebSocket connection: VAD, utterance buffer and turns.
+
+    usage:
+        session = VoiceStreamSession(websocket.send_json, chat_workflow, transcribe_audio)
+        await session.feed(pcm_bytes)   # repeatedly
+        await session.close()
+    """
+
+    def __init__(
+        self,
+        send: SendFn,
+        workflow: Any,
+        transcribe: TranscribeFn,
+        synthesize: Optional[SynthesizeFn] = None,
+        session_id: str = "",
+        language: Optional[str] = None,
+        partial_interval_s: float = 0.8,
+        max_utterance_s: float = 30.0,
+        pre_roll_ms: int = 300,
+        vad: Optional[EnergyVAD] = None,
+        transcribe_partial: Optional[PartialTranscribeFn] = None,
+        partial_window_s: float = 6.0,
+    ) -> None:
+        self._send_fn = send
+        self._send_lock = asyncio.Lock()
+        self.workflow = workflow
+        self.transcribe = transcribe
+        # finals and partials must not share a queue; default to the final path for simple setups
+        self.transcribe_partial = transcribe_partial or transcribe
+        self.partial_window = int(partial_window_s * SAMPLE_RATE)
+        self.synthesize = synthesize
+        self.session_id = session_id
+        self.language = language
+        self.partial_samples = int(partial_interval_s * SAMPLE_RATE)
+        self.max_samples = int(max_utterance_s * SAMPLE_RATE)
+        self.vad = vad or EnergyVAD(sample_rate=SAMPLE_RATE)
+        # audio just before speech start, so the first syllable isn't clipped
+        self._pre_roll: Deque[np.ndarray] = deque()
+        self._pre_roll_samples = int(pre_roll_ms * SAMPLE_RATE / 1000)
+        self._utterance: List[np.ndarray] = []
+        self._utterance_samples = 0
+        self._since_partial = 0
+        self._utterance_id = 0
+        self._partial_task: Optional[asyncio.Task] = None
+        self._turns: List[asyncio.Task] = []
+        self._turn_lock = asyncio.Lock()
+        self._odd_byte = b""
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        # turns and partials run as separate tasks; keep frames whole
+        async with self._send_lock:
+            await self._send_fn(message)
+
+    @staticmethod
+    def _to_float(chunks: List[np.ndarray]) -> np.ndarray:
+        return np.concatenate(chunks).astype(np.float32) / 32768.0
+
+    async def feed(self, data: bytes) -> None:
+        """accept a chunk of s16le PCM from the client."""
+        data = self._odd_byte + data
+        self._odd_byte = data[len(data) - (len(data) % 2) :]
+        samples = np.frombuffer(data[: len(data) - len(self._odd_byte)], dtype="<i2")
+        if not len(samples):
+            return
+        events = self.vad.process(samples)
+        if self._utterance or "start" in events:
+            if not self._utterance:
+                self._utterance = list(self._pre_roll)
+                self._utterance_samples = sum(len(c) for c in self._utterance)
+                self._pre_roll.clear()
+            self._utterance.append(samples)
+            self._utterance_samples += len(samples)
+            self._since_partial += len(samples)
+        else:
+            self._pre_roll.append(samples)
+            while (
+                sum(len(c) for c in self._pre_roll) > self._pre_roll_samples
+                and len(self._pre_roll) > 1
+            ):
+                self._pre_roll.popleft()
+
+        if "end" in events or self._utterance_samples >= self.max_samples:
+            await self.end_of_speech()
+        elif self._utterance and self._since_partial >= self.partial_samples:
+            self._maybe_partial()
+
+    def _maybe_partial(self) -> None:
+        if self._partial_task is not None and not self._partial_task.done():
+            return  # previous partial still decoding; skip rather than queue
+        self._since_partial = 0
+        audio = self._to_float(self._utterance)[-self.partial_window :]
+        self._partial_task = asyncio.create_task(self._partial(self._utterance_id, audio))
+
+    async def _partial(self, utterance_id: int, audio: np.ndarray) -> None:
+        try:
+            result = await self.transcribe_partial(audio)
+        except Exception as exc:
+            logger.debug("voice_stream: partial transcription failed: %s", exc)
+            return
+        if result and utterance_id == self._utterance_id and result.get("text"):
+            await self.send({"type": "partial", "text": result["text"]})
+
+    async def end_of_speech(self) -> None:
+        """close the current utterance and start its turn in the background."""
+        if not self._utterance:
+            return
+        audio = self._to_float(self._utterance)
+        self._utterance, self._utterance_samples, self._since_partial = [], 0, 0
+        self._utterance_id += 1
+        self.vad.reset()
+        if self._partial_task is not None and not self._partial_task.done():
+            self._partial_task.cancel()
+        self._turns = [t for t in self._turns if not t.done()]
+        self._turns.append(asyncio.create_task(self._turn(audio)))
+
+    async def _turn(self, audio: np.ndarray) -> None:
+        # one reply at a time, in the order the utterances ended
+        async with self._turn_lock:
+            start = time.perf_counter()
+            try:
+                transcribed = await self.transcribe(audio)
+                text = (transcribed.get("text") or "").strip()
+                stt_s = time.perf_counter() - start
+                VOICE_STREAM_LATENCY.observe(stt_s, stage="transcript")
+                await self.send(
+                    {
+                        "type": "final",
+                        "text": text,
+                        "language": transcribed.get("language"),
+                        "confidence": transcribed.get("confidence"),
+                    }
+                )
+                if not text:
+                    return
+                state = await self.workflow.run(
+                    self.session_id, text, is_voice=True, language=self.language
+                )
+                reply = state.get("final_response", "")
+                reply_s = time.perf_counter() - start
+                VOICE_STREAM_LATENCY.observe(reply_s, stage="response")
+                await self.send(
+                    {
+                        "type": "response",
+                        "session_id": self.session_id,
+                        "text": reply,
+                        "language": state.get("language"),
+                        "emotion": (state.get("emotion") or {}).get("label"),
+                        "latency_ms": {
+                            "transcript": round(stt_s * 1000),
+                            "response": round(reply_s * 1000),
+                        },
+                    }
+                )
+                if self.synthesize and reply:
+                    try:
+                        audio_bytes = await self.synthesize(
+                            reply, language=state.get("language", "english")
+                        )
+                    except Exception as exc:
+                        logger.debug("voice_stream: synthesis failed or not configured: %s", exc)
+                        return
+                    VOICE_STREAM_LATENCY.observe(time.perf_counter() - start, stage="audio")
+                    await self.send(
+                        {
+                            "type": "audio",
+                            "format": "wav",
+                            "audio_base64": base64.b64encode(audio_bytes).decode("ascii"),
+                        }
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("voice_stream: turn failed: %s", exc)
+                await self.send({"type": "error", "detail": str(exc)})
+
+    async def wait_idle(self) -> None:
+        """wait for pending turns (used on a client "flush" and in tests)."""
+        if self._turns:
+            await asyncio.gather(*self._turns, return_exceptions=True)
+
+    async def close(self) -> None:
+        """client went away: cancel partials and unfinished turns."""
+        tasks = [t for t in self._turns if not t.done()]
+        if self._partial_task is not None and not self._partial_task.done():
+            tasks.append(self._partial_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+__all__ = ["VoiceStreamSession", "SAMPLE_RATE"]